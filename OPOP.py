@@ -1,9 +1,11 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import requests
-from streamlit_lottie import st_lottie
+from nucleo import generar_valores_mensuales
+from nucleo.carga import convertir_urls_a_imagenes
+from nucleo.graficos import grafico_cajas, grafico_evolucion
+from paginas.datos import cargar_datos, copia_datos
+from paginas.secciones import menu_lateral, mostrar_animacion, mostrar_conclusiones, mostrar_herramientas, mostrar_objetivos, pie_de_pagina
 
 # Configuración inicial de la página
 st.set_page_config(
@@ -12,80 +14,11 @@ st.set_page_config(
     layout="wide"
 )
 
-# Función para cargar animaciones Lottie
-def load_lottieurl(url):
-    r = requests.get(url)
-    if r.status_code != 200:
-        return None
-    return r.json()
+# Cargar datos (leídos y convertidos una sola vez; caché común a todas las variantes)
+spain_data, bundesliga_data = cargar_datos("valores_originales", copia_datos("valores_originales"))
 
-# Cargar datos
-@st.cache_data
-def load_data():
-    spain_data = pd.read_csv('https://raw.githubusercontent.com/AndersonP444/PROYECTO-SIC-JAKDG/main/valores_mercado_actualizados%20(3).csv')
-    bundesliga_data = pd.read_csv('https://raw.githubusercontent.com/AndersonP444/PROYECTO-SIC-JAKDG/main/valores_mercado_bundesliga.csv')
-    return spain_data, bundesliga_data
-
-# Función para convertir valores de mercado
-def convertir_valor(valor):
-    if isinstance(valor, str):
-        if "mil €" in valor:
-            return int(float(valor.replace(" mil €", "").replace(",", ".")) * 1_000)
-        elif "mill. €" in valor:
-            return int(float(valor.replace(" mill. €", "").replace(",", ".")) * 1_000_000)
-    return None
-
-# Función para convertir URLs a imágenes
-def convertir_urls_a_imagenes(df):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        if df_copy[col].astype(str).str.startswith('http').any():
-            df_copy[col] = df_copy[col].apply(lambda url: f'<img src="{url}" width="50">' if isinstance(url, str) and url.startswith('http') else url)
-    return df_copy
-
-# Función para generar valores mensuales interpolados
-def generar_valores_mensuales(valor_inicial, valor_final):
-    fecha_inicio = datetime(2024, 1, 1)
-    fecha_actual = datetime.now()
-    meses = []
-    valores = []
-    
-    fecha_actual = fecha_actual.replace(day=1)
-    fecha = fecha_inicio
-    while fecha <= fecha_actual:
-        meses.append(fecha.strftime('%B %Y'))
-        fecha += timedelta(days=32)
-        fecha = fecha.replace(day=1)
-    
-    num_meses = len(meses)
-    for i in range(num_meses):
-        valor = valor_inicial + (valor_final - valor_inicial) * (i / (num_meses - 1))
-        valores.append(valor)
-    
-    return meses, valores
-
-# Cargar datos
-spain_data, bundesliga_data = load_data()
-
-# Procesar datos de España
-spain_data["Valor de Mercado en 01/01/2024"] = spain_data["Valor de Mercado en 01/01/2024"].apply(convertir_valor)
-spain_data["Valor de Mercado Actual"] = spain_data["Valor de Mercado Actual"].apply(convertir_valor)
-
-# Procesar datos de Bundesliga
-bundesliga_data["Valor de Mercado"] = bundesliga_data["Valor de Mercado"].apply(convertir_valor)
-
-# Sidebar con menú principal
-st.sidebar.title("Menú Principal")
-menu_principal = st.sidebar.radio(
-    "Seleccione una sección:",
-    ["Introducción", "Objetivos", "Metodología", "Herramientas", "Resultados", "Conclusiones"]
-)
-
-# Selector de liga
-liga_seleccionada = st.sidebar.selectbox(
-    "Seleccione la liga:",
-    ["LaLiga", "Bundesliga", "Comparativa"]
-)
+# Sidebar con menú principal y selector de liga
+menu_principal, liga_seleccionada = menu_lateral("valores_originales")
 
 if menu_principal == "Introducción":
     st.title("Introducción")
@@ -94,10 +27,7 @@ if menu_principal == "Introducción":
     donde el valor de los jugadores es un indicador crucial de su desempeño y potencial.
     """)
     
-    lottie_url = "https://lottie.host/embed/3d48d4b9-51ad-4b7d-9d28-5e248cace11/Rz3QtSCq3.json"
-    lottie_coding = load_lottieurl(lottie_url)
-    if lottie_coding:
-        st_lottie(lottie_coding, height=200, width=300)
+    mostrar_animacion("https://lottie.host/embed/3d48d4b9-51ad-4b7d-9d28-5e248cace11/Rz3QtSCq3.json", height=200, width=300)
     
     if liga_seleccionada == "LaLiga":
         data_to_show = spain_data
@@ -148,23 +78,7 @@ elif menu_principal == "Metodología":
             
             meses, valores = generar_valores_mensuales(valor_inicial, valor_final)
             
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=meses,
-                y=valores,
-                mode='lines+markers',
-                name=nombre_jugador,
-                line=dict(width=3),
-                marker=dict(size=10)
-            ))
-            
-            fig.update_layout(
-                title=f'Evolución Mensual del Valor de Mercado de {nombre_jugador}',
-                xaxis_title='Mes',
-                yaxis_title='Valor de Mercado (€)',
-                hovermode='x unified',
-                showlegend=True
-            )
+            fig = grafico_evolucion(meses, {nombre_jugador: valores}, f'Evolución Mensual del Valor de Mercado de {nombre_jugador}')
             st.plotly_chart(fig)
             
             df_mensual = pd.DataFrame({
@@ -331,37 +245,12 @@ elif menu_principal == "Metodología":
             st.plotly_chart(fig)
 
 elif menu_principal == "Objetivos":
-    st.title("Objetivos del Proyecto")
-    st.write("""
-    ### Objetivos Principales:
-    - Analizar y visualizar el valor de mercado de los jugadores en LaLiga y Bundesliga
-    - Evaluar el incremento porcentual del valor de mercado a lo largo del tiempo
-    - Identificar patrones y tendencias en la valoración de jugadores
-    - Comparar las valoraciones entre las diferentes ligas
-    """)
+    mostrar_objetivos()
+
 
 elif menu_principal == "Herramientas":
-    st.title("Herramientas y Tecnologías")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.header("Tecnologías Principales")
-        st.write("""
-        - Python
-        - Pandas
-        - Streamlit
-        - Plotly
-        - Google Colab
-        - Jupiter Notebook
-        """)
-    
-    with col2:
-        st.header("Bibliotecas Adicionales")
-        st.write("""
-        - Matplotlib
-        - Seaborn
-        - Streamlit-Lottie
-        """)
+    mostrar_herramientas()
+
 
 elif menu_principal == "Resultados":
     st.title("Resultados")
@@ -383,22 +272,10 @@ elif menu_principal == "Resultados":
         
         with tab2:
             st.header("Análisis Comparativo")
-            fig = go.Figure()
-            
-            fig.add_trace(go.Box(
-                y=spain_data['Valor de Mercado Actual'],
-                name='LaLiga'
-            ))
-            
-            fig.add_trace(go.Box(
-                y=bundesliga_data['Valor de Mercado'],
-                name='Bundesliga'
-            ))
-            
-            fig.update_layout(
-                title='Distribución de Valores de Mercado por Liga',
-                yaxis_title='Valor de Mercado (€)'
-            )
+            fig = grafico_cajas({
+                'LaLiga': spain_data['Valor de Mercado Actual'],
+                'Bundesliga': bundesliga_data['Valor de Mercado']
+            }, 'Distribución de Valores de Mercado por Liga')
             st.plotly_chart(fig)
         
         with tab3:
@@ -454,22 +331,8 @@ elif menu_principal == "Resultados":
             """)
 
 else:  # Conclusiones
-    st.title("Conclusiones")
-    if liga_seleccionada == "Comparativa":
-        st.write("""
-        ### Principales Hallazgos:
-        - Comparativa entre LaLiga y Bundesliga muestra patrones interesantes en la valoración de jugadores
-        - Las diferencias entre mercados ofrecen oportunidades únicas de inversión
-        - La gestión basada en datos puede mejorar significativamente las estrategias de los equipos en ambas ligas
-        """)
-    else:
-        st.write(f"""
-        ### Principales Hallazgos en {liga_seleccionada}:
-        - El análisis de datos en el fútbol ofrece insights valiosos para la toma de decisiones
-        - Las tendencias del mercado muestran patrones significativos en la valoración de jugadores
-        - La gestión basada en datos puede mejorar significativamente las estrategias de los equipos
-        """)
+    mostrar_conclusiones(liga_seleccionada)
+
 
 # Footer
-st.sidebar.markdown("---")
-st.sidebar.info("ANÁLISIS DE LAS ESTADÍSTICAS QUE TIENEN MAYOR CORRELACIÓN CON EL VALOR DE MERCADO DE LOS JUGADORES DE FUTBOL EN ESPAÑA Y ALEMANIA")
\ No newline at end of file
+pie_de_pagina()
\ No newline at end of file
@@ -1,9 +1,10 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import requests
-from streamlit_lottie import st_lottie
+from nucleo import generar_valores_mensuales
+from nucleo.graficos import grafico_cajas, grafico_evolucion, grafico_violin_ligas
+from paginas.datos import cargar_datos, copia_datos
+from paginas.secciones import menu_lateral, mostrar_conclusiones, mostrar_herramientas, mostrar_introduccion, mostrar_objetivos, pie_de_pagina
 
 # Configuración inicial de la página
 st.set_page_config(
@@ -12,143 +13,15 @@ st.set_page_config(
     layout="wide"
 )
 
-# Función para cargar animaciones Lottie
-def load_lottieurl(url):
-    r = requests.get(url)
-    if r.status_code != 200:
-        return None
-    return r.json()
-
-# Cargar datos
-@st.cache_data
-def load_data():
-    spain_data = pd.read_csv('https://raw.githubusercontent.com/AndersonP444/PROYECTO-SIC-JAKDG/main/valores_mercado_actualizados%20(3).csv')
-    bundesliga_data = pd.read_csv('https://raw.githubusercontent.com/AndersonP444/PROYECTO-SIC-JAKDG/main/valores_mercado_bundesliga_actualizado_v2.csv')
-    return spain_data, bundesliga_data
-
-# Función para convertir valores de mercado
-def convertir_valor(valor):
-    if isinstance(valor, str):
-        if "mil €" in valor:
-            return int(float(valor.replace(" mil €", "").replace(",", ".")) * 1_000)
-        elif "mill. €" in valor:
-            return int(float(valor.replace(" mill. €", "").replace(",", ".")) * 1_000_000)
-    return None
-
-# Función para convertir URLs a imágenes
-def convertir_urls_a_imagenes(df):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        if df_copy[col].astype(str).str.startswith('http').any():
-            df_copy[col] = df_copy[col].apply(lambda url: f'<img src="{url}" width="50">' if isinstance(url, str) and url.startswith('http') else url)
-    return df_copy
-
-# Función para generar valores mensuales interpolados
-def generar_valores_mensuales(valor_inicial, valor_final):
-    fecha_inicio = datetime(2024, 1, 1)
-    fecha_actual = datetime.now()
-    meses = []
-    valores = []
-    
-    fecha_actual = fecha_actual.replace(day=1)
-    fecha = fecha_inicio
-    while fecha <= fecha_actual:
-        meses.append(fecha.strftime('%B %Y'))
-        fecha += timedelta(days=32)
-        fecha = fecha.replace(day=1)
-    
-    num_meses = len(meses)
-    for i in range(num_meses):
-        valor = valor_inicial + (valor_final - valor_inicial) * (i / (num_meses - 1))
-        valores.append(valor)
-    
-    return meses, valores
-
-# Cargar datos
-spain_data, bundesliga_data = load_data()
-
-# Procesar datos de España
-spain_data["Valor de Mercado en 01/01/2024"] = spain_data["Valor de Mercado en 01/01/2024"].apply(convertir_valor)
-spain_data["Valor de Mercado Actual"] = spain_data["Valor de Mercado Actual"].apply(convertir_valor)
-
-# Procesar datos de Bundesliga
-bundesliga_data["Valor de Mercado en 01/01/2024"] = bundesliga_data["Valor de Mercado en 01/01/2024"].apply(convertir_valor)
-bundesliga_data["Valor de Mercado Actual"] = bundesliga_data["Valor de Mercado Actual"].apply(convertir_valor)
-
-# Sidebar con menú principal
-st.sidebar.title("Menú Principal")
-menu_principal = st.sidebar.radio(
-    "Seleccione una sección:",
-    ["Introducción", "Objetivos", "Metodología", "Herramientas", "Resultados", "Conclusiones"]
-)
-
-# Selector de liga
-liga_seleccionada = st.sidebar.selectbox(
-    "Seleccione la liga:",
-    ["LaLiga", "Bundesliga", "Comparativa"]
-)
+# Cargar datos (leídos y convertidos una sola vez; caché común a todas las variantes)
+spain_data, bundesliga_data = cargar_datos("valores", copia_datos("valores"))
 
-# Función para convertir URLs a imágenes
-def convertir_urls_a_imagenes(df):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        if df_copy[col].astype(str).str.startswith('http').any():
-            df_copy[col] = df_copy[col].apply(lambda url: f'<img src="{url}" width="50">' if isinstance(url, str) and url.startswith('http') else url)
-    return df_copy
-
-# Función para convertir URLs a imágenes
-def convertir_urls_a_imagenes(df):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        if df_copy[col].astype(str).str.startswith('http').any():
-            df_copy[col] = df_copy[col].apply(lambda url: f'<img src="{url}" width="50">' if isinstance(url, str) and url.startswith('http') else url)
-    return df_copy
+# Sidebar con menú principal y selector de liga
+menu_principal, liga_seleccionada = menu_lateral("valores")
 
 # Código principal
 if menu_principal == "Introducción":
-    st.title("Introducción")
-    st.write("""
-    La industria del fútbol ha evolucionado significativamente, convirtiéndose en un mercado 
-    donde el valor de los jugadores es un indicador crucial de su desempeño y potencial.
-    """)
-
-    # Cargar animación Lottie
-    lottie_url = "https://lottie.host/embed/3d48d4b9-51ad-4b7d-9d28-5e248cace11/Rz3QtSCq3.json"
-    lottie_coding = load_lottieurl(lottie_url)
-    if lottie_coding:
-        st_lottie(lottie_coding, height=200, width=300)
-
-    # Mostrar datos según la liga seleccionada
-    if liga_seleccionada == "LaLiga":
-        data_to_show = spain_data
-        title = "Datos de Jugadores de LaLiga"
-    elif liga_seleccionada == "Bundesliga":
-        data_to_show = bundesliga_data
-        title = "Datos de Jugadores de Bundesliga"
-    else:
-        st.subheader("Comparativa entre LaLiga y Bundesliga")
-        
-        # Mostrar tablas en Comparativa
-        def generar_tabla_html(data):
-            data_con_imagenes = convertir_urls_a_imagenes(data)
-            return data_con_imagenes.to_html(escape=False, index=False)
-
-        # Tabla de LaLiga
-        st.write("### LaLiga")
-        tabla_laliga_html = generar_tabla_html(spain_data)
-        st.markdown(tabla_laliga_html, unsafe_allow_html=True)
-
-        # Tabla de Bundesliga
-        st.write("### Bundesliga")
-        tabla_bundesliga_html = generar_tabla_html(bundesliga_data)
-        st.markdown(tabla_bundesliga_html, unsafe_allow_html=True)
-
-    # Mostrar tabla individual con imágenes (si no es Comparativa)
-    if liga_seleccionada != "Comparativa":
-        with st.container():
-            st.subheader(title)
-            data_con_imagenes = convertir_urls_a_imagenes(data_to_show)
-            st.markdown(data_con_imagenes.to_html(escape=False), unsafe_allow_html=True)
+    mostrar_introduccion(liga_seleccionada, spain_data, bundesliga_data)
 
 
 elif menu_principal == "Metodología":
@@ -159,39 +32,10 @@ elif menu_principal == "Metodología":
         st.subheader("Comparativa de Valor de Mercado: LaLiga vs Bundesliga")
 
         # Preparar los datos para la gráfica comparativa
-        fig = go.Figure()
-
-        # Añadir los datos de LaLiga
-        fig.add_trace(go.Violin(
-            y=spain_data['Valor de Mercado Actual'],
-            name='LaLiga',
-            box_visible=True,
-            meanline_visible=True,
-            line_color='blue',
-            fillcolor='rgba(0, 0, 255, 0.3)',
-            opacity=0.7
-        ))
-
-        # Añadir los datos de Bundesliga
-        fig.add_trace(go.Violin(
-            y=bundesliga_data['Valor de Mercado Actual'],
-            name='Bundesliga',
-            box_visible=True,
-            meanline_visible=True,
-            line_color='green',
-            fillcolor='rgba(0, 255, 0, 0.3)',
-            opacity=0.7
-        ))
-
-        # Actualizar el diseño de la gráfica
-        fig.update_layout(
-            title="Distribución de Valores de Mercado por Liga",
-            yaxis_title="Valor de Mercado (€)",
-            xaxis_title="Ligas",
-            violingap=0.5,
-            violingroupgap=0.3,
-            showlegend=False
-        )
+        fig = grafico_violin_ligas({
+            'LaLiga': spain_data['Valor de Mercado Actual'],
+            'Bundesliga': bundesliga_data['Valor de Mercado Actual']
+        })
 
         # Mostrar la gráfica comparativa
         st.plotly_chart(fig)
@@ -233,23 +77,7 @@ elif menu_principal == "Metodología":
                 
                 meses, valores = generar_valores_mensuales(valor_inicial, valor_final)
                 
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=meses,
-                    y=valores,
-                    mode='lines+markers',
-                    name=nombre_jugador,
-                    line=dict(width=3),
-                    marker=dict(size=10)
-                ))
-                
-                fig.update_layout(
-                    title=f'Evolución Mensual del Valor de Mercado de {nombre_jugador}',
-                    xaxis_title='Mes',
-                    yaxis_title='Valor de Mercado (€)',
-                    hovermode='x unified',
-                    showlegend=True
-                )
+                fig = grafico_evolucion(meses, {nombre_jugador: valores}, f'Evolución Mensual del Valor de Mercado de {nombre_jugador}')
                 st.plotly_chart(fig)
                 
                 df_mensual = pd.DataFrame({
@@ -373,39 +201,13 @@ elif menu_principal == "Metodología":
                     """)
 
 
-
 elif menu_principal == "Objetivos":
-    st.title("Objetivos del Proyecto")
-    st.write("""
-    ### Objetivos Principales:
-    - Analizar y visualizar el valor de mercado de los jugadores en LaLiga y Bundesliga
-    - Evaluar el incremento porcentual del valor de mercado a lo largo del tiempo
-    - Identificar patrones y tendencias en la valoración de jugadores
-    - Comparar las valoraciones entre las diferentes ligas
-    """)
+    mostrar_objetivos()
+
 
 elif menu_principal == "Herramientas":
-    st.title("Herramientas y Tecnologías")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.header("Tecnologías Principales")
-        st.write("""
-        - Python
-        - Pandas
-        - Streamlit
-        - Plotly
-        - Google Colab
-        - Jupiter Notebook
-        """)
-    
-    with col2:
-        st.header("Bibliotecas Adicionales")
-        st.write("""
-        - Matplotlib
-        - Seaborn
-        - Streamlit-Lottie
-        """)
+    mostrar_herramientas()
+
 
 elif menu_principal == "Resultados":
     st.title("Resultados")
@@ -427,22 +229,10 @@ elif menu_principal == "Resultados":
         
         with tab2:
             st.header("Análisis Comparativo")
-            fig = go.Figure()
-            
-            fig.add_trace(go.Box(
-                y=spain_data['Valor de Mercado Actual'],
-                name='LaLiga'
-            ))
-            
-            fig.add_trace(go.Box(
-                y=bundesliga_data['Valor de Mercado Actual'],
-                name='Bundesliga'
-            ))
-            
-            fig.update_layout(
-                title='Distribución de Valores de Mercado por Liga',
-                yaxis_title='Valor de Mercado (€)'
-            )
+            fig = grafico_cajas({
+                'LaLiga': spain_data['Valor de Mercado Actual'],
+                'Bundesliga': bundesliga_data['Valor de Mercado Actual']
+            }, 'Distribución de Valores de Mercado por Liga')
             st.plotly_chart(fig)
         
         with tab3:
@@ -502,24 +292,10 @@ elif menu_principal == "Resultados":
             """)
 
 else:  # Conclusiones
-    st.title("Conclusiones")
-    if liga_seleccionada == "Comparativa":
-        st.write("""
-        ### Principales Hallazgos:
-        - Comparativa entre LaLiga y Bundesliga muestra patrones interesantes en la valoración de jugadores
-        - Las diferencias entre mercados ofrecen oportunidades únicas de inversión
-        - La gestión basada en datos puede mejorar significativamente las estrategias de los equipos en ambas ligas
-        """)
-    else:
-        st.write(f"""
-        ### Principales Hallazgos en {liga_seleccionada}:
-        - El análisis de datos en el fútbol ofrece insights valiosos para la toma de decisiones
-        - Las tendencias del mercado muestran patrones significativos en la valoración de jugadores
-        - La gestión basada en datos puede mejorar significativamente las estrategias de los equipos
-        """)
+    mostrar_conclusiones(liga_seleccionada)
+
 
 # Footer
-st.sidebar.markdown("---")
-st.sidebar.info("ANÁLISIS DE LAS ESTADÍSTICAS QUE TIENEN MAYOR CORRELACIÓN CON EL VALOR DE MERCADO DE LOS JUGADORES DE FUTBOL EN ESPAÑA Y ALEMANIA")
+pie_de_pagina()
 
 
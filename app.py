@@ -1,9 +1,10 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import requests
-from streamlit_lottie import st_lottie
+from nucleo import contrastes_ligas, evolucion_jugadores, filas_de_jugadores, generar_valores_mensuales, servicio_estadisticas, tabla_movimientos, tabla_percentiles
+from nucleo.graficos import figura_violin_ligas, grafico_cajas, grafico_evolucion
+from paginas.datos import cargar_datos, cargar_snapshot, copia_datos
+from paginas.secciones import menu_lateral, mostrar_conclusiones, mostrar_herramientas, mostrar_introduccion, mostrar_objetivos, pie_de_pagina
 
 # Configuración inicial de la página
 st.set_page_config(
@@ -12,143 +13,63 @@ st.set_page_config(
     layout="wide"
 )
 
-# Función para cargar animaciones Lottie
-def load_lottieurl(url):
-    r = requests.get(url)
-    if r.status_code != 200:
-        return None
-    return r.json()
-
-# Cargar datos
-@st.cache_data
-def load_data():
-    spain_data = pd.read_csv('https://raw.githubusercontent.com/AndersonP444/PROYECTO-SIC-JAKDG/main/valores_mercado_actualizados%20(3).csv')
-    bundesliga_data = pd.read_csv('https://raw.githubusercontent.com/AndersonP444/PROYECTO-SIC-JAKDG/main/valores_mercado_bundesliga_actualizado_v2.csv')
-    return spain_data, bundesliga_data
-
-# Función para convertir valores de mercado
-def convertir_valor(valor):
-    if isinstance(valor, str):
-        if "mil €" in valor:
-            return int(float(valor.replace(" mil €", "").replace(",", ".")) * 1_000)
-        elif "mill. €" in valor:
-            return int(float(valor.replace(" mill. €", "").replace(",", ".")) * 1_000_000)
-    return None
-
-# Función para convertir URLs a imágenes
-def convertir_urls_a_imagenes(df):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        if df_copy[col].astype(str).str.startswith('http').any():
-            df_copy[col] = df_copy[col].apply(lambda url: f'<img src="{url}" width="50">' if isinstance(url, str) and url.startswith('http') else url)
-    return df_copy
-
-# Función para generar valores mensuales interpolados
-def generar_valores_mensuales(valor_inicial, valor_final):
-    fecha_inicio = datetime(2024, 1, 1)
-    fecha_actual = datetime.now()
-    meses = []
-    valores = []
-    
-    fecha_actual = fecha_actual.replace(day=1)
-    fecha = fecha_inicio
-    while fecha <= fecha_actual:
-        meses.append(fecha.strftime('%B %Y'))
-        fecha += timedelta(days=32)
-        fecha = fecha.replace(day=1)
-    
-    num_meses = len(meses)
-    for i in range(num_meses):
-        valor = valor_inicial + (valor_final - valor_inicial) * (i / (num_meses - 1))
-        valores.append(valor)
-    
-    return meses, valores
-
-# Cargar datos
-spain_data, bundesliga_data = load_data()
-
-# Procesar datos de España
-spain_data["Valor de Mercado en 01/01/2024"] = spain_data["Valor de Mercado en 01/01/2024"].apply(convertir_valor)
-spain_data["Valor de Mercado Actual"] = spain_data["Valor de Mercado Actual"].apply(convertir_valor)
+# Cargar datos (leídos y convertidos una sola vez; caché común a todas las variantes)
+# Las ligas y el snapshot salen de la misma copia, para que un refresco en
+# segundo plano entre las dos lecturas no mezcle versiones.
+copia = copia_datos("valores")
+spain_data, bundesliga_data = cargar_datos("valores", copia)
+snapshot = cargar_snapshot("valores", copia)
 
-# Procesar datos de Bundesliga
-bundesliga_data["Valor de Mercado en 01/01/2024"] = bundesliga_data["Valor de Mercado en 01/01/2024"].apply(convertir_valor)
-bundesliga_data["Valor de Mercado Actual"] = bundesliga_data["Valor de Mercado Actual"].apply(convertir_valor)
+estadisticas = servicio_estadisticas(snapshot)
+percentiles = tabla_percentiles(snapshot)
 
-# Sidebar con menú principal
-st.sidebar.title("Menú Principal")
-menu_principal = st.sidebar.radio(
-    "Seleccione una sección:",
-    ["Introducción", "Objetivos", "Metodología", "Herramientas", "Resultados", "Conclusiones"]
-)
-
-# Selector de liga
-liga_seleccionada = st.sidebar.selectbox(
-    "Seleccione la liga:",
-    ["LaLiga", "Bundesliga", "Comparativa"]
-)
+# Función para mostrar los jugadores que más han subido y bajado de valor
+def mostrar_movimientos(liga=None):
+    st.subheader("Mayores movimientos de valor")
+    col1, col2 = st.columns(2)
+    with col1:
+        criterio = st.radio("Ordenar por:", ["Cambio (€)", "Variación (%)"], horizontal=True)
+    with col2:
+        n = st.slider("Jugadores por clasificación:", min_value=5, max_value=50, value=10)
+    movimientos = tabla_movimientos(snapshot)
+    formato = {
+        "Valor de Mercado en 01/01/2024": st.column_config.NumberColumn("Valor Inicial", format="€%.0f"),
+        "Valor de Mercado Actual": st.column_config.NumberColumn("Valor Actual", format="€%.0f"),
+        "Cambio (€)": st.column_config.NumberColumn("Cambio (€)", format="€%.0f"),
+        "Variación (%)": st.column_config.NumberColumn("Variación (%)", format="%.1f%%"),
+    }
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Mayores subidas ↑**")
+        st.dataframe(movimientos.tabla(criterio, "subidas", liga, n), column_config=formato, hide_index=True)
+    with col2:
+        st.markdown("**Mayores bajadas ↓**")
+        st.dataframe(movimientos.tabla(criterio, "bajadas", liga, n), column_config=formato, hide_index=True)
+
+# Función para mostrar las pruebas estadísticas entre LaLiga y Bundesliga
+def mostrar_contrastes():
+    st.subheader("Contraste estadístico entre ligas")
+    contrastes = contrastes_ligas(snapshot, "LaLiga", "Bundesliga")
+    if contrastes.empty:
+        st.info("No hay datos suficientes para comparar las ligas.")
+        return
+    st.dataframe(contrastes.set_index("Variable").T)
+    valor = contrastes[contrastes["Variable"] == "Valor de Mercado Actual"]
+    if not valor.empty:
+        valor = valor.iloc[0]
+        significativo = valor["p (Mann-Whitney)"] < 0.05
+        st.write(f"""
+        - **Mann-Whitney**: p = {valor['p (Mann-Whitney)']:.4f}, {'hay' if significativo else 'no hay'} evidencia de que los valores de mercado de una liga tiendan a ser mayores (nivel 5%).
+        - **Kolmogorov-Smirnov**: D = {valor['D de Kolmogorov-Smirnov']:.3f}, p = {valor['p (Kolmogorov-Smirnov)']:.4f} (diferencia en la forma completa de las distribuciones).
+        - **Diferencia de medianas** (LaLiga - Bundesliga): €{valor['Diferencia de medianas']:,.0f}, IC 95% por bootstrap [€{valor['IC inferior']:,.0f}, €{valor['IC superior']:,.0f}].
+        """)
 
-# Función para convertir URLs a imágenes
-def convertir_urls_a_imagenes(df):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        if df_copy[col].astype(str).str.startswith('http').any():
-            df_copy[col] = df_copy[col].apply(lambda url: f'<img src="{url}" width="50">' if isinstance(url, str) and url.startswith('http') else url)
-    return df_copy
-
-# Función para convertir URLs a imágenes
-def convertir_urls_a_imagenes(df):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        if df_copy[col].astype(str).str.startswith('http').any():
-            df_copy[col] = df_copy[col].apply(lambda url: f'<img src="{url}" width="50">' if isinstance(url, str) and url.startswith('http') else url)
-    return df_copy
+# Sidebar con menú principal y selector de liga
+menu_principal, liga_seleccionada = menu_lateral("valores")
 
 # Código principal
 if menu_principal == "Introducción":
-    st.title("Introducción")
-    st.write("""
-    La industria del fútbol ha evolucionado significativamente, convirtiéndose en un mercado 
-    donde el valor de los jugadores es un indicador crucial de su desempeño y potencial.
-    """)
-
-    # Cargar animación Lottie
-    lottie_url = "https://lottie.host/embed/3d48d4b9-51ad-4b7d-9d28-5e248cace11/Rz3QtSCq3.json"
-    lottie_coding = load_lottieurl(lottie_url)
-    if lottie_coding:
-        st_lottie(lottie_coding, height=200, width=300)
-
-    # Mostrar datos según la liga seleccionada
-    if liga_seleccionada == "LaLiga":
-        data_to_show = spain_data
-        title = "Datos de Jugadores de LaLiga"
-    elif liga_seleccionada == "Bundesliga":
-        data_to_show = bundesliga_data
-        title = "Datos de Jugadores de Bundesliga"
-    else:
-        st.subheader("Comparativa entre LaLiga y Bundesliga")
-        
-        # Mostrar tablas en Comparativa
-        def generar_tabla_html(data):
-            data_con_imagenes = convertir_urls_a_imagenes(data)
-            return data_con_imagenes.to_html(escape=False, index=False)
-
-        # Tabla de LaLiga
-        st.write("### LaLiga")
-        tabla_laliga_html = generar_tabla_html(spain_data)
-        st.markdown(tabla_laliga_html, unsafe_allow_html=True)
-
-        # Tabla de Bundesliga
-        st.write("### Bundesliga")
-        tabla_bundesliga_html = generar_tabla_html(bundesliga_data)
-        st.markdown(tabla_bundesliga_html, unsafe_allow_html=True)
-
-    # Mostrar tabla individual con imágenes (si no es Comparativa)
-    if liga_seleccionada != "Comparativa":
-        with st.container():
-            st.subheader(title)
-            data_con_imagenes = convertir_urls_a_imagenes(data_to_show)
-            st.markdown(data_con_imagenes.to_html(escape=False), unsafe_allow_html=True)
+    mostrar_introduccion(liga_seleccionada, spain_data, bundesliga_data)
 
 
 elif menu_principal == "Metodología":
@@ -158,43 +79,12 @@ elif menu_principal == "Metodología":
         # Comparativa entre LaLiga y Bundesliga
         st.subheader("Comparativa de Valor de Mercado: LaLiga vs Bundesliga")
 
-        # Preparar los datos para la gráfica comparativa
-        fig = go.Figure()
-
-        # Añadir los datos de LaLiga
-        fig.add_trace(go.Violin(
-            y=spain_data['Valor de Mercado Actual'],
-            name='LaLiga',
-            box_visible=True,
-            meanline_visible=True,
-            line_color='blue',
-            fillcolor='rgba(0, 0, 255, 0.3)',
-            opacity=0.7
-        ))
-
-        # Añadir los datos de Bundesliga
-        fig.add_trace(go.Violin(
-            y=bundesliga_data['Valor de Mercado Actual'],
-            name='Bundesliga',
-            box_visible=True,
-            meanline_visible=True,
-            line_color='green',
-            fillcolor='rgba(0, 255, 0, 0.3)',
-            opacity=0.7
-        ))
-
-        # Actualizar el diseño de la gráfica
-        fig.update_layout(
-            title="Distribución de Valores de Mercado por Liga",
-            yaxis_title="Valor de Mercado (€)",
-            xaxis_title="Ligas",
-            violingap=0.5,
-            violingroupgap=0.3,
-            showlegend=False
-        )
+        # Gráfica comparativa (construida una vez por versión de datos)
+        fig = figura_violin_ligas(snapshot, ("LaLiga", "Bundesliga"))
 
         # Mostrar la gráfica comparativa
         st.plotly_chart(fig)
+        mostrar_contrastes()
 
         # Análisis Comparativo
         st.write("""
@@ -233,23 +123,7 @@ elif menu_principal == "Metodología":
                 
                 meses, valores = generar_valores_mensuales(valor_inicial, valor_final)
                 
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=meses,
-                    y=valores,
-                    mode='lines+markers',
-                    name=nombre_jugador,
-                    line=dict(width=3),
-                    marker=dict(size=10)
-                ))
-                
-                fig.update_layout(
-                    title=f'Evolución Mensual del Valor de Mercado de {nombre_jugador}',
-                    xaxis_title='Mes',
-                    yaxis_title='Valor de Mercado (€)',
-                    hovermode='x unified',
-                    showlegend=True
-                )
+                fig = grafico_evolucion(meses, {nombre_jugador: valores}, f'Evolución Mensual del Valor de Mercado de {nombre_jugador}')
                 st.plotly_chart(fig)
                 
                 df_mensual = pd.DataFrame({
@@ -259,153 +133,76 @@ elif menu_principal == "Metodología":
                 st.write("Valores mensuales:")
                 st.dataframe(df_mensual)
 
-        # Visualización: Comparación entre Jugadores
+                # Percentiles del jugador frente a su liga, su posición y todas las ligas
+                filas_jugador = filas_de_jugadores(snapshot, [nombre_jugador], liga_seleccionada)
+                if len(filas_jugador):
+                    st.write("Percentiles del jugador:")
+                    st.dataframe(percentiles.jugador(filas_jugador[0]).round(0))
+
+        # Visualización: Comparación entre Jugadores (varios jugadores en una sola gráfica)
         elif visualizacion == "Comparación entre Jugadores":
             if liga_seleccionada == "Comparativa":
                 st.subheader("Comparación entre Jugadores de LaLiga y Bundesliga")
-                col1, col2 = st.columns(2)
-                with col1:
-                    jugador1 = st.selectbox("Jugador de LaLiga:", spain_data['Nombre'].unique())
-                with col2:
-                    jugador2 = st.selectbox("Jugador de Bundesliga:", bundesliga_data['Nombre'].unique())
-
-                if jugador1 and jugador2:
-                    fig = go.Figure()
-
-                    # Datos LaLiga
-                    datos_jugador1 = spain_data[spain_data['Nombre'] == jugador1]
-                    valor_inicial1 = datos_jugador1['Valor de Mercado en 01/01/2024'].iloc[0]
-                    valor_final1 = datos_jugador1['Valor de Mercado Actual'].iloc[0]
-                    meses1, valores1 = generar_valores_mensuales(valor_inicial1, valor_final1)
-
-                    # Datos Bundesliga
-                    datos_jugador2 = bundesliga_data[bundesliga_data['Nombre'] == jugador2]
-                    valor_inicial2 = datos_jugador2['Valor de Mercado en 01/01/2024'].iloc[0]
-                    valor_final2 = datos_jugador2['Valor de Mercado Actual'].iloc[0]
-                    meses2, valores2 = generar_valores_mensuales(valor_inicial2, valor_final2)
-
-                    fig.add_trace(go.Scatter(
-                        x=meses1,
-                        y=valores1,
-                        mode='lines+markers',
-                        name=f"{jugador1} (LaLiga)",
-                        line=dict(width=3),
-                        marker=dict(size=10)
-                    ))
-
-                    fig.add_trace(go.Scatter(
-                        x=meses2,
-                        y=valores2,
-                        mode='lines+markers',
-                        name=f"{jugador2} (Bundesliga)",
-                        line=dict(width=3),
-                        marker=dict(size=10)
-                    ))
-
-                    fig.update_layout(
-                        title='Comparación de Valores de Mercado entre Ligas',
-                        xaxis_title='Mes',
-                        yaxis_title='Valor de Mercado (€)',
-                        hovermode='x unified',
-                        showlegend=True
-                    )
-                    st.plotly_chart(fig)
-
-                    # Análisis
-                    st.write(f"""
-                    ### Análisis de la Comparación:
-                    - **{jugador1} (LaLiga)**:
-                        - Valor Inicial: €{int(valor_inicial1):,}
-                        - Valor Actual: €{int(valor_final1):,}
-                    - **{jugador2} (Bundesliga)**:
-                        - Valor Inicial: €{int(valor_inicial2):,}
-                        - Valor Actual: €{int(valor_final2):,}
-
-                    Este análisis resalta las diferencias en las trayectorias de los jugadores seleccionados, 
-                    permitiendo observar cómo han evolucionado sus valores de mercado a lo largo del tiempo.
-                    """)
+                opciones_laliga = [(nombre, "LaLiga") for nombre in spain_data['Nombre'].unique()]
+                opciones_bundesliga = [(nombre, "Bundesliga") for nombre in bundesliga_data['Nombre'].unique()]
+                opciones = opciones_laliga + opciones_bundesliga
+                predeterminados = opciones_laliga[:1] + opciones_bundesliga[:1]
             else:
                 st.subheader(f"Comparación entre Jugadores - {liga_seleccionada}")
-                col1, col2 = st.columns(2)
-                with col1:
-                    jugador1 = st.selectbox("Primer jugador:", data['Nombre'].unique())
-                with col2:
-                    jugador2 = st.selectbox("Segundo jugador:", data['Nombre'].unique())
-
-                if jugador1 and jugador2:
-                    fig = go.Figure()
-
-                    for jugador in [jugador1, jugador2]:
-                        datos_jugador = data[data['Nombre'] == jugador]
-                        valor_inicial = datos_jugador['Valor de Mercado en 01/01/2024'].iloc[0]
-                        valor_final = datos_jugador['Valor de Mercado Actual'].iloc[0]
-
-                        meses, valores = generar_valores_mensuales(valor_inicial, valor_final)
-
-                        fig.add_trace(go.Scatter(
-                            x=meses,
-                            y=valores,
-                            mode='lines+markers',
-                            name=jugador,
-                            line=dict(width=3),
-                            marker=dict(size=10)
-                        ))
-
-                    fig.update_layout(
-                        title=f'Comparación de Valores de Mercado - {liga_seleccionada}',
-                        xaxis_title='Mes',
-                        yaxis_title='Valor de Mercado (€)',
-                        hovermode='x unified',
-                        showlegend=True
-                    )
-                    st.plotly_chart(fig)
-
-                    # Análisis
-                    st.write(f"""
+                opciones = [(nombre, liga_seleccionada) for nombre in data['Nombre'].unique()]
+                predeterminados = opciones[:2]
+
+            seleccion = st.multiselect(
+                "Selecciona los jugadores a comparar:",
+                opciones,
+                default=predeterminados,
+                format_func=lambda jugador: f"{jugador[0]} ({jugador[1]})",
+                max_selections=25
+            )
+
+            if seleccion:
+                # Una sola búsqueda para todos los jugadores y un solo corte de la matriz mensual
+                jugadores, meses, valores = evolucion_jugadores(snapshot, seleccion)
+                etiquetas = [f"{nombre} ({liga})" for nombre, liga in jugadores]
+
+                fig = grafico_evolucion(meses, dict(zip(etiquetas, valores)), f'Comparación de Valores de Mercado - {liga_seleccionada}', tamano_marcador=8)
+                st.plotly_chart(fig)
+
+                resumen = pd.DataFrame({
+                    'Jugador': etiquetas,
+                    'Valor Inicial': valores[:, 0],
+                    'Valor Actual': valores[:, -1],
+                    'Cambio (€)': valores[:, -1] - valores[:, 0],
+                })
+                st.dataframe(
+                    resumen,
+                    column_config={
+                        columna: st.column_config.NumberColumn(columna, format="€%.0f")
+                        for columna in ['Valor Inicial', 'Valor Actual', 'Cambio (€)']
+                    },
+                    hide_index=True
+                )
+
+                # Análisis
+                st.write("""
                     ### Análisis de la Comparación:
-                    Comparando los valores de mercado de **{jugador1}** y **{jugador2}** en la misma liga, 
-                    es posible observar diferencias significativas en sus trayectorias.
+                    Comparar las trayectorias de los jugadores seleccionados permite observar 
+                    cómo han evolucionado sus valores de mercado a lo largo del tiempo.
                     
-                    Estos patrones pueden estar relacionados con:
+                    Las diferencias pueden estar relacionadas con:
                     - **Rendimiento reciente**.
                     - **Impacto en sus equipos**.
                     - **Expectativas futuras en el mercado de fichajes**.
                     """)
 
 
-
 elif menu_principal == "Objetivos":
-    st.title("Objetivos del Proyecto")
-    st.write("""
-    ### Objetivos Principales:
-    - Analizar y visualizar el valor de mercado de los jugadores en LaLiga y Bundesliga
-    - Evaluar el incremento porcentual del valor de mercado a lo largo del tiempo
-    - Identificar patrones y tendencias en la valoración de jugadores
-    - Comparar las valoraciones entre las diferentes ligas
-    """)
+    mostrar_objetivos()
+
 
 elif menu_principal == "Herramientas":
-    st.title("Herramientas y Tecnologías")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.header("Tecnologías Principales")
-        st.write("""
-        - Python
-        - Pandas
-        - Streamlit
-        - Plotly
-        - Google Colab
-        - Jupiter Notebook
-        """)
-    
-    with col2:
-        st.header("Bibliotecas Adicionales")
-        st.write("""
-        - Matplotlib
-        - Seaborn
-        - Streamlit-Lottie
-        """)
+    mostrar_herramientas()
+
 
 elif menu_principal == "Resultados":
     st.title("Resultados")
@@ -419,31 +216,25 @@ elif menu_principal == "Resultados":
             
             with col1:
                 st.subheader("LaLiga")
-                st.dataframe(spain_data[['Valor de Mercado en 01/01/2024', 'Valor de Mercado Actual']].describe())
+                st.dataframe(estadisticas.resumen("LaLiga"))
             
             with col2:
                 st.subheader("Bundesliga")
-                st.dataframe(bundesliga_data[['Valor de Mercado en 01/01/2024', 'Valor de Mercado Actual']].describe())
+                st.dataframe(estadisticas.resumen("Bundesliga"))
+
+            dimension = st.selectbox("Resumen agrupado por:", ["Club", "Posición", "Tramo de edad"])
+            st.dataframe(estadisticas.resumen_agrupado(dimension))
         
         with tab2:
             st.header("Análisis Comparativo")
-            fig = go.Figure()
-            
-            fig.add_trace(go.Box(
-                y=spain_data['Valor de Mercado Actual'],
-                name='LaLiga'
-            ))
-            
-            fig.add_trace(go.Box(
-                y=bundesliga_data['Valor de Mercado Actual'],
-                name='Bundesliga'
-            ))
-            
-            fig.update_layout(
-                title='Distribución de Valores de Mercado por Liga',
-                yaxis_title='Valor de Mercado (€)'
-            )
+            fig = grafico_cajas({
+                'LaLiga': spain_data['Valor de Mercado Actual'],
+                'Bundesliga': bundesliga_data['Valor de Mercado Actual']
+            }, 'Distribución de Valores de Mercado por Liga')
             st.plotly_chart(fig)
+            mostrar_contrastes()
+
+            mostrar_movimientos()
         
         with tab3:
             st.header("Recomendaciones")
@@ -458,10 +249,10 @@ elif menu_principal == "Resultados":
         
         with tab1:
             st.header("Estadísticas Generales")
-            if liga_seleccionada == "LaLiga":
-                st.dataframe(spain_data[['Valor de Mercado en 01/01/2024', 'Valor de Mercado Actual']].describe())
-            else:
-                st.dataframe(bundesliga_data[['Valor de Mercado en 01/01/2024', 'Valor de Mercado Actual']].describe())
+            st.dataframe(estadisticas.resumen(liga_seleccionada))
+
+            dimension = st.selectbox("Resumen agrupado por:", ["Club", "Posición", "Tramo de edad"])
+            st.dataframe(estadisticas.resumen_agrupado(dimension, liga=liga_seleccionada))
         
         with tab2:
             st.header("Análisis de Tendencias")
@@ -491,6 +282,8 @@ elif menu_principal == "Resultados":
                 yaxis_title='Valor de Mercado (€)'
             )
             st.plotly_chart(fig)
+
+            mostrar_movimientos(liga_seleccionada)
         
         with tab3:
             st.header("Recomendaciones")
@@ -502,26 +295,10 @@ elif menu_principal == "Resultados":
             """)
 
 else:  # Conclusiones
-    st.title("Conclusiones")
-    if liga_seleccionada == "Comparativa":
-        st.write("""
-        ### Principales Hallazgos:
-        - Comparativa entre LaLiga y Bundesliga muestra patrones interesantes en la valoración de jugadores
-        - Las diferencias entre mercados ofrecen oportunidades únicas de inversión
-        - La gestión basada en datos puede mejorar significativamente las estrategias de los equipos en ambas ligas
-        """)
-    else:
-        st.write(f"""
-        ### Principales Hallazgos en {liga_seleccionada}:
-        - El análisis de datos en el fútbol ofrece insights valiosos para la toma de decisiones
-        - Las tendencias del mercado muestran patrones significativos en la valoración de jugadores
-        - La gestión basada en datos puede mejorar significativamente las estrategias de los equipos
-        """)
-
-# Footer
-st.sidebar.markdown("---")
-st.sidebar.info("ANÁLISIS DE LAS ESTADÍSTICAS QUE TIENEN MAYOR CORRELACIÓN CON EL VALOR DE MERCADO DE LOS JUGADORES DE FUTBOL EN ESPAÑA Y ALEMANIA")
+    mostrar_conclusiones(liga_seleccionada)
 
 
+# Footer
+pie_de_pagina()
 
 
@@ -1,10 +1,32 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
-import requests
-from streamlit_lottie import st_lottie
+from nucleo import (
+    COLUMNAS_VARIACION,
+    EnConjunto,
+    FORMACIONES,
+    arquetipos,
+    columnas_estadisticas,
+    comparar_clubes,
+    contrastes_ligas,
+    escaner_oportunidades,
+    evolucion_jugadores,
+    filas_de_jugadores,
+    filtrar,
+    formatear_variacion,
+    generar_valores_mensuales,
+    jugadores_similares,
+    matriz_correlaciones,
+    plantilla_optima,
+    plantillas_clubes,
+    predicciones,
+    tabla_correlaciones,
+)
+from nucleo.graficos import figura_violin_ligas, grafico_cajas, grafico_evolucion
+from nucleo.arquetipos import MENSAJE_SIN_MODELO as MENSAJE_SIN_ARQUETIPOS
+from nucleo.prediccion import MENSAJE_SIN_MODELO
+from paginas.datos import cargar_datos, cargar_snapshot, copia_datos
+from paginas.secciones import menu_lateral, mostrar_conclusiones, mostrar_herramientas, mostrar_introduccion, mostrar_objetivos, pie_de_pagina
 
 # Configuración inicial de la página
 st.set_page_config(
@@ -13,143 +35,135 @@ st.set_page_config(
     layout="wide"
 )
 
-# Función para cargar animaciones Lottie
-def load_lottieurl(url):
-    r = requests.get(url)
-    if r.status_code != 200:
-        return None
-    return r.json()
-
-# Cargar datos
-@st.cache_data
-def load_data():
-    spain_data = pd.read_csv('https://raw.githubusercontent.com/AndersonP444/PROYECTO-SIC-JAKDG/main/CSV%20DESPUES%20DEL%20PROCESAMIENTO%20DE%20DATOS/valores_mercado_actualizados_con_estadisticas.csv')
-    bundesliga_data = pd.read_csv('https://raw.githubusercontent.com/AndersonP444/PROYECTO-SIC-JAKDG/main/CSV%20DESPUES%20DEL%20PROCESAMIENTO%20DE%20DATOS/valores_mercado_bundesliga_con_estadisticas.csv')
-    return spain_data, bundesliga_data
-
-# Función para convertir valores de mercado
-def convertir_valor(valor):
-    if isinstance(valor, str):
-        if "mil €" in valor:
-            return int(float(valor.replace(" mil €", "").replace(",", ".")) * 1_000)
-        elif "mill. €" in valor:
-            return int(float(valor.replace(" mill. €", "").replace(",", ".")) * 1_000_000)
-    return None
-
-# Función para convertir URLs a imágenes
-def convertir_urls_a_imagenes(df):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        if df_copy[col].astype(str).str.startswith('http').any():
-            df_copy[col] = df_copy[col].apply(lambda url: f'<img src="{url}" width="50">' if isinstance(url, str) and url.startswith('http') else url)
-    return df_copy
-
-# Función para generar valores mensuales interpolados
-def generar_valores_mensuales(valor_inicial, valor_final):
-    fecha_inicio = datetime(2024, 1, 1)
-    fecha_actual = datetime.now()
-    meses = []
-    valores = []
-    
-    fecha_actual = fecha_actual.replace(day=1)
-    fecha = fecha_inicio
-    while fecha <= fecha_actual:
-        meses.append(fecha.strftime('%B %Y'))
-        fecha += timedelta(days=32)
-        fecha = fecha.replace(day=1)
-    
-    num_meses = len(meses)
-    for i in range(num_meses):
-        valor = valor_inicial + (valor_final - valor_inicial) * (i / (num_meses - 1))
-        valores.append(valor)
-    
-    return meses, valores
-
-# Cargar datos
-spain_data, bundesliga_data = load_data()
-
-# Procesar datos de España
-spain_data["Valor de Mercado en 01/01/2024"] = spain_data["Valor de Mercado en 01/01/2024"].apply(convertir_valor)
-spain_data["Valor de Mercado Actual"] = spain_data["Valor de Mercado Actual"].apply(convertir_valor)
-
-# Procesar datos de Bundesliga
-bundesliga_data["Valor de Mercado en 01/01/2024"] = bundesliga_data["Valor de Mercado en 01/01/2024"].apply(convertir_valor)
-bundesliga_data["Valor de Mercado Actual"] = bundesliga_data["Valor de Mercado Actual"].apply(convertir_valor)
-
-# Sidebar con menú principal
-st.sidebar.title("Menú Principal")
-menu_principal = st.sidebar.radio(
-    "Seleccione una sección:",
-    ["Introducción", "Objetivos", "Metodología", "Herramientas", "Resultados", "Conclusiones"]
-)
+# Cargar datos (leídos y convertidos una sola vez; caché común a todas las variantes)
+# Las ligas y el snapshot salen de la misma copia, para que un refresco en
+# segundo plano entre las dos lecturas no mezcle versiones.
+copia = copia_datos("estadisticas")
+spain_data, bundesliga_data = cargar_datos("estadisticas", copia)
+snapshot = cargar_snapshot("estadisticas", copia)
+
+
+# Función para mostrar las pruebas estadísticas entre LaLiga y Bundesliga
+def mostrar_contrastes():
+    st.subheader("Contraste estadístico entre ligas")
+    contrastes = contrastes_ligas(snapshot, "LaLiga", "Bundesliga")
+    if contrastes.empty:
+        st.info("No hay datos suficientes para comparar las ligas.")
+        return
+    st.dataframe(contrastes.set_index("Variable").T)
+    valor = contrastes[contrastes["Variable"] == "Valor de Mercado Actual"]
+    if not valor.empty:
+        valor = valor.iloc[0]
+        significativo = valor["p (Mann-Whitney)"] < 0.05
+        st.write(f"""
+        - **Mann-Whitney**: p = {valor['p (Mann-Whitney)']:.4f}, {'hay' if significativo else 'no hay'} evidencia de que los valores de mercado de una liga tiendan a ser mayores (nivel 5%).
+        - **Kolmogorov-Smirnov**: D = {valor['D de Kolmogorov-Smirnov']:.3f}, p = {valor['p (Kolmogorov-Smirnov)']:.4f} (diferencia en la forma completa de las distribuciones).
+        - **Diferencia de medianas** (LaLiga - Bundesliga): €{valor['Diferencia de medianas']:,.0f}, IC 95% por bootstrap [€{valor['IC inferior']:,.0f}, €{valor['IC superior']:,.0f}].
+        """)
 
-# Selector de liga
-liga_seleccionada = st.sidebar.selectbox(
-    "Seleccione la liga:",
-    ["LaLiga", "Bundesliga", "Comparativa"]
-)
+# Función para mostrar los jugadores infravalorados y sobrevalorados según el modelo
+def mostrar_oportunidades(liga=None):
+    escaner = escaner_oportunidades(snapshot)
+    if escaner is None:
+        st.info(MENSAJE_SIN_MODELO)
+        return
+    n = st.slider("Jugadores por ranking:", min_value=5, max_value=50, value=10)
+    formato = {
+        "Valor de Mercado Actual": st.column_config.NumberColumn("Valor Actual", format="€%.0f"),
+        "Valor Estimado": st.column_config.NumberColumn("Valor Estimado", format="€%.0f"),
+        "Diferencia (%)": st.column_config.NumberColumn("Diferencia (%)", format="%.1f%%"),
+    }
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Jugadores infravalorados")
+        st.dataframe(escaner.tabla("infravalorados", liga, n), column_config=formato, hide_index=True)
+    with col2:
+        st.subheader("Jugadores sobrevalorados")
+        st.dataframe(escaner.tabla("sobrevalorados", liga, n), column_config=formato, hide_index=True)
+
+# Función para construir la mejor plantilla posible con un presupuesto de fichajes
+def mostrar_constructor_plantilla(liga=None):
+    st.subheader("Constructor de plantilla")
+    # Sin modelo de valor solo se puede maximizar una estadística
+    criterios = (["Valor estimado por el modelo"] if predicciones(snapshot) is not None else []) + columnas_estadisticas(snapshot)
+    if not criterios:
+        st.info(MENSAJE_SIN_MODELO)
+        return
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        presupuesto = st.number_input("Presupuesto (millones €):", min_value=1, max_value=2000, value=200)
+    with col2:
+        formacion = st.selectbox("Formación:", list(FORMACIONES))
+    with col3:
+        criterio = st.selectbox("Maximizar:", criterios)
+
+    if st.button("Construir plantilla"):
+        if criterio == "Valor estimado por el modelo":
+            puntuaciones = predicciones(snapshot).estimado
+        else:
+            puntuaciones = snapshot.columnas[criterio]
+        plantilla, tabla = plantilla_optima(
+            snapshot, puntuaciones, presupuesto * 1_000_000, FORMACIONES[formacion],
+            ligas=None if liga is None else [liga]
+        )
+        if plantilla is None:
+            st.warning("No hay jugadores suficientes para completar la formación con ese presupuesto.")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Coste Total", f"€{plantilla.coste:,.0f}")
+            with col2:
+                st.metric("Puntuación Total", f"{plantilla.puntuacion:,.2f}")
+            st.dataframe(
+                tabla,
+                column_config={
+                    "Valor de Mercado Actual": st.column_config.NumberColumn("Valor Actual", format="€%.0f")
+                },
+                hide_index=True
+            )
 
-# Función para convertir URLs a imágenes
-def convertir_urls_a_imagenes(df):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        if df_copy[col].astype(str).str.startswith('http').any():
-            df_copy[col] = df_copy[col].apply(lambda url: f'<img src="{url}" width="50">' if isinstance(url, str) and url.startswith('http') else url)
-    return df_copy
-
-# Función para convertir URLs a imágenes
-def convertir_urls_a_imagenes(df):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        if df_copy[col].astype(str).str.startswith('http').any():
-            df_copy[col] = df_copy[col].apply(lambda url: f'<img src="{url}" width="50">' if isinstance(url, str) and url.startswith('http') else url)
-    return df_copy
+# Función para mostrar el ranking y el mapa de calor de correlaciones con el valor de mercado
+def mostrar_correlaciones(liga):
+    st.header("Correlación de las Estadísticas con el Valor de Mercado")
+    metodo = st.radio("Método:", ["pearson", "spearman"], horizontal=True)
+    with st.spinner("Calculando correlaciones..."):
+        tabla = tabla_correlaciones(snapshot)
+    seleccion = tabla[(tabla["Método"] == metodo) & (tabla["Liga"] == liga)]
+    if seleccion.empty:
+        st.info("No hay estadísticas numéricas suficientes para calcular correlaciones.")
+        return
+
+    st.subheader("Ranking de estadísticas")
+    st.dataframe(
+        seleccion[seleccion["Posición"] == "Todas"].drop(columns=["Liga", "Método"]),
+        hide_index=True
+    )
+
+    matriz = matriz_correlaciones(tabla, metodo, liga)
+    fig = go.Figure(data=go.Heatmap(
+        z=matriz.to_numpy(),
+        x=list(matriz.columns),
+        y=list(matriz.index),
+        zmin=-1,
+        zmax=1,
+        colorscale='RdBu',
+        colorbar=dict(title='r')
+    ))
+    fig.update_layout(
+        title=f'Correlación con el Valor de Mercado por Posición - {liga}',
+        xaxis_title='Posición',
+        yaxis_title='Estadística',
+        height=max(400, 25 * len(matriz))
+    )
+    st.plotly_chart(fig)
+
+# Sidebar con menú principal y selector de liga
+menu_principal, liga_seleccionada = menu_lateral("estadisticas")
 
 # Código principal
 if menu_principal == "Introducción":
-    st.title("Introducción")
-    st.write("""
-    La industria del fútbol ha evolucionado significativamente, convirtiéndose en un mercado 
-    donde el valor de los jugadores es un indicador crucial de su desempeño y potencial.
-    """)
-
-    # Cargar animación Lottie
-    lottie_url = "https://lottie.host/embed/3d48d4b9-51ad-4b7d-9d28-5e248cace11/Rz3QtSCq3.json"
-    lottie_coding = load_lottieurl(lottie_url)
-    if lottie_coding:
-        st_lottie(lottie_coding, height=200, width=300)
-
-    # Mostrar datos según la liga seleccionada
-    if liga_seleccionada == "LaLiga":
-        data_to_show = spain_data
-        title = "Datos de Jugadores de LaLiga"
-    elif liga_seleccionada == "Bundesliga":
-        data_to_show = bundesliga_data
-        title = "Datos de Jugadores de Bundesliga"
-    else:
-        st.subheader("Comparativa entre LaLiga y Bundesliga")
-        
-        # Mostrar tablas en Comparativa
-        def generar_tabla_html(data):
-            data_con_imagenes = convertir_urls_a_imagenes(data)
-            return data_con_imagenes.to_html(escape=False, index=False)
-
-        # Tabla de LaLiga
-        st.write("### LaLiga")
-        tabla_laliga_html = generar_tabla_html(spain_data)
-        st.markdown(tabla_laliga_html, unsafe_allow_html=True)
-
-        # Tabla de Bundesliga
-        st.write("### Bundesliga")
-        tabla_bundesliga_html = generar_tabla_html(bundesliga_data)
-        st.markdown(tabla_bundesliga_html, unsafe_allow_html=True)
-
-    # Mostrar tabla individual con imágenes (si no es Comparativa)
-    if liga_seleccionada != "Comparativa":
-        with st.container():
-            st.subheader(title)
-            data_con_imagenes = convertir_urls_a_imagenes(data_to_show)
-            st.markdown(data_con_imagenes.to_html(escape=False), unsafe_allow_html=True)
+    mostrar_introduccion(liga_seleccionada, spain_data, bundesliga_data)
+
 
 if menu_principal == "Metodología":
     st.title("Metodología")
@@ -159,38 +173,10 @@ if menu_principal == "Metodología":
         
         # 1. Gráfica de violín
         st.subheader("1. Distribución General de Valores de Mercado")
-        fig_violin = go.Figure()
-
-        fig_violin.add_trace(go.Violin(
-            y=spain_data['Valor de Mercado Actual'],
-            name='LaLiga',
-            box_visible=True,
-            meanline_visible=True,
-            line_color='blue',
-            fillcolor='rgba(0, 0, 255, 0.3)',
-            opacity=0.7
-        ))
-
-        fig_violin.add_trace(go.Violin(
-            y=bundesliga_data['Valor de Mercado Actual'],
-            name='Bundesliga',
-            box_visible=True,
-            meanline_visible=True,
-            line_color='green',
-            fillcolor='rgba(0, 255, 0, 0.3)',
-            opacity=0.7
-        ))
-
-        fig_violin.update_layout(
-            title="Distribución de Valores de Mercado por Liga",
-            yaxis_title="Valor de Mercado (€)",
-            xaxis_title="Ligas",
-            violingap=0.5,
-            violingroupgap=0.3,
-            showlegend=True
-        )
+        fig_violin = figura_violin_ligas(snapshot, ("LaLiga", "Bundesliga"), mostrar_leyenda=True)
 
         st.plotly_chart(fig_violin)
+        mostrar_contrastes()
 
         # 2. Gráfica de dispersión
         st.subheader("2. Relación Edad vs Valor de Mercado")
@@ -302,14 +288,14 @@ if menu_principal == "Metodología":
 
         st.plotly_chart(fig_barras)
 
-        # 4. Análisis de Variación Porcentual
-        variacion_laliga = ((datos_laliga['Valor de Mercado Actual'] - 
-                            datos_laliga['Valor de Mercado en 01/01/2024']) / 
-                            datos_laliga['Valor de Mercado en 01/01/2024'] * 100)
-        
-        variacion_bundesliga = ((datos_bundesliga['Valor de Mercado Actual'] - 
-                                datos_bundesliga['Valor de Mercado en 01/01/2024']) / 
-                                datos_bundesliga['Valor de Mercado en 01/01/2024'] * 100)
+        # 4. Análisis de Variación Porcentual (precalculada en la ingesta para todos los jugadores)
+        filas_comparadas = [
+            filas_de_jugadores(snapshot, [jugador_laliga], "LaLiga")[0],
+            filas_de_jugadores(snapshot, [jugador_bundesliga], "Bundesliga")[0],
+        ]
+        variaciones = snapshot.a_dataframe(filas_comparadas, COLUMNAS_VARIACION)
+        variacion_laliga, variacion_bundesliga = variaciones["Variación (%)"]
+        tendencia_laliga, tendencia_bundesliga = variaciones["Tendencia"]
 
         # Gráfica de variación porcentual
         fig_variacion = go.Figure(data=[
@@ -317,7 +303,7 @@ if menu_principal == "Metodología":
                 x=['LaLiga', 'Bundesliga'],
                 y=[variacion_laliga, variacion_bundesliga],
                 marker_color=['red', 'blue'],
-                text=[f"{variacion_laliga:.1f}%", f"{variacion_bundesliga:.1f}%"],
+                text=[formatear_variacion(variacion_laliga, 1), formatear_variacion(variacion_bundesliga, 1)],
                 textposition='auto',
             )
         ])
@@ -349,14 +335,14 @@ if menu_principal == "Metodología":
         **{jugador_laliga} (LaLiga)**
         - Valor inicial (Enero 2024): €{datos_laliga['Valor de Mercado en 01/01/2024']:,}
         - Valor actual: €{datos_laliga['Valor de Mercado Actual']:,}
-        - Variación porcentual: {variacion_laliga:.2f}%
-        - Tendencia: {'Positiva ↑' if variacion_laliga > 0 else 'Negativa ↓' if variacion_laliga < 0 else 'Estable →'}
+        - Variación porcentual: {formatear_variacion(variacion_laliga)}
+        - Tendencia: {tendencia_laliga}
 
         **{jugador_bundesliga} (Bundesliga)**
         - Valor inicial (Enero 2024): €{datos_bundesliga['Valor de Mercado en 01/01/2024']:,}
         - Valor actual: €{datos_bundesliga['Valor de Mercado Actual']:,}
-        - Variación porcentual: {variacion_bundesliga:.2f}%
-        - Tendencia: {'Positiva ↑' if variacion_bundesliga > 0 else 'Negativa ↓' if variacion_bundesliga < 0 else 'Estable →'}
+        - Variación porcentual: {formatear_variacion(variacion_bundesliga)}
+        - Tendencia: {tendencia_bundesliga}
 
         #### 4. Factores Influyentes
         
@@ -376,12 +362,51 @@ if menu_principal == "Metodología":
         - Diferencias entre ligas: {'Los valores sugieren una valoración más alta en LaLiga' if datos_laliga['Valor de Mercado Actual'] > datos_bundesliga['Valor de Mercado Actual'] else 'Los valores sugieren una valoración más alta en Bundesliga'}
         - Oportunidades de mercado: {'Potencial de inversión en crecimiento' if variacion_laliga > 0 or variacion_bundesliga > 0 else 'Momento de cautela en inversiones'}
         """)
+
+        # 5. Comparación de Plantillas (club contra club, entre ligas)
+        st.subheader("5. Comparación de Plantillas")
+        plantillas = plantillas_clubes(snapshot)
+        col1, col2 = st.columns(2)
+        with col1:
+            club_laliga = st.selectbox("Club de LaLiga:", plantillas.clubes("LaLiga"), format_func=lambda club: club[1])
+        with col2:
+            club_bundesliga = st.selectbox("Club de Bundesliga:", plantillas.clubes("Bundesliga"), format_func=lambda club: club[1])
+
+        if club_laliga and club_bundesliga:
+            resumen_clubes, estructura_edad, valor_posiciones = comparar_clubes(snapshot, club_laliga, club_bundesliga)
+            st.dataframe(resumen_clubes.style.format("{:,.1f}"))
+
+            col1, col2 = st.columns(2)
+            with col1:
+                fig_edades = go.Figure(data=[
+                    go.Bar(name=club, x=estructura_edad.index, y=estructura_edad[("Jugadores", club)], marker_color=color)
+                    for club, color in zip(resumen_clubes.columns, ['red', 'blue'])
+                ])
+                fig_edades.update_layout(
+                    title='Estructura de Edad de las Plantillas',
+                    xaxis_title='Tramo de edad',
+                    yaxis_title='Jugadores',
+                    barmode='group'
+                )
+                st.plotly_chart(fig_edades)
+            with col2:
+                fig_posiciones = go.Figure(data=[
+                    go.Bar(name=club, x=valor_posiciones.index, y=valor_posiciones[club], marker_color=color)
+                    for club, color in zip(resumen_clubes.columns, ['red', 'blue'])
+                ])
+                fig_posiciones.update_layout(
+                    title='Valor de Mercado por Línea',
+                    xaxis_title='Grupo de posición',
+                    yaxis_title='Valor de Mercado (€)',
+                    barmode='group'
+                )
+                st.plotly_chart(fig_posiciones)
     
     else:
         # Para las otras visualizaciones (Evolución Individual, Comparación entre Jugadores, etc.)
         visualizacion = st.selectbox(
             "Seleccione tipo de visualización:",
-            ["Evolución Individual", "Comparación entre Jugadores"]
+            ["Evolución Individual", "Comparación entre Jugadores", "Jugadores Similares", "Arquetipos"]
         )
 
         # Selección de datos según la liga
@@ -402,23 +427,7 @@ if menu_principal == "Metodología":
                 
                 meses, valores = generar_valores_mensuales(valor_inicial, valor_final)
                 
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=meses,
-                    y=valores,
-                    mode='lines+markers',
-                    name=nombre_jugador,
-                    line=dict(width=3),
-                    marker=dict(size=10)
-                ))
-                
-                fig.update_layout(
-                    title=f'Evolución Mensual del Valor de Mercado de {nombre_jugador}',
-                    xaxis_title='Mes',
-                    yaxis_title='Valor de Mercado (€)',
-                    hovermode='x unified',
-                    showlegend=True
-                )
+                fig = grafico_evolucion(meses, {nombre_jugador: valores}, f'Evolución Mensual del Valor de Mercado de {nombre_jugador}')
                 st.plotly_chart(fig)
                 
                 df_mensual = pd.DataFrame({
@@ -428,159 +437,160 @@ if menu_principal == "Metodología":
                 st.write("Valores mensuales:")
                 st.dataframe(df_mensual)
 
-        # Visualización: Comparación entre Jugadores
+                # Valor estimado por el modelo a partir de las estadísticas del jugador
+                filas_jugador = filas_de_jugadores(snapshot, [nombre_jugador], liga_seleccionada)
+                estimacion = predicciones(snapshot)
+                if len(filas_jugador) and estimacion is not None:
+                    fila = filas_jugador[0]
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.metric("Valor Estimado por el Modelo", f"€{estimacion.estimado[fila]:,.0f}")
+                    with col2:
+                        st.metric("Diferencia con el Valor Actual", f"€{estimacion.residuo[fila]:,.0f}",
+                                  delta=f"{estimacion.residuo_relativo[fila]:.1f}%")
+
+        # Visualización: Comparación entre Jugadores (varios jugadores en una sola gráfica)
         elif visualizacion == "Comparación entre Jugadores":
             if liga_seleccionada == "Comparativa":
                 st.subheader("Comparación entre Jugadores de LaLiga y Bundesliga")
-                col1, col2 = st.columns(2)
-                with col1:
-                    jugador1 = st.selectbox("Jugador de LaLiga:", spain_data['Nombre'].unique())
-                with col2:
-                    jugador2 = st.selectbox("Jugador de Bundesliga:", bundesliga_data['Nombre'].unique())
-
-                if jugador1 and jugador2:
-                    fig = go.Figure()
-
-                    # Datos LaLiga
-                    datos_jugador1 = spain_data[spain_data['Nombre'] == jugador1]
-                    valor_inicial1 = datos_jugador1['Valor de Mercado en 01/01/2024'].iloc[0]
-                    valor_final1 = datos_jugador1['Valor de Mercado Actual'].iloc[0]
-                    meses1, valores1 = generar_valores_mensuales(valor_inicial1, valor_final1)
-
-                    # Datos Bundesliga
-                    datos_jugador2 = bundesliga_data[bundesliga_data['Nombre'] == jugador2]
-                    valor_inicial2 = datos_jugador2['Valor de Mercado en 01/01/2024'].iloc[0]
-                    valor_final2 = datos_jugador2['Valor de Mercado Actual'].iloc[0]
-                    meses2, valores2 = generar_valores_mensuales(valor_inicial2, valor_final2)
-
-                    fig.add_trace(go.Scatter(
-                        x=meses1,
-                        y=valores1,
-                        mode='lines+markers',
-                        name=f"{jugador1} (LaLiga)",
-                        line=dict(width=3),
-                        marker=dict(size=10)
-                    ))
-
-                    fig.add_trace(go.Scatter(
-                        x=meses2,
-                        y=valores2,
-                        mode='lines+markers',
-                        name=f"{jugador2} (Bundesliga)",
-                        line=dict(width=3),
-                        marker=dict(size=10)
-                    ))
-
-                    fig.update_layout(
-                        title='Comparación de Valores de Mercado entre Ligas',
-                        xaxis_title='Mes',
-                        yaxis_title='Valor de Mercado (€)',
-                        hovermode='x unified',
-                        showlegend=True
-                    )
-                    st.plotly_chart(fig)
-
-                    # Análisis
-                    st.write(f"""
-                    ### Análisis de la Comparación:
-                    - **{jugador1} (LaLiga)**:
-                        - Valor Inicial: €{int(valor_inicial1):,}
-                        - Valor Actual: €{int(valor_final1):,}
-                    - **{jugador2} (Bundesliga)**:
-                        - Valor Inicial: €{int(valor_inicial2):,}
-                        - Valor Actual: €{int(valor_final2):,}
-
-                    Este análisis resalta las diferencias en las trayectorias de los jugadores seleccionados, 
-                    permitiendo observar cómo han evolucionado sus valores de mercado a lo largo del tiempo.
-                    """)
+                opciones_laliga = [(nombre, "LaLiga") for nombre in spain_data['Nombre'].unique()]
+                opciones_bundesliga = [(nombre, "Bundesliga") for nombre in bundesliga_data['Nombre'].unique()]
+                opciones = opciones_laliga + opciones_bundesliga
+                predeterminados = opciones_laliga[:1] + opciones_bundesliga[:1]
             else:
                 st.subheader(f"Comparación entre Jugadores - {liga_seleccionada}")
-                col1, col2 = st.columns(2)
-                with col1:
-                    jugador1 = st.selectbox("Primer jugador:", data['Nombre'].unique())
-                with col2:
-                    jugador2 = st.selectbox("Segundo jugador:", data['Nombre'].unique())
-
-                if jugador1 and jugador2:
-                    fig = go.Figure()
-
-                    for jugador in [jugador1, jugador2]:
-                        datos_jugador = data[data['Nombre'] == jugador]
-                        valor_inicial = datos_jugador['Valor de Mercado en 01/01/2024'].iloc[0]
-                        valor_final = datos_jugador['Valor de Mercado Actual'].iloc[0]
-
-                        meses, valores = generar_valores_mensuales(valor_inicial, valor_final)
-
-                        fig.add_trace(go.Scatter(
-                            x=meses,
-                            y=valores,
-                            mode='lines+markers',
-                            name=jugador,
-                            line=dict(width=3),
-                            marker=dict(size=10)
-                        ))
-
-                    fig.update_layout(
-                        title=f'Comparación de Valores de Mercado - {liga_seleccionada}',
-                        xaxis_title='Mes',
-                        yaxis_title='Valor de Mercado (€)',
-                        hovermode='x unified',
-                        showlegend=True
-                    )
-                    st.plotly_chart(fig)
+                opciones = [(nombre, liga_seleccionada) for nombre in data['Nombre'].unique()]
+                predeterminados = opciones[:2]
+
+            seleccion = st.multiselect(
+                "Selecciona los jugadores a comparar:",
+                opciones,
+                default=predeterminados,
+                format_func=lambda jugador: f"{jugador[0]} ({jugador[1]})",
+                max_selections=25
+            )
+
+            if seleccion:
+                # Una sola búsqueda para todos los jugadores y un solo corte de la matriz mensual
+                jugadores, meses, valores = evolucion_jugadores(snapshot, seleccion)
+                etiquetas = [f"{nombre} ({liga})" for nombre, liga in jugadores]
+
+                fig = grafico_evolucion(meses, dict(zip(etiquetas, valores)), f'Comparación de Valores de Mercado - {liga_seleccionada}', tamano_marcador=8)
+                st.plotly_chart(fig)
+
+                resumen = pd.DataFrame({
+                    'Jugador': etiquetas,
+                    'Valor Inicial': valores[:, 0],
+                    'Valor Actual': valores[:, -1],
+                    'Cambio (€)': valores[:, -1] - valores[:, 0],
+                })
+                st.dataframe(
+                    resumen,
+                    column_config={
+                        columna: st.column_config.NumberColumn(columna, format="€%.0f")
+                        for columna in ['Valor Inicial', 'Valor Actual', 'Cambio (€)']
+                    },
+                    hide_index=True
+                )
 
-                    # Análisis
-                    st.write(f"""
+                # Análisis
+                st.write("""
                     ### Análisis de la Comparación:
-                    Comparando los valores de mercado de **{jugador1}** y **{jugador2}** en la misma liga, 
-                    es posible observar diferencias significativas en sus trayectorias.
+                    Comparar las trayectorias de los jugadores seleccionados permite observar 
+                    cómo han evolucionado sus valores de mercado a lo largo del tiempo.
                     
-                    Estos patrones pueden estar relacionados con:
+                    Las diferencias pueden estar relacionadas con:
                     - **Rendimiento reciente**.
                     - **Impacto en sus equipos**.
                     - **Expectativas futuras en el mercado de fichajes**.
                     """)
 
+        # Visualización: Jugadores Similares (búsqueda en todas las ligas)
+        elif visualizacion == "Jugadores Similares":
+            st.subheader(f"Jugadores Similares - {liga_seleccionada}")
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                nombre_jugador = st.selectbox("Selecciona un jugador:", data['Nombre'].unique())
+            with col2:
+                metrica = st.radio("Métrica:", ["coseno", "euclidea"], horizontal=True)
+            with col3:
+                k = st.slider("Número de jugadores:", min_value=5, max_value=50, value=10)
+
+            filas_jugador = filas_de_jugadores(snapshot, [nombre_jugador], liga_seleccionada)
+            if len(filas_jugador):
+                similares = jugadores_similares(snapshot, filas_jugador[0], k, metrica)
+                if similares is None:
+                    st.info("No hay estadísticas numéricas para comparar jugadores.")
+                else:
+                    st.write(f"Jugadores con estadísticas más parecidas a **{nombre_jugador}** en todas las ligas:")
+                    st.dataframe(
+                        similares,
+                        column_config={
+                            "Valor de Mercado Actual": st.column_config.NumberColumn(
+                                "Valor Actual",
+                                format="€%.0f"
+                            )
+                        },
+                        hide_index=True
+                    )
+
+        # Visualización: Arquetipos (perfiles de juego por posición, precalculados)
+        elif visualizacion == "Arquetipos":
+            st.subheader(f"Arquetipos de Jugadores - {liga_seleccionada}")
+            resultado = arquetipos(snapshot)
+            if resultado is None:
+                st.info(MENSAJE_SIN_ARQUETIPOS)
+            else:
+                st.write("Resumen de valor de mercado por arquetipo (todas las ligas):")
+                st.dataframe(
+                    resultado.resumen,
+                    column_config={
+                        columna: st.column_config.NumberColumn(columna, format="€%.0f")
+                        for columna in ["Valor total", "Valor medio", "Valor mediano"]
+                    },
+                    hide_index=True
+                )
+
+                fig = go.Figure(go.Bar(
+                    x=resultado.resumen["Arquetipo"],
+                    y=resultado.resumen["Valor medio"],
+                    marker_color='rgba(0, 0, 255, 0.7)'
+                ))
+                fig.update_layout(
+                    title='Valor de Mercado Medio por Arquetipo',
+                    xaxis_title='Arquetipo',
+                    yaxis_title='Valor de Mercado (€)'
+                )
+                st.plotly_chart(fig)
+
+                seleccion = st.multiselect("Filtrar por arquetipo:", list(resultado.resumen["Arquetipo"]))
+                if seleccion:
+                    filas = resultado.filas(seleccion, filtrar(snapshot, [EnConjunto("Liga", [liga_seleccionada])]))
+                    columnas = ["Nombre", "Club", "Posición", "Edad", "Valor de Mercado Actual"]
+                    jugadores = snapshot.a_dataframe(filas, [c for c in columnas if c in snapshot.columnas])
+                    jugadores.insert(1, "Arquetipo", resultado.etiquetas[filas])
+                    st.dataframe(
+                        jugadores,
+                        column_config={
+                            "Valor de Mercado Actual": st.column_config.NumberColumn("Valor Actual", format="€%.0f")
+                        },
+                        hide_index=True
+                    )
 
 
 elif menu_principal == "Objetivos":
-    st.title("Objetivos del Proyecto")
-    st.write("""
-    ### Objetivos Principales:
-    - Analizar y visualizar el valor de mercado de los jugadores en LaLiga y Bundesliga
-    - Evaluar el incremento porcentual del valor de mercado a lo largo del tiempo
-    - Identificar patrones y tendencias en la valoración de jugadores
-    - Comparar las valoraciones entre las diferentes ligas
-    """)
+    mostrar_objetivos()
+
 
 elif menu_principal == "Herramientas":
-    st.title("Herramientas y Tecnologías")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.header("Tecnologías Principales")
-        st.write("""
-        - Python
-        - Pandas
-        - Streamlit
-        - Plotly
-        - Google Colab
-        - Jupiter Notebook
-        """)
-    
-    with col2:
-        st.header("Bibliotecas Adicionales")
-        st.write("""
-        - Matplotlib
-        - Seaborn
-        - Streamlit-Lottie
-        """)
+    mostrar_herramientas()
+
 
 elif menu_principal == "Resultados":
     st.title("Resultados")
     
     if liga_seleccionada == "Comparativa":
-        tab1, tab2, tab3 = st.tabs(["Estadísticas Generales", "Análisis Comparativo", "Recomendaciones"])
+        tab1, tab2, tab3, tab4 = st.tabs(["Estadísticas Generales", "Análisis Comparativo", "Recomendaciones", "Correlaciones"])
         
         with tab1:
             st.header("Estadísticas Generales")
@@ -596,23 +606,12 @@ elif menu_principal == "Resultados":
         
         with tab2:
             st.header("Análisis Comparativo")
-            fig = go.Figure()
-            
-            fig.add_trace(go.Box(
-                y=spain_data['Valor de Mercado Actual'],
-                name='LaLiga'
-            ))
-            
-            fig.add_trace(go.Box(
-                y=bundesliga_data['Valor de Mercado Actual'],
-                name='Bundesliga'
-            ))
-            
-            fig.update_layout(
-                title='Distribución de Valores de Mercado por Liga',
-                yaxis_title='Valor de Mercado (€)'
-            )
+            fig = grafico_cajas({
+                'LaLiga': spain_data['Valor de Mercado Actual'],
+                'Bundesliga': bundesliga_data['Valor de Mercado Actual']
+            }, 'Distribución de Valores de Mercado por Liga')
             st.plotly_chart(fig)
+            mostrar_contrastes()
         
         with tab3:
             st.header("Recomendaciones")
@@ -622,8 +621,13 @@ elif menu_principal == "Resultados":
             - Estrategias de inversión considerando diferencias entre mercados
             - Oportunidades de mercado en ambas ligas
             """)
+            mostrar_oportunidades()
+            mostrar_constructor_plantilla()
+
+        with tab4:
+            mostrar_correlaciones("Todas")
     else:
-        tab1, tab2, tab3 = st.tabs(["Estadísticas Generales", "Análisis de Tendencias", "Recomendaciones"])
+        tab1, tab2, tab3, tab4 = st.tabs(["Estadísticas Generales", "Análisis de Tendencias", "Recomendaciones", "Correlaciones"])
         
         with tab1:
             st.header("Estadísticas Generales")
@@ -669,24 +673,15 @@ elif menu_principal == "Resultados":
             - Estrategias de inversión
             - Oportunidades de mercado
             """)
+            mostrar_oportunidades(liga_seleccionada)
+            mostrar_constructor_plantilla(liga_seleccionada)
+
+        with tab4:
+            mostrar_correlaciones(liga_seleccionada)
 
 else:  # Conclusiones
-    st.title("Conclusiones")
-    if liga_seleccionada == "Comparativa":
-        st.write("""
-        ### Principales Hallazgos:
-        - Comparativa entre LaLiga y Bundesliga muestra patrones interesantes en la valoración de jugadores
-        - Las diferencias entre mercados ofrecen oportunidades únicas de inversión
-        - La gestión basada en datos puede mejorar significativamente las estrategias de los equipos en ambas ligas
-        """)
-    else:
-        st.write(f"""
-        ### Principales Hallazgos en {liga_seleccionada}:
-        - El análisis de datos en el fútbol ofrece insights valiosos para la toma de decisiones
-        - Las tendencias del mercado muestran patrones significativos en la valoración de jugadores
-        - La gestión basada en datos puede mejorar significativamente las estrategias de los equipos
-        """)
+    mostrar_conclusiones(liga_seleccionada)
+
 
 # Footer
-st.sidebar.markdown("---")
-st.sidebar.info("ANÁLISIS DE LAS ESTADÍSTICAS QUE TIENEN MAYOR CORRELACIÓN CON EL VALOR DE MERCADO DE LOS JUGADORES DE FUTBOL EN ESPAÑA Y ALEMANIA")
+pie_de_pagina()
@@ -0,0 +1,117 @@
+# Tiempo de arranque de los puntos de entrada de Streamlit: importa en un
+# proceso limpio los módulos que cada script carga al inicio (las importaciones
+# de nivel superior), informa del coste de cada módulo y comprueba el
+# presupuesto de arranque. Termina con código 1 si algún script lo supera o
+# carga al arrancar un módulo que solo deberían importar las páginas que lo usan.
+# python benchmarks/bench_arranque.py [--presupuesto SEGUNDOS] [--top N] [SCRIPT ...]
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRADAS = ["app.py", "app (4).py", "app (7).py", "appt.py", "OPOP.py", "streamlitapp.py"]
+# Segundos que puede tardar un script en importar sus módulos de arranque
+PRESUPUESTO = 1.5
+REPETICIONES = 3
+# Módulos que solo se usan en algunas páginas y no deben cargarse al arrancar
+MODULOS_DIFERIDOS = ["plotly.express", "requests", "scipy", "streamlit_lottie"]
+TOP = 10
+
+
+# Función para extraer, como código, las importaciones de nivel superior de un
+# script (también las que están dentro de un try, como las opcionales) y los
+# nombres de los módulos que importa
+def importaciones_arranque(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        arbol = ast.parse(archivo.read())
+    sentencias = []
+    modulos = set()
+    for nodo in arbol.body:
+        importaciones = [nodo] if isinstance(nodo, (ast.Import, ast.ImportFrom)) else []
+        if isinstance(nodo, ast.Try) and all(isinstance(n, (ast.Import, ast.ImportFrom)) for n in nodo.body):
+            importaciones = nodo.body
+        if not importaciones:
+            continue
+        sentencias.append(ast.unparse(nodo))
+        for importacion in importaciones:
+            if isinstance(importacion, ast.ImportFrom):
+                modulos.add(importacion.module)
+            else:
+                modulos.update(alias.name for alias in importacion.names)
+    return "\n".join(sentencias), modulos
+
+
+# Función para ejecutar las importaciones en un intérprete nuevo. Devuelve el
+# tiempo total, los módulos diferidos que se cargaron y la salida de -X importtime.
+def medir(importaciones, detalle=False):
+    codigo = "\n".join([
+        "import sys, time",
+        "inicio = time.perf_counter()",
+        importaciones,
+        "print(time.perf_counter() - inicio)",
+        f"print('diferidos:' + ','.join(m for m in {MODULOS_DIFERIDOS!r} if m in sys.modules))",
+    ])
+    opciones = ["-X", "importtime"] if detalle else []
+    resultado = subprocess.run(
+        [sys.executable, *opciones, "-c", codigo],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    lineas = resultado.stdout.splitlines()
+    diferidos = [m for m in lineas[-1][len("diferidos:"):].split(",") if m]
+    return float(lineas[-2]), diferidos, resultado.stderr
+
+
+# Función para leer la salida de -X importtime: (módulo, propio, acumulado) en segundos
+def tiempos_modulos(salida):
+    tiempos = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        tiempos.append((nombre.strip(), int(propio) / 1e6, int(acumulado) / 1e6))
+    return tiempos
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Informe y presupuesto del tiempo de arranque.")
+    parser.add_argument("scripts", nargs="*", default=ENTRADAS, help="Puntos de entrada a medir")
+    parser.add_argument("--presupuesto", type=float, default=PRESUPUESTO, help="Segundos máximos de importación")
+    parser.add_argument("--top", type=int, default=TOP, help="Módulos que se muestran por script")
+    args = parser.parse_args(argumentos)
+
+    fallos = []
+    for script in args.scripts:
+        importaciones, modulos = importaciones_arranque(os.path.join(RAIZ, script))
+        try:
+            _, _, detalle = medir(importaciones, detalle=True)
+            mediciones = [medir(importaciones) for _ in range(REPETICIONES)]
+        except subprocess.CalledProcessError as error:
+            print(f"\n{script}: no se pudo importar\n{error.stderr.strip().splitlines()[-1]}")
+            fallos.append(script)
+            continue
+        total = min(tiempo for tiempo, _, _ in mediciones)
+        diferidos = mediciones[0][1]
+        tiempos = tiempos_modulos(detalle)
+
+        estado = "OK" if total <= args.presupuesto and not diferidos else "FUERA DE PRESUPUESTO"
+        print(f"\n{script}: {total:.3f} s (presupuesto {args.presupuesto:.3f} s) {estado}")
+        if diferidos:
+            print(f"  Módulos diferidos cargados al arrancar: {', '.join(diferidos)}")
+        print(f"  {'importación directa':<40} {'acumulado (ms)':>15}")
+        for nombre, _, acumulado in sorted((t for t in tiempos if t[0] in modulos), key=lambda t: -t[2])[:args.top]:
+            print(f"  {nombre:<40} {acumulado * 1000:>15.1f}")
+        print(f"  {'módulo':<40} {'propio (ms)':>15}")
+        for nombre, propio, _ in sorted(tiempos, key=lambda t: -t[1])[:args.top]:
+            print(f"  {nombre:<40} {propio * 1000:>15.1f}")
+        if estado != "OK":
+            fallos.append(script)
+
+    if fallos:
+        print(f"\nFuera de presupuesto: {', '.join(fallos)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# Benchmark del optimizador de plantillas sobre grupos sintéticos de jugadores
+# de tamaño creciente: python benchmarks/bench_plantilla.py
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nucleo.plantilla import FORMACIONES, optimizar_plantilla
+
+TAMANOS = [500, 1_000, 2_000, 5_000, 10_000, 20_000]
+PRESUPUESTO = 300_000_000
+REPETICIONES = 3
+
+
+# Función para generar jugadores sintéticos: valores de mercado log-normales y
+# una puntuación correlacionada con el valor más ruido
+def grupo_sintetico(n, generador):
+    costes = np.round(np.exp(generador.normal(15.5, 1.2, n)), -4)
+    puntuaciones = np.log(costes) + generador.normal(0, 0.5, n)
+    grupos = generador.choice(list(FORMACIONES["4-3-3"]), n, p=[0.1, 0.35, 0.3, 0.25])
+    return costes, puntuaciones, grupos
+
+
+def main():
+    generador = np.random.default_rng(0)
+    print(f"{'jugadores':>10} {'mejor (s)':>10} {'media (s)':>10} {'puntuación':>11} {'coste (M€)':>11}")
+    for n in TAMANOS:
+        costes, puntuaciones, grupos = grupo_sintetico(n, generador)
+        tiempos = []
+        for _ in range(REPETICIONES):
+            inicio = time.perf_counter()
+            plantilla = optimizar_plantilla(costes, puntuaciones, grupos, FORMACIONES["4-3-3"], PRESUPUESTO)
+            tiempos.append(time.perf_counter() - inicio)
+        print(f"{n:>10} {min(tiempos):>10.3f} {np.mean(tiempos):>10.3f} "
+              f"{plantilla.puntuacion:>11.2f} {plantilla.coste / 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
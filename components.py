@@ -0,0 +1,111 @@
+# Componentes reutilizables de las aplicaciones. Las figuras se construyen una
+# vez por versión de datos y argumentos y se comparten entre ejecuciones y
+# sesiones, así que se pueden pasar a st.plotly_chart pero no modificar.
+from collections import Counter
+
+import numpy as np
+import streamlit as st
+
+from nucleo.cache import por_version
+from nucleo.consultas import filas_de_jugadores
+from nucleo.esquema import (
+    COL_CAMBIO,
+    COL_EDAD,
+    COL_LIGA,
+    COL_NOMBRE,
+    COL_VALOR_ACTUAL,
+    COL_VALOR_INICIAL,
+    COL_VARIACION_PCT,
+)
+from nucleo.graficos import grafico_evolucion
+from nucleo.mensual import evolucion_jugadores, mes_actual
+from nucleo.percentiles import tabla_percentiles
+from nucleo.variacion import formatear_variacion
+
+
+# Función para resolver varios nombres (opcionalmente dentro de una liga) en
+# parejas (nombre, liga) con una única búsqueda en el índice de nombres. Si un
+# nombre aparece en varias ligas se toma la primera.
+def _parejas_jugadores(snapshot, nombres, liga=None):
+    filas = filas_de_jugadores(snapshot, nombres, liga)
+    etiquetas = snapshot.a_dataframe(filas, [COL_NOMBRE, COL_LIGA])
+    ligas = {}
+    for nombre, liga_jugador in zip(etiquetas[COL_NOMBRE], etiquetas[COL_LIGA]):
+        ligas.setdefault(nombre, liga_jugador)
+    return [(nombre, ligas[nombre]) for nombre in nombres if nombre in ligas]
+
+
+# Figura de evolución mensual de varios jugadores, memorizada por versión de
+# datos, jugadores, liga y mes (la evolución llega hasta el mes actual)
+@por_version
+def _figura_evolucion(snapshot, nombres, liga, mes, titulo):
+    parejas = _parejas_jugadores(snapshot, list(nombres), liga)
+    encontrados, meses, valores = evolucion_jugadores(snapshot, parejas, mes)
+    apariciones = Counter(nombre for nombre, _ in encontrados)
+    series = {
+        f"{nombre} ({liga_jugador})" if apariciones[nombre] > 1 else nombre: fila
+        for (nombre, liga_jugador), fila in zip(encontrados, valores)
+    }
+    return grafico_evolucion(meses, series, titulo)
+
+
+# Función para obtener la gráfica de evolución del valor de un jugador
+def crear_grafico_evolucion(snapshot, nombre, liga=None):
+    return _figura_evolucion(snapshot, (nombre,), liga, mes_actual(), f"Evolución del Valor de Mercado - {nombre}")
+
+
+# Función para obtener la gráfica que compara la evolución de varios jugadores
+def crear_grafico_comparacion(snapshot, nombres, liga=None):
+    return _figura_evolucion(snapshot, tuple(nombres), liga, mes_actual(), "Comparación de Evolución del Valor de Mercado")
+
+
+# Métricas de un jugador leídas de su fila en el snapshot, con el percentil de
+# su valor actual dentro de su liga. Devuelve None si el jugador no existe.
+@por_version
+def metricas_jugador(snapshot, nombre, liga=None):
+    filas = filas_de_jugadores(snapshot, [nombre], liga)
+    if len(filas) == 0:
+        return None
+    fila = int(filas[0])
+
+    def valor(columna):
+        return float(snapshot.columnas[columna][fila]) if columna in snapshot.columnas else np.nan
+
+    return {
+        "Liga": snapshot.a_dataframe(filas[:1], [COL_LIGA])[COL_LIGA].iloc[0],
+        "Edad": valor(COL_EDAD),
+        "Valor inicial": valor(COL_VALOR_INICIAL),
+        "Valor actual": valor(COL_VALOR_ACTUAL),
+        "Cambio": valor(COL_CAMBIO),
+        "Variación": valor(COL_VARIACION_PCT),
+        "Percentil en la liga": float(tabla_percentiles(snapshot).columna(COL_VALOR_ACTUAL, "Liga")[fila]),
+    }
+
+
+# Función para formatear un importe en euros, o "Sin datos" si no existe
+def _euros(valor):
+    return "Sin datos" if np.isnan(valor) else f"€{valor:,.0f}"
+
+
+# Función para mostrar las métricas de un jugador en una fila de tarjetas
+def mostrar_metricas_jugador(snapshot, nombre, liga=None):
+    metricas = metricas_jugador(snapshot, nombre, liga)
+    if metricas is None:
+        st.warning(f"No se encontró a {nombre} en los datos.")
+        return
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Valor Inicial", _euros(metricas["Valor inicial"]))
+    with col2:
+        st.metric(
+            "Valor Actual",
+            _euros(metricas["Valor actual"]),
+            delta=None if np.isnan(metricas["Cambio"]) else f"€{metricas['Cambio']:,.0f}"
+        )
+    with col3:
+        st.metric("Variación", formatear_variacion(metricas["Variación"]))
+    with col4:
+        percentil = metricas["Percentil en la liga"]
+        st.metric(f"Percentil en {metricas['Liga']}", "Sin datos" if np.isnan(percentil) else f"{percentil:.0f}")
+    if not np.isnan(metricas["Edad"]):
+        st.caption(f"Edad: {metricas['Edad']:.0f} años")
@@ -0,0 +1,23 @@
+# Núcleo compartido de análisis: índices y estructuras de datos reutilizables
+# por las distintas aplicaciones de Streamlit del proyecto.
+from nucleo.arquetipos import Arquetipos, ModeloArquetipos, arquetipos
+from nucleo.clubes import PlantillasClubes, comparar_clubes, plantillas_clubes
+from nucleo.columnar import SnapshotColumnar, version_datos
+from nucleo.consultas import EnConjunto, Rango, consultar, filas_de_jugadores, filtrar
+from nucleo.contrastes import contrastes_ligas, kolmogorov_smirnov, mann_whitney
+from nucleo.correlaciones import columnas_estadisticas, matriz_correlaciones, tabla_correlaciones
+from nucleo.cubo import CuboMercado, cubo_mercado
+from nucleo.estadisticas import ServicioEstadisticas, servicio_estadisticas
+from nucleo.exportacion import exportar_csv, exportar_parquet
+from nucleo.fuentes import CopiaDatos, Interruptor, OrigenDatos
+from nucleo.indices import IndiceOrdenado
+from nucleo.mensual import MatrizMensual, evolucion_jugadores, generar_valores_mensuales, matriz_mensual
+from nucleo.movimientos import TablaMovimientos, tabla_movimientos
+from nucleo.percentiles import TablaPercentiles, tabla_percentiles
+from nucleo.plantilla import FORMACIONES, optimizar_plantilla, plantilla_optima
+from nucleo.precalculo import Precalculo, cache_lista, cargar_precalculo, precalcular_fuentes
+from nucleo.prediccion import ModeloValor, Predicciones, predicciones
+from nucleo.recomendaciones import EscanerOportunidades, escaner_oportunidades
+from nucleo.similares import IndiceSimilitud, jugadores_similares
+from nucleo.variacion import COLUMNAS_VARIACION, anadir_variacion, calcular_variacion, formatear_variacion
+from nucleo.vigilancia import VigilanteDirectorio, archivos_ligas
@@ -0,0 +1,247 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from nucleo.cache import por_version
+from nucleo.correlaciones import columnas_estadisticas
+from nucleo.esquema import COL_EDAD, COL_VALOR_ACTUAL
+from nucleo.plantilla import grupos_de_posicion
+
+RUTA_ARQUETIPOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "modelos", "arquetipos.json")
+# Arquetipos por grupo de posición
+K = 4
+# Inicializaciones de k-means por grupo; se queda la de menor inercia
+INICIALIZACIONES = 4
+MAX_ITERACIONES = 100
+# Estadísticas que dan nombre a cada arquetipo (las más destacadas del centroide)
+ESTADISTICAS_ETIQUETA = 2
+# Aviso que muestran las aplicaciones cuando no hay modelo que aplicar
+MENSAJE_SIN_MODELO = "Modelo de arquetipos no disponible; ejecute python -m nucleo.arquetipos"
+
+
+# Función para obtener las estadísticas que definen el perfil de juego (la
+# edad se excluye: describe al jugador, no su rol)
+def columnas_perfil(snapshot):
+    return [columna for columna in columnas_estadisticas(snapshot) if columna != COL_EDAD]
+
+
+# Función para calcular las distancias al cuadrado de cada fila a cada centroide
+# con un único producto matricial
+def _distancias(X, centroides):
+    return (
+        np.einsum("ij,ij->i", X, X)[:, None]
+        - 2 * X @ centroides.T
+        + np.einsum("ij,ij->i", centroides, centroides)[None, :]
+    )
+
+
+# k-means vectorizado (Lloyd) con inicialización k-means++ y generador
+# determinista. Devuelve centroides, etiquetas e inercia.
+def kmeans(X, k, generador, max_iteraciones=MAX_ITERACIONES):
+    n = len(X)
+    centroides = np.empty((k, X.shape[1]))
+    centroides[0] = X[generador.integers(n)]
+    minimas = _distancias(X, centroides[:1])[:, 0]
+    for i in range(1, k):
+        pesos = np.maximum(minimas, 0)
+        total = pesos.sum()
+        fila = generador.choice(n, p=pesos / total) if total > 0 else generador.integers(n)
+        centroides[i] = X[fila]
+        minimas = np.minimum(minimas, _distancias(X, centroides[i:i + 1])[:, 0])
+
+    etiquetas = np.full(n, -1)
+    for _ in range(max_iteraciones):
+        distancias = _distancias(X, centroides)
+        nuevas = distancias.argmin(axis=1)
+        if np.array_equal(nuevas, etiquetas):
+            break
+        etiquetas = nuevas
+        conteos = np.bincount(etiquetas, minlength=k)
+        sumas = np.zeros_like(centroides)
+        np.add.at(sumas, etiquetas, X)
+        vacios = conteos == 0
+        centroides[~vacios] = sumas[~vacios] / conteos[~vacios, None]
+        # Un centroide vacío se recoloca en el punto peor explicado
+        for j in np.flatnonzero(vacios):
+            centroides[j] = X[distancias.min(axis=1).argmax()]
+    inercia = _distancias(X, centroides)[np.arange(n), etiquetas].sum()
+    return centroides, etiquetas, inercia
+
+
+# Modelo de arquetipos: centroides de k-means sobre las estadísticas
+# estandarizadas, por grupo de posición. Se entrena fuera de la aplicación y
+# se guarda en JSON; asignar un arquetipo es buscar el centroide más cercano.
+class ModeloArquetipos:
+    def __init__(self, columnas, medias, escalas, centroides, etiquetas):
+        self.columnas = list(columnas)
+        self.medias = np.asarray(medias, dtype="float64")
+        self.escalas = np.asarray(escalas, dtype="float64")
+        self.centroides = {grupo: np.asarray(c, dtype="float64") for grupo, c in centroides.items()}
+        self.etiquetas = {grupo: list(e) for grupo, e in etiquetas.items()}
+
+    # Matriz estandarizada con las medias y escalas del entrenamiento; las
+    # columnas o valores ausentes quedan en la media (0)
+    def _matriz(self, snapshot):
+        partes = []
+        for columna, media, escala in zip(self.columnas, self.medias, self.escalas):
+            valores = snapshot.columnas.get(columna)
+            if valores is None or snapshot.es_categorica(columna):
+                partes.append(np.zeros(len(snapshot)))
+            else:
+                partes.append(np.nan_to_num((valores - media) / escala, nan=0.0))
+        return np.column_stack(partes) if partes else np.empty((len(snapshot), 0))
+
+    @classmethod
+    def entrenar(cls, snapshot, k=K, semilla=0):
+        columnas = columnas_perfil(snapshot)
+        if not columnas:
+            raise ValueError("No hay estadísticas numéricas para agrupar jugadores")
+        medias = np.array([np.nanmean(snapshot.columnas[c]) for c in columnas])
+        escalas = np.array([np.nanstd(snapshot.columnas[c]) for c in columnas])
+        escalas[~(escalas > 0)] = 1.0
+        modelo = cls(columnas, medias, escalas, {}, {})
+
+        X = modelo._matriz(snapshot)
+        grupos = grupos_de_posicion(snapshot)
+        semillas = np.random.SeedSequence(semilla)
+        for grupo, semilla_grupo in zip(sorted(set(grupos) - {None}), semillas.spawn(len(set(grupos) - {None}))):
+            filas = np.flatnonzero(grupos == grupo)
+            k_grupo = min(k, len(filas))
+            if k_grupo == 0:
+                continue
+            generador = np.random.default_rng(semilla_grupo)
+            mejor = min(
+                (kmeans(X[filas], k_grupo, generador) for _ in range(INICIALIZACIONES)),
+                key=lambda resultado: resultado[2],
+            )
+            # Orden estable de los arquetipos: del más numeroso al menos numeroso
+            centroides, etiquetas, _ = mejor
+            orden = np.argsort(-np.bincount(etiquetas, minlength=k_grupo), kind="stable")
+            modelo.centroides[grupo] = centroides[orden]
+        modelo.etiquetas = {
+            grupo: [modelo._nombre(grupo, i, centroide) for i, centroide in enumerate(centroides)]
+            for grupo, centroides in modelo.centroides.items()
+        }
+        return modelo
+
+    # Nombre de un arquetipo: grupo, número y estadísticas más destacadas
+    def _nombre(self, grupo, i, centroide):
+        destacadas = np.argsort(-centroide, kind="stable")[:ESTADISTICAS_ETIQUETA]
+        return f"{grupo} {i + 1} ({', '.join(self.columnas[j] for j in destacadas)})"
+
+    # Arquetipo de cada fila del snapshot (None si su posición no tiene grupo)
+    def asignar(self, snapshot):
+        X = self._matriz(snapshot)
+        grupos = grupos_de_posicion(snapshot)
+        resultado = np.full(len(snapshot), None, dtype=object)
+        for grupo, centroides in self.centroides.items():
+            filas = np.flatnonzero(grupos == grupo)
+            if len(filas):
+                cercanos = _distancias(X[filas], centroides).argmin(axis=1)
+                resultado[filas] = np.array(self.etiquetas[grupo], dtype=object)[cercanos]
+        return resultado
+
+    def guardar(self, ruta=RUTA_ARQUETIPOS):
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({
+                "columnas": self.columnas,
+                "medias": self.medias.tolist(),
+                "escalas": self.escalas.tolist(),
+                "centroides": {grupo: c.tolist() for grupo, c in self.centroides.items()},
+                "etiquetas": self.etiquetas,
+            }, archivo, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def cargar(cls, ruta=RUTA_ARQUETIPOS):
+        with open(ruta, encoding="utf-8") as archivo:
+            return cls(**json.load(archivo))
+
+
+# Arquetipos asignados a los jugadores de un snapshot, alineados con sus filas,
+# y resumen de valor de mercado por arquetipo
+class Arquetipos:
+    def __init__(self, etiquetas, resumen):
+        self.etiquetas = etiquetas
+        self.resumen = resumen
+
+    # Función para obtener las filas de los jugadores de unos arquetipos,
+    # opcionalmente solo entre unas filas dadas (p. ej. las de una liga)
+    def filas(self, arquetipos, entre=None):
+        if entre is None:
+            return np.flatnonzero(np.isin(self.etiquetas, list(arquetipos)))
+        entre = np.asarray(entre, dtype="int64")
+        return entre[np.isin(self.etiquetas[entre], list(arquetipos))]
+
+
+# Función para resumir el valor de mercado de cada arquetipo
+def _resumen(snapshot, etiquetas):
+    df = pd.DataFrame({
+        "Arquetipo": etiquetas,
+        COL_VALOR_ACTUAL: snapshot.columnas[COL_VALOR_ACTUAL],
+        COL_EDAD: snapshot.columnas[COL_EDAD] if COL_EDAD in snapshot.columnas else np.nan,
+    }).dropna(subset=["Arquetipo"])
+    return df.groupby("Arquetipo").agg(**{
+        "Jugadores": (COL_VALOR_ACTUAL, "size"),
+        "Valor total": (COL_VALOR_ACTUAL, "sum"),
+        "Valor medio": (COL_VALOR_ACTUAL, "mean"),
+        "Valor mediano": (COL_VALOR_ACTUAL, "median"),
+        "Edad media": (COL_EDAD, "mean"),
+    }).reset_index()
+
+
+# Función para cargar el modelo de arquetipos calculado fuera de línea. El
+# k-means nunca se ejecuta durante una petición: devuelve None si no hay
+# modelo guardado o si el snapshot no tiene las estadísticas con que se
+# construyó (p. ej. una fuente sin estadísticas).
+def cargar_modelo(snapshot, ruta=RUTA_ARQUETIPOS):
+    try:
+        modelo = ModeloArquetipos.cargar(ruta)
+    except (OSError, ValueError, TypeError):
+        return None
+    if not modelo.columnas or any(
+        columna not in snapshot.columnas or snapshot.es_categorica(columna) for columna in modelo.columnas
+    ):
+        return None
+    return modelo
+
+
+# Arquetipos de todos los jugadores, cacheados por versión de datos. Devuelve
+# None si no hay un modelo aplicable (ver cargar_modelo).
+@por_version
+def arquetipos(snapshot, ruta=RUTA_ARQUETIPOS):
+    modelo = cargar_modelo(snapshot, ruta)
+    if modelo is None:
+        return None
+    etiquetas = modelo.asignar(snapshot)
+    return Arquetipos(etiquetas, _resumen(snapshot, etiquetas))
+
+
+# Construcción fuera de línea: python -m nucleo.arquetipos [--salida RUTA] [--csv LIGA=RUTA ...]
+def main(argumentos=None):
+    from nucleo.carga import FUENTES, leer_ligas
+    from nucleo.columnar import SnapshotColumnar
+
+    parser = argparse.ArgumentParser(description="Calcula los arquetipos de jugadores por posición.")
+    parser.add_argument("--salida", default=RUTA_ARQUETIPOS, help="Ruta del modelo JSON")
+    parser.add_argument("--csv", action="append", default=[], metavar="LIGA=RUTA",
+                        help="CSV de una liga (por defecto, los CSV con estadísticas del proyecto)")
+    parser.add_argument("--k", type=int, default=K, help="Arquetipos por grupo de posición")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de k-means")
+    args = parser.parse_args(argumentos)
+
+    fuentes = dict(valor.split("=", 1) for valor in args.csv) if args.csv else FUENTES["estadisticas"]
+    snapshot = SnapshotColumnar.desde_ligas(leer_ligas(fuentes))
+    modelo = ModeloArquetipos.entrenar(snapshot, args.k, args.semilla)
+    modelo.guardar(args.salida)
+
+    resumen = _resumen(snapshot, modelo.asignar(snapshot))
+    print(f"Arquetipos guardados en {args.salida} ({len(modelo.columnas)} estadísticas, "
+          f"{len(resumen)} arquetipos, {int(resumen['Jugadores'].sum())} jugadores)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import functools
+import threading
+from collections import OrderedDict
+
+# Versiones de datos cuyos resultados derivados se conservan en memoria. Con
+# dos basta para servir la versión actual mientras se prepara la siguiente.
+MAX_VERSIONES = 2
+
+_resultados = OrderedDict()
+_en_curso = {}
+_lock = threading.Lock()
+
+
+# Cálculo en curso de una clave. Los hilos que piden la misma clave mientras
+# se calcula esperan a que termine en lugar de repetirlo.
+class _EnCurso:
+    def __init__(self):
+        self.terminado = threading.Event()
+        self.valor = None
+        self.error = None
+        self.interrumpido = False
+
+
+# Función para ejecutar `calcular` una sola vez por clave entre todos los hilos
+# que la piden a la vez (single-flight). `buscar` se consulta con el cerrojo
+# tomado antes de unirse a un cálculo y devuelve (True, valor) si el valor ya
+# está guardado; `guardar` se llama con el cerrojo tomado al terminar, así que
+# nadie empieza a calcular entre el final de un cálculo y el guardado de su
+# valor. Si el cálculo lanza una excepción, los que esperaban reciben la misma;
+# si se interrumpe (p. ej. Streamlit detiene el script del hilo que calculaba),
+# uno de los que esperaban lo vuelve a intentar.
+def _calcular_una_vez(clave, calcular, buscar=None, guardar=None):
+    while True:
+        with _lock:
+            if buscar is not None:
+                encontrado, valor = buscar()
+                if encontrado:
+                    return valor
+            en_curso = _en_curso.get(clave)
+            propio = en_curso is None
+            if propio:
+                en_curso = _en_curso[clave] = _EnCurso()
+        if propio:
+            break
+        en_curso.terminado.wait()
+        if en_curso.error is not None:
+            raise en_curso.error
+        if not en_curso.interrumpido:
+            return en_curso.valor
+
+    try:
+        en_curso.valor = calcular()
+    except Exception as error:
+        en_curso.error = error
+        raise
+    except BaseException:
+        en_curso.interrumpido = True
+        raise
+    finally:
+        with _lock:
+            if guardar is not None and en_curso.error is None and not en_curso.interrumpido:
+                guardar(en_curso.valor)
+            del _en_curso[clave]
+        en_curso.terminado.set()
+    return en_curso.valor
+
+
+# Función para guardar resultados de una versión y descartar las más antiguas
+# (con el cerrojo tomado)
+def _guardar(version, resultados):
+    _resultados.setdefault(version, {}).update(resultados)
+    _resultados.move_to_end(version)
+    while len(_resultados) > MAX_VERSIONES:
+        _resultados.popitem(last=False)
+
+
+# Decorador para memorizar cálculos derivados de un snapshot por versión de
+# datos. La clave incluye la versión del snapshot (primer argumento) y el resto
+# de argumentos, que deben ser hashables. Cuando entra una versión nueva se
+# descartan los resultados de las más antiguas. Si varias sesiones piden a la
+# vez un resultado que no está en caché, se calcula una sola vez.
+def por_version(funcion):
+    nombre = f"{funcion.__module__}.{funcion.__qualname__}"
+
+    @functools.wraps(funcion)
+    def envoltura(snapshot, *args, **kwargs):
+        version = snapshot.version
+        clave = (nombre, args, tuple(sorted(kwargs.items())))
+
+        def buscar():
+            resultados = _resultados.get(version)
+            if resultados is not None and clave in resultados:
+                _resultados.move_to_end(version)
+                return True, resultados[clave]
+            return False, None
+
+        return _calcular_una_vez(
+            (version, clave),
+            lambda: funcion(snapshot, *args, **kwargs),
+            buscar,
+            lambda valor: _guardar(version, {clave: valor}),
+        )
+
+    return envoltura
+
+
+# Decorador single-flight para funciones sin caché propia, como las descargas:
+# las llamadas simultáneas con los mismos argumentos (hashables) comparten un
+# único cálculo, y su resultado, que no debe modificarse. Las llamadas que
+# llegan cuando ya ha terminado vuelven a calcular.
+def compartir_en_curso(funcion):
+    nombre = f"{funcion.__module__}.{funcion.__qualname__}"
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        clave = (nombre, args, tuple(sorted(kwargs.items())))
+        return _calcular_una_vez(clave, lambda: funcion(*args, **kwargs))
+
+    return envoltura
+
+
+# Función para obtener los resultados guardados de una versión ({clave: valor})
+def resultados_version(version):
+    with _lock:
+        return dict(_resultados.get(version, {}))
+
+
+# Función para cargar resultados calculados en otro proceso (el precálculo)
+# como si se hubieran calculado aquí. Las claves son las de por_version.
+def sembrar(version, resultados):
+    with _lock:
+        _guardar(version, resultados)
+
+
+# Función para descartar los resultados de una versión (o de todas)
+def invalidar(version=None):
+    with _lock:
+        if version is None:
+            _resultados.clear()
+        else:
+            _resultados.pop(version, None)
@@ -0,0 +1,80 @@
+import io
+import urllib.request
+
+import pandas as pd
+
+from nucleo.cache import compartir_en_curso
+from nucleo.esquema import COL_VALOR_ACTUAL, COL_VALOR_INICIAL
+
+# Segundos que se espera a que responda el servidor de un CSV remoto; sin
+# límite, una descarga colgada bloquearía a quien la pide indefinidamente
+TIEMPO_ESPERA = 20
+
+URL_BASE = "https://raw.githubusercontent.com/AndersonP444/PROYECTO-SIC-JAKDG/main/"
+
+# CSV publicados por el proyecto: valores de mercado y valores con estadísticas
+FUENTES = {
+    "valores": {
+        "LaLiga": URL_BASE + "valores_mercado_actualizados%20(3).csv",
+        "Bundesliga": URL_BASE + "valores_mercado_bundesliga_actualizado_v2.csv",
+    },
+    # Primera versión de los datos de la Bundesliga, sin actualizar
+    "valores_originales": {
+        "LaLiga": URL_BASE + "valores_mercado_actualizados%20(3).csv",
+        "Bundesliga": URL_BASE + "valores_mercado_bundesliga.csv",
+    },
+    "estadisticas": {
+        "LaLiga": URL_BASE + "CSV%20DESPUES%20DEL%20PROCESAMIENTO%20DE%20DATOS/valores_mercado_actualizados_con_estadisticas.csv",
+        "Bundesliga": URL_BASE + "CSV%20DESPUES%20DEL%20PROCESAMIENTO%20DE%20DATOS/valores_mercado_bundesliga_con_estadisticas.csv",
+    },
+}
+
+
+# Columnas con valores de mercado en texto ("12,5 mill. €"). La primera
+# versión de los datos de la Bundesliga tiene una sola columna de valor.
+COLUMNAS_VALOR = [COL_VALOR_INICIAL, COL_VALOR_ACTUAL, "Valor de Mercado"]
+
+
+# Función para convertir valores de mercado
+def convertir_valor(valor):
+    if isinstance(valor, str):
+        if "mil €" in valor:
+            return int(float(valor.replace(" mil €", "").replace(",", ".")) * 1_000)
+        elif "mill. €" in valor:
+            return int(float(valor.replace(" mill. €", "").replace(",", ".")) * 1_000_000)
+    return None
+
+
+# Función para convertir URLs a imágenes (para mostrar tablas como HTML)
+def convertir_urls_a_imagenes(df):
+    df_copy = df.copy()
+    for col in df_copy.columns:
+        if df_copy[col].astype(str).str.startswith('http').any():
+            df_copy[col] = df_copy[col].apply(lambda url: f'<img src="{url}" width="50">' if isinstance(url, str) and url.startswith('http') else url)
+    return df_copy
+
+
+# Función para abrir un CSV: las URL se descargan con tiempo de espera
+def _abrir(ruta):
+    if ruta.startswith(("http://", "https://")):
+        with urllib.request.urlopen(ruta, timeout=TIEMPO_ESPERA) as respuesta:
+            return io.BytesIO(respuesta.read())
+    return ruta
+
+
+# Función para leer el CSV de una liga (ruta local o URL) con los valores ya
+# convertidos. Las columnas que ya vienen como números se dejan como están.
+# Las lecturas simultáneas de la misma ruta (p. ej. dos fuentes que comparten
+# el CSV de LaLiga) se hacen una sola vez y comparten el DataFrame.
+@compartir_en_curso
+def leer_liga(ruta):
+    df = pd.read_csv(_abrir(ruta))
+    for columna in COLUMNAS_VALOR:
+        if columna in df.columns and df[columna].dtype == object:
+            df[columna] = df[columna].apply(convertir_valor)
+    return df
+
+
+# Función para leer todas las ligas de un conjunto de fuentes
+def leer_ligas(fuentes):
+    return {liga: leer_liga(ruta) for liga, ruta in fuentes.items()}
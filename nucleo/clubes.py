@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from nucleo.cache import por_version
+from nucleo.esquema import (
+    COL_CLUB,
+    COL_EDAD,
+    COL_LIGA,
+    COL_TRAMO_EDAD,
+    COL_VALOR_ACTUAL,
+    ETIQUETAS_TRAMOS_EDAD,
+    SIN_DATOS,
+)
+from nucleo.plantilla import FORMACIONES, grupos_de_posicion
+
+GRUPOS = list(FORMACIONES["4-3-3"]) + ["Otros"]
+TRAMOS = ETIQUETAS_TRAMOS_EDAD + [SIN_DATOS]
+
+
+# Tablas de todas las plantillas (clubes de todas las ligas), calculadas con
+# group-bys vectorizados una vez por versión de datos. Los clubes se
+# identifican por la pareja (liga, club) porque un nombre puede repetirse.
+class PlantillasClubes:
+    def __init__(self, resumen, edades, posiciones):
+        self.resumen = resumen
+        self.edades = edades
+        self.posiciones = posiciones
+
+    @classmethod
+    def desde_snapshot(cls, snapshot):
+        columnas = [COL_LIGA, COL_CLUB, COL_TRAMO_EDAD, COL_VALOR_ACTUAL]
+        if COL_EDAD in snapshot.columnas:
+            columnas.append(COL_EDAD)
+        df = snapshot.a_dataframe(columnas=columnas)
+        if COL_EDAD not in df.columns:
+            df[COL_EDAD] = np.nan
+        df["Grupo"] = pd.Series(grupos_de_posicion(snapshot)).fillna("Otros").to_numpy()
+        clave = [COL_LIGA, COL_CLUB]
+
+        resumen = df.groupby(clave).agg(**{
+            "Jugadores": (COL_VALOR_ACTUAL, "size"),
+            "Valor total": (COL_VALOR_ACTUAL, "sum"),
+            "Valor medio": (COL_VALOR_ACTUAL, "mean"),
+            "Valor mediano": (COL_VALOR_ACTUAL, "median"),
+            "Valor máximo": (COL_VALOR_ACTUAL, "max"),
+            "Edad media": (COL_EDAD, "mean"),
+        })
+        edades = {
+            medida: df.pivot_table(
+                index=clave, columns=COL_TRAMO_EDAD, values=COL_VALOR_ACTUAL,
+                aggfunc=funcion, fill_value=0, dropna=False,
+            ).reindex(columns=TRAMOS, fill_value=0)
+            for medida, funcion in (("Jugadores", "size"), ("Valor", "sum"))
+        }
+        posiciones = df.pivot_table(
+            index=clave, columns="Grupo", values=COL_VALOR_ACTUAL,
+            aggfunc="sum", fill_value=0, dropna=False,
+        ).reindex(columns=GRUPOS, fill_value=0)
+        return cls(resumen, edades, posiciones)
+
+    # Función para obtener la lista de clubes como parejas (liga, club)
+    def clubes(self, liga=None):
+        indice = self.resumen.index
+        if liga is not None:
+            indice = indice[indice.get_level_values(COL_LIGA) == liga]
+        return list(indice)
+
+
+# Plantillas de todos los clubes de un snapshot, una vez por versión de datos
+@por_version
+def plantillas_clubes(snapshot):
+    return PlantillasClubes.desde_snapshot(snapshot)
+
+
+# Función para comparar dos plantillas, dadas como parejas (liga, club).
+# Devuelve tres tablas con un club por columna: resumen, estructura de edad
+# (jugadores y valor por tramo) y valor por grupo de posición. Se cachea por
+# versión y pareja de clubes.
+@por_version
+def comparar_clubes(snapshot, club_a, club_b):
+    plantillas = plantillas_clubes(snapshot)
+    clubes = [tuple(club_a), tuple(club_b)]
+    nombres = [f"{club} ({liga})" for liga, club in clubes]
+
+    resumen = plantillas.resumen.loc[clubes].T.set_axis(nombres, axis=1)
+    estructura = pd.concat(
+        {medida: tabla.loc[clubes].T.set_axis(nombres, axis=1) for medida, tabla in plantillas.edades.items()},
+        axis=1,
+    )
+    posiciones = plantillas.posiciones.loc[clubes].T.set_axis(nombres, axis=1)
+    return resumen, estructura, posiciones
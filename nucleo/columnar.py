@@ -0,0 +1,150 @@
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+from nucleo.esquema import (
+    ALIAS_COLUMNAS,
+    COL_CLUB,
+    COL_EDAD,
+    COL_LIGA,
+    COL_POSICION,
+    COL_TRAMO_EDAD,
+    SIN_DATOS,
+    tramo_edad,
+)
+from nucleo.indices import IndiceOrdenado
+from nucleo.variacion import anadir_variacion
+
+
+# Función para calcular una versión estable del contenido de los datos. Sirve
+# como clave de las cachés derivadas: si los datos no cambian, la versión tampoco.
+def version_datos(ligas):
+    resumen = hashlib.blake2b(digest_size=12)
+    for nombre, df in ligas.items():
+        resumen.update(nombre.encode("utf-8"))
+        resumen.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+        resumen.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return resumen.hexdigest()
+
+
+# Función para unir las ligas en un único DataFrame con las dimensiones comunes
+def _normalizar_ligas(ligas):
+    partes = []
+    for nombre, df in ligas.items():
+        df = df.rename(columns=ALIAS_COLUMNAS)
+        df.insert(0, COL_LIGA, nombre)
+        partes.append(df)
+    df = pd.concat(partes, ignore_index=True, sort=False) if partes else pd.DataFrame({COL_LIGA: []})
+
+    for columna in (COL_CLUB, COL_POSICION):
+        if columna not in df.columns:
+            df[columna] = SIN_DATOS
+        else:
+            df[columna] = df[columna].fillna(SIN_DATOS)
+    df[COL_TRAMO_EDAD] = tramo_edad(df[COL_EDAD] if COL_EDAD in df.columns else np.full(len(df), np.nan))
+    return anadir_variacion(df)
+
+
+# Instantánea columnar e inmutable de los datos de una o varias ligas.
+# Las columnas numéricas se guardan como arrays float64 y las de texto se
+# codifican por diccionario (códigos int32 + etiquetas), lo que compacta la
+# memoria y permite filtrar comparando enteros. Los índices ordenados de cada
+# columna se construyen la primera vez que se necesitan y se reutilizan.
+# `tipos` guarda el tipo original de las columnas numéricas que no eran
+# float64 (p. ej. Edad o Goles, enteras), para devolverlas con él al exportar.
+class SnapshotColumnar:
+    def __init__(self, columnas, categorias, version, tipos=None):
+        self.columnas = columnas
+        self.categorias = categorias
+        self.version = version
+        self.tipos = tipos if tipos is not None else {}
+        self.num_filas = len(next(iter(columnas.values()))) if columnas else 0
+        self._indices = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde_ligas(cls, ligas):
+        df = _normalizar_ligas(ligas)
+        columnas = {}
+        categorias = {}
+        tipos = {}
+        for nombre in df.columns:
+            serie = df[nombre]
+            if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+                columnas[nombre] = serie.to_numpy(dtype="float64", na_value=np.nan)
+                if isinstance(serie.dtype, np.dtype) and serie.dtype != np.float64:
+                    tipos[nombre] = serie.dtype
+            else:
+                texto = serie.astype(object).where(serie.isna(), serie.astype(str))
+                codigos, etiquetas = pd.factorize(texto, sort=True)
+                columnas[nombre] = codigos.astype("int32")
+                categorias[nombre] = np.asarray(etiquetas, dtype=object)
+        for array in columnas.values():
+            array.setflags(write=False)
+        return cls(columnas, categorias, version_datos(ligas), tipos)
+
+    # Al serializar (precálculo en disco) se conservan los índices ya
+    # construidos; el cerrojo no se puede serializar y se crea uno nuevo
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        del estado["_lock"]
+        return estado
+
+    def __setstate__(self, estado):
+        # Los precálculos anteriores a `tipos` no lo incluyen
+        estado.setdefault("tipos", {})
+        self.__dict__.update(estado)
+        for array in self.columnas.values():
+            array.setflags(write=False)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.num_filas
+
+    def es_categorica(self, columna):
+        return columna in self.categorias
+
+    def columnas_numericas(self):
+        return [nombre for nombre in self.columnas if nombre not in self.categorias]
+
+    # Etiquetas distintas de una columna categórica
+    def valores(self, columna):
+        return list(self.categorias[columna])
+
+    # Códigos de diccionario de las etiquetas pedidas (las desconocidas se ignoran)
+    def codigos(self, columna, etiquetas):
+        posiciones = {etiqueta: i for i, etiqueta in enumerate(self.categorias[columna])}
+        return np.array(sorted({posiciones[e] for e in etiquetas if e in posiciones}), dtype="int32")
+
+    # Índice ordenado de una columna; en las categóricas se indexan los códigos
+    def indice(self, columna):
+        indice = self._indices.get(columna)
+        if indice is None:
+            with self._lock:
+                indice = self._indices.get(columna)
+                if indice is None:
+                    valores = self.columnas[columna]
+                    if self.es_categorica(columna):
+                        valores = np.where(valores < 0, np.nan, valores)
+                    indice = IndiceOrdenado(valores)
+                    self._indices[columna] = indice
+        return indice
+
+    # Proyección de las filas y columnas pedidas como DataFrame. Solo se
+    # materializan las columnas solicitadas y únicamente para esas filas. Con
+    # tipos_originales, las columnas numéricas recuperan el tipo que tenían en
+    # los datos de origen en lugar de float64.
+    def a_dataframe(self, filas=None, columnas=None, tipos_originales=False):
+        columnas = list(self.columnas) if columnas is None else list(columnas)
+        datos = {}
+        for nombre in columnas:
+            valores = self.columnas[nombre] if filas is None else self.columnas[nombre][filas]
+            if self.es_categorica(nombre):
+                # El código -1 (valor ausente) apunta al None añadido al final
+                valores = np.append(self.categorias[nombre], None)[valores]
+            elif tipos_originales and nombre in self.tipos:
+                valores = valores.astype(self.tipos[nombre])
+            datos[nombre] = valores
+        return pd.DataFrame(datos, columns=columnas)
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+from nucleo.variacion import anadir_variacion
+
+# Las columnas de texto se guardan como cadenas de Arrow (un búfer contiguo e
+# inmutable, sin un objeto de Python por celda) si pyarrow está instalado
+try:
+    TIPO_TEXTO = pd.StringDtype("pyarrow")
+except ImportError:
+    TIPO_TEXTO = None
+
+MENSAJE_SOLO_LECTURA = (
+    "Los datos compartidos entre sesiones son de solo lectura; "
+    "usa .copy() para obtener una copia modificable"
+)
+# Métodos que modifican el propio objeto cuando se llaman con inplace=True
+METODOS_INPLACE = [
+    "bfill", "clip", "drop", "drop_duplicates", "dropna", "eval", "ffill", "fillna",
+    "interpolate", "mask", "query", "rename", "rename_axis", "replace", "reset_index",
+    "set_index", "sort_index", "sort_values", "where",
+]
+# Métodos que siempre modifican el propio objeto
+METODOS_MODIFICADORES = ["insert", "pop", "update"]
+
+
+# Función para rechazar cualquier modificación de los datos compartidos
+def _rechazar(*args, **kwargs):
+    raise ValueError(MENSAJE_SOLO_LECTURA)
+
+
+# Envoltura de .loc/.iloc/.at/.iat que permite leer pero no asignar
+class _IndexadorSoloLectura:
+    def __init__(self, indexador):
+        self._indexador = indexador
+
+    def __call__(self, axis=None):
+        return _IndexadorSoloLectura(self._indexador(axis))
+
+    def __getitem__(self, clave):
+        return self._indexador[clave]
+
+    def __setitem__(self, clave, valor):
+        _rechazar()
+
+    def __getattr__(self, nombre):
+        return getattr(self._indexador, nombre)
+
+
+# Función para envolver un método de pandas rechazando inplace=True
+def _sin_inplace(metodo):
+    def envoltura(self, *args, **kwargs):
+        if kwargs.get("inplace"):
+            _rechazar()
+        return metodo(self, *args, **kwargs)
+
+    envoltura.__name__ = metodo.__name__
+    envoltura.__doc__ = metodo.__doc__
+    return envoltura
+
+
+# Comportamiento común de los DataFrame y Series de solo lectura: se bloquean
+# las asignaciones, los borrados y las operaciones inplace. Cualquier operación
+# que devuelva un objeto nuevo (filtros, copias, cálculos) devuelve un objeto
+# normal de pandas, que sí se puede modificar.
+class _SoloLectura:
+    __setitem__ = _rechazar
+    __delitem__ = _rechazar
+
+    @property
+    def loc(self):
+        return _IndexadorSoloLectura(super().loc)
+
+    @property
+    def iloc(self):
+        return _IndexadorSoloLectura(super().iloc)
+
+    @property
+    def at(self):
+        return _IndexadorSoloLectura(super().at)
+
+    @property
+    def iat(self):
+        return _IndexadorSoloLectura(super().iat)
+
+
+# Columna de unos datos compartidos (vista sin copia de sus valores)
+class SerieSoloLectura(_SoloLectura, pd.Series):
+    @property
+    def _constructor(self):
+        return pd.Series
+
+    @property
+    def _constructor_expanddim(self):
+        return pd.DataFrame
+
+
+# DataFrame compartido entre sesiones sin copiarlo. Sus columnas numéricas son
+# arrays de numpy marcados como no escribibles y las de texto, cadenas de
+# Arrow; además se bloquean las modificaciones a través de pandas.
+class DatosSoloLectura(_SoloLectura, pd.DataFrame):
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    @property
+    def _constructor_sliced(self):
+        return SerieSoloLectura
+
+
+for _clase, _base in [(DatosSoloLectura, pd.DataFrame), (SerieSoloLectura, pd.Series)]:
+    for _nombre in METODOS_INPLACE:
+        if hasattr(_base, _nombre):
+            setattr(_clase, _nombre, _sin_inplace(getattr(_base, _nombre)))
+    for _nombre in METODOS_MODIFICADORES:
+        if hasattr(_base, _nombre):
+            setattr(_clase, _nombre, _rechazar)
+
+
+# Función para convertir un DataFrame en datos compartidos de solo lectura.
+# Cada columna se guarda en su propio bloque (sin consolidar) para que los
+# arrays protegidos sean los que usa pandas y no una copia.
+def congelar(df):
+    columnas = {}
+    for nombre in df.columns:
+        serie = df[nombre]
+        if TIPO_TEXTO is not None and serie.dtype == object and pd.api.types.infer_dtype(serie, skipna=True) == "string":
+            columnas[nombre] = serie.astype(TIPO_TEXTO).array
+        elif isinstance(serie.dtype, np.dtype):
+            valores = serie.to_numpy(copy=True)
+            valores.setflags(write=False)
+            columnas[nombre] = valores
+        else:
+            columnas[nombre] = serie.array
+    return DatosSoloLectura(columnas, index=df.index, columns=df.columns, copy=False)
+
+
+# Función para preparar las ligas leídas como datos compartidos. Las columnas
+# de variación, si se piden, se añaden antes de congelarlas.
+def congelar_ligas(ligas, variacion=False):
+    if variacion:
+        ligas = {liga: anadir_variacion(df.copy()) for liga, df in ligas.items()}
+    return {liga: congelar(df) for liga, df in ligas.items()}
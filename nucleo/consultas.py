@@ -0,0 +1,100 @@
+import numpy as np
+
+# Si el predicado más selectivo deja más de esta fracción de filas, es más
+# barato recorrer la columna completa que ordenar las posiciones del índice
+FRACCION_RECORRIDO_COMPLETO = 0.125
+
+
+# Predicado de rango cerrado sobre una columna numérica (límites opcionales)
+class Rango:
+    def __init__(self, columna, minimo=None, maximo=None):
+        self.columna = columna
+        self.minimo = minimo
+        self.maximo = maximo
+
+    def estimar(self, snapshot):
+        return snapshot.indice(self.columna).contar(self.minimo, self.maximo)
+
+    def filas(self, snapshot):
+        return snapshot.indice(self.columna).rango(self.minimo, self.maximo)
+
+    def evaluar(self, snapshot, filas=None):
+        valores = snapshot.columnas[self.columna]
+        if filas is not None:
+            valores = valores[filas]
+        mascara = ~np.isnan(valores)
+        if self.minimo is not None:
+            mascara &= valores >= self.minimo
+        if self.maximo is not None:
+            mascara &= valores <= self.maximo
+        return mascara
+
+
+# Predicado de pertenencia a un conjunto de valores. En columnas categóricas
+# las etiquetas se traducen una sola vez a códigos de diccionario.
+class EnConjunto:
+    def __init__(self, columna, valores):
+        self.columna = columna
+        self.valores = list(valores)
+
+    def _claves(self, snapshot):
+        if snapshot.es_categorica(self.columna):
+            return snapshot.codigos(self.columna, self.valores)
+        return np.unique(np.asarray(self.valores, dtype="float64"))
+
+    def estimar(self, snapshot):
+        indice = snapshot.indice(self.columna)
+        return sum(indice.contar(clave, clave) for clave in self._claves(snapshot))
+
+    def filas(self, snapshot):
+        indice = snapshot.indice(self.columna)
+        partes = [indice.rango(clave, clave) for clave in self._claves(snapshot)]
+        return np.concatenate(partes) if partes else np.empty(0, dtype="int64")
+
+    def evaluar(self, snapshot, filas=None):
+        valores = snapshot.columnas[self.columna]
+        if filas is not None:
+            valores = valores[filas]
+        return np.isin(valores, self._claves(snapshot))
+
+
+# Función para obtener las posiciones de las filas que cumplen todos los
+# predicados. Se empieza por el predicado más selectivo (estimado con los
+# índices ordenados, sin recorrer los datos) y los demás se evalúan solo sobre
+# las filas que sobreviven. Las posiciones se devuelven en el orden original.
+def filtrar(snapshot, predicados):
+    predicados = list(predicados)
+    if not predicados:
+        return np.arange(len(snapshot))
+
+    estimaciones = [(predicado.estimar(snapshot), i) for i, predicado in enumerate(predicados)]
+    estimaciones.sort()
+    estimacion, primero = estimaciones[0]
+    if estimacion == 0:
+        return np.empty(0, dtype="int64")
+
+    if estimacion > FRACCION_RECORRIDO_COMPLETO * len(snapshot):
+        filas = np.flatnonzero(predicados[primero].evaluar(snapshot))
+    else:
+        filas = np.sort(predicados[primero].filas(snapshot))
+
+    for _, i in estimaciones[1:]:
+        if len(filas) == 0:
+            break
+        filas = filas[predicados[i].evaluar(snapshot, filas)]
+    return filas
+
+
+# Función para ejecutar una consulta completa: filtrado con los predicados y
+# proyección de las columnas pedidas únicamente sobre las filas resultantes
+def consultar(snapshot, predicados, columnas=None):
+    return snapshot.a_dataframe(filtrar(snapshot, predicados), columnas)
+
+
+# Función para localizar de una vez las filas de varios jugadores por nombre
+# (opcionalmente dentro de una liga) usando los índices del snapshot
+def filas_de_jugadores(snapshot, nombres, liga=None):
+    predicados = [EnConjunto("Nombre", nombres)]
+    if liga is not None:
+        predicados.append(EnConjunto("Liga", [liga]))
+    return filtrar(snapshot, predicados)
@@ -0,0 +1,133 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from nucleo.cache import por_version
+from nucleo.esquema import COL_EDAD, COL_LIGA, COL_VALOR_ACTUAL, COL_VARIACION_PCT
+from nucleo.paralelo import BLOQUES, mapear_en_procesos, repartir
+
+COLUMNAS_CONTRASTE = (COL_VALOR_ACTUAL, COL_VARIACION_PCT, COL_EDAD)
+REPETICIONES_BOOTSTRAP = 2000
+NIVEL_CONFIANZA = 0.95
+# Valores remuestreados a la vez en cada paso del bootstrap (acota la memoria)
+VALORES_POR_PASO = 2_000_000
+
+
+# Función para calcular rangos promedio (empates con el rango medio) de una muestra
+def _rangos(valores):
+    _, inversa, conteos = np.unique(valores, return_inverse=True, return_counts=True)
+    fin = np.cumsum(conteos)
+    return ((fin - conteos + 1 + fin) / 2)[inversa], conteos
+
+
+# Función para la probabilidad de cola superior de la normal estándar
+def _cola_normal(z):
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+# Prueba U de Mann-Whitney (bilateral) con corrección por empates y de
+# continuidad en la aproximación normal. Devuelve U de la primera muestra, el
+# p-valor y la probabilidad de que un valor de a supere a uno de b.
+def mann_whitney(a, b):
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return np.nan, np.nan, np.nan
+    rangos, conteos = _rangos(np.concatenate([a, b]))
+    u = rangos[:n1].sum() - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    empates = (conteos ** 3 - conteos).sum() / (n * (n - 1)) if n > 1 else 0.0
+    varianza = n1 * n2 / 12 * ((n + 1) - empates)
+    if varianza <= 0:
+        return u, 1.0, u / (n1 * n2)
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(varianza)
+    return u, min(1.0, 2 * _cola_normal(max(z, 0.0))), u / (n1 * n2)
+
+
+# Prueba de Kolmogorov-Smirnov de dos muestras: distancia máxima entre las
+# funciones de distribución empíricas (evaluadas de una vez con searchsorted)
+# y p-valor con la distribución asintótica de Kolmogorov
+def kolmogorov_smirnov(a, b):
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return np.nan, np.nan
+    a, b = np.sort(a), np.sort(b)
+    puntos = np.concatenate([a, b])
+    d = np.abs(np.searchsorted(a, puntos, side="right") / n1 - np.searchsorted(b, puntos, side="right") / n2).max()
+    en = math.sqrt(n1 * n2 / (n1 + n2))
+    lam = (en + 0.12 + 0.11 / en) * d
+    if lam < 1e-3:
+        return d, 1.0
+    k = np.arange(1, 101)
+    p = 2 * np.sum((-1.0) ** (k - 1) * np.exp(-2 * k ** 2 * lam ** 2))
+    return d, float(np.clip(p, 0.0, 1.0))
+
+
+# Tarea de bootstrap para un proceso: diferencias de medianas (a - b) en
+# remuestreos con reemplazo de cada muestra por separado
+def _bootstrap_medianas(tarea):
+    a, b, semilla, repeticiones = tarea
+    generador = np.random.default_rng(semilla)
+    paso = max(1, VALORES_POR_PASO // (len(a) + len(b)))
+    diferencias = []
+    for inicio in range(0, repeticiones, paso):
+        r = min(paso, repeticiones - inicio)
+        medianas_a = np.median(a[generador.integers(0, len(a), (r, len(a)))], axis=1)
+        medianas_b = np.median(b[generador.integers(0, len(b), (r, len(b)))], axis=1)
+        diferencias.append(medianas_a - medianas_b)
+    return np.concatenate(diferencias) if diferencias else np.empty(0)
+
+
+# Contraste entre dos ligas de cada columna: pruebas de Mann-Whitney y
+# Kolmogorov-Smirnov y diferencia de medianas con intervalo de confianza por
+# bootstrap. Los remuestreos de todas las columnas se reparten en bloques (en
+# un pool de procesos solo fuera de la aplicación, ver nucleo.paralelo) y el
+# resultado se cachea por versión de datos.
+@por_version
+def contrastes_ligas(snapshot, liga_a, liga_b, columnas=COLUMNAS_CONTRASTE,
+                     repeticiones=REPETICIONES_BOOTSTRAP, procesos=None, semilla=0):
+    ligas = snapshot.columnas[COL_LIGA]
+    codigo_a, codigo_b = snapshot.codigos(COL_LIGA, [liga_a]), snapshot.codigos(COL_LIGA, [liga_b])
+    muestras = []
+    for columna in columnas:
+        if columna not in snapshot.columnas or snapshot.es_categorica(columna):
+            continue
+        valores = snapshot.columnas[columna]
+        a = valores[np.isin(ligas, codigo_a)]
+        b = valores[np.isin(ligas, codigo_b)]
+        a, b = a[~np.isnan(a)], b[~np.isnan(b)]
+        if len(a) and len(b):
+            muestras.append((columna, a, b))
+
+    bloques = repartir(repeticiones, BLOQUES)
+    semillas = np.random.SeedSequence(semilla).spawn(len(muestras) * len(bloques))
+    tareas = [
+        (a, b, semillas[i * len(bloques) + j], r)
+        for i, (_, a, b) in enumerate(muestras)
+        for j, r in enumerate(bloques)
+    ]
+    resultados = mapear_en_procesos(_bootstrap_medianas, tareas, procesos)
+    alfa = (1 - NIVEL_CONFIANZA) / 2
+
+    filas = []
+    for i, (columna, a, b) in enumerate(muestras):
+        diferencias = np.concatenate(resultados[i * len(bloques):(i + 1) * len(bloques)])
+        inferior, superior = np.quantile(diferencias, [alfa, 1 - alfa])
+        u, p_u, superioridad = mann_whitney(a, b)
+        d, p_ks = kolmogorov_smirnov(a, b)
+        filas.append({
+            "Variable": columna,
+            f"n {liga_a}": len(a),
+            f"n {liga_b}": len(b),
+            f"Mediana {liga_a}": np.median(a),
+            f"Mediana {liga_b}": np.median(b),
+            "Diferencia de medianas": np.median(a) - np.median(b),
+            "IC inferior": inferior,
+            "IC superior": superior,
+            "U de Mann-Whitney": u,
+            "p (Mann-Whitney)": p_u,
+            f"P({liga_a} > {liga_b})": superioridad,
+            "D de Kolmogorov-Smirnov": d,
+            "p (Kolmogorov-Smirnov)": p_ks,
+        })
+    return pd.DataFrame(filas)
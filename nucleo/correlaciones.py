@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+
+from nucleo.cache import por_version
+from nucleo.esquema import (
+    COL_CAMBIO,
+    COL_EDAD,
+    COL_LIGA,
+    COL_POSICION,
+    COL_VALOR_ACTUAL,
+    COL_VALOR_INICIAL,
+    COL_VARIACION_PCT,
+)
+from nucleo.paralelo import BLOQUES, mapear_en_procesos, repartir
+
+METODOS = ["pearson", "spearman"]
+TODAS = "Todas"
+# Grupos con menos jugadores no dan correlaciones fiables
+MIN_JUGADORES = 10
+REPETICIONES_BOOTSTRAP = 200
+NIVEL_CONFIANZA = 0.95
+
+# Columnas que son el propio valor de mercado o se derivan de él, y la edad,
+# que tienen todas las fuentes: no es una estadística de rendimiento y, si
+# contara, las fuentes sin estadísticas parecerían tenerlas
+COLUMNAS_EXCLUIDAS = {COL_VALOR_ACTUAL, COL_VALOR_INICIAL, COL_VARIACION_PCT, COL_CAMBIO, COL_EDAD}
+
+
+# Función para obtener las estadísticas de rendimiento candidatas a explicar
+# el valor. Una lista vacía indica que la fuente no tiene estadísticas.
+def columnas_estadisticas(snapshot):
+    return [
+        columna for columna in snapshot.columnas_numericas()
+        if columna not in COLUMNAS_EXCLUIDAS and np.isfinite(snapshot.columnas[columna]).sum() >= MIN_JUGADORES
+    ]
+
+
+# Función para estandarizar columnas ignorando NaN (evita perder precisión al
+# multiplicar valores de mercado del orden de 1e8)
+def _estandarizar(matriz):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (matriz - np.nanmean(matriz, axis=0)) / np.nanstd(matriz, axis=0)
+
+
+# Función para calcular rangos promedio por columna (NaN se mantiene como NaN)
+def _rangos(matriz):
+    return pd.DataFrame(matriz).rank(method="average").to_numpy()
+
+
+# Correlación de Pearson de cada columna de X con y en una sola pasada
+# vectorizada, usando en cada columna los pares sin valores ausentes
+def _pearson(X, y):
+    X = _estandarizar(X)
+    y = _estandarizar(y[:, None])
+    validos = ~np.isnan(X) & ~np.isnan(y)
+    x = np.where(validos, X, 0.0)
+    yy = np.where(validos, y, 0.0)
+    n = validos.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sx, sy = x.sum(axis=0), yy.sum(axis=0)
+        cov = (x * yy).sum(axis=0) - sx * sy / n
+        vx = (x * x).sum(axis=0) - sx ** 2 / n
+        vy = (yy * yy).sum(axis=0) - sy ** 2 / n
+        r = cov / np.sqrt(vx * vy)
+    return np.where(n >= 3, np.clip(r, -1, 1), np.nan)
+
+
+# Spearman como Pearson sobre rangos. Los rangos de cada estadística se toman
+# sobre sus valores presentes, lo que coincide con el cálculo por pares salvo
+# cuando una estadística tiene huecos.
+def _spearman(X, y):
+    return _pearson(_rangos(X), _rangos(y[:, None])[:, 0])
+
+
+_FUNCIONES = {"pearson": _pearson, "spearman": _spearman}
+
+
+# Tarea de bootstrap para un proceso: remuestrea filas con reemplazo y
+# devuelve una matriz (repeticiones × estadísticas) de correlaciones
+def _bootstrap_bloque(tarea):
+    X, y, metodo, semilla, repeticiones = tarea
+    generador = np.random.default_rng(semilla)
+    funcion = _FUNCIONES[metodo]
+    n = len(y)
+    resultados = np.empty((repeticiones, X.shape[1]))
+    for i in range(repeticiones):
+        muestra = generador.integers(0, n, n)
+        resultados[i] = funcion(X[muestra], y[muestra])
+    return resultados
+
+
+# Función para calcular los percentiles de confianza de cada grupo y método.
+# Todas las repeticiones de todos los grupos se reparten en bloques con
+# semillas deterministas; los bloques se resuelven en un pool de procesos
+# solo fuera de la aplicación (ver nucleo.paralelo).
+def _intervalos(casos, repeticiones, procesos=None, semilla=0):
+    bloques = repartir(repeticiones, BLOQUES)
+    semillas = np.random.SeedSequence(semilla).spawn(len(casos) * len(bloques))
+    tareas = [
+        (X, y, metodo, semillas[i * len(bloques) + j], r)
+        for i, (X, y, metodo) in enumerate(casos)
+        for j, r in enumerate(bloques)
+    ]
+    resultados = mapear_en_procesos(_bootstrap_bloque, tareas, procesos)
+    alfa = (1 - NIVEL_CONFIANZA) / 2
+    intervalos = []
+    for i in range(len(casos)):
+        muestras = np.vstack(resultados[i * len(bloques):(i + 1) * len(bloques)])
+        with np.errstate(invalid="ignore"):
+            intervalos.append(np.nanquantile(muestras, [alfa, 1 - alfa], axis=0))
+    return intervalos
+
+
+# Función para generar los grupos analizados: todas las ligas juntas y cada
+# liga por separado, cada uno con todas las posiciones y por posición
+def _grupos(snapshot):
+    ligas = snapshot.columnas[COL_LIGA]
+    posiciones = snapshot.columnas[COL_POSICION]
+    todas = np.ones(len(snapshot), dtype=bool)
+    for i_liga, liga in [(None, TODAS)] + list(enumerate(snapshot.categorias[COL_LIGA])):
+        en_liga = todas if i_liga is None else ligas == i_liga
+        yield liga, TODAS, en_liga
+        for i_posicion, posicion in enumerate(snapshot.categorias[COL_POSICION]):
+            yield liga, posicion, en_liga & (posiciones == i_posicion)
+
+
+# Tabla de correlaciones de todas las estadísticas con el valor actual, por
+# liga y posición, con intervalos de confianza por bootstrap. Se calcula una
+# vez por versión de datos y se devuelve ordenada por |r| descendente.
+@por_version
+def tabla_correlaciones(snapshot, repeticiones=REPETICIONES_BOOTSTRAP, procesos=None):
+    columnas = columnas_estadisticas(snapshot)
+    X_total = np.column_stack([snapshot.columnas[c] for c in columnas]) if columnas else np.empty((len(snapshot), 0))
+    y_total = snapshot.columnas[COL_VALOR_ACTUAL]
+
+    grupos = []
+    casos = []
+    for liga, posicion, mascara in _grupos(snapshot):
+        mascara = mascara & ~np.isnan(y_total)
+        if mascara.sum() < MIN_JUGADORES or not columnas:
+            continue
+        X, y = X_total[mascara], y_total[mascara]
+        for metodo in METODOS:
+            grupos.append((liga, posicion, metodo, (~np.isnan(X)).sum(axis=0)))
+            casos.append((X, y, metodo))
+
+    filas = []
+    for (liga, posicion, metodo, n), (X, y, _), (inferior, superior) in zip(
+        grupos, casos, _intervalos(casos, repeticiones, procesos)
+    ):
+        filas.append(pd.DataFrame({
+            "Liga": liga,
+            "Posición": posicion,
+            "Estadística": columnas,
+            "Método": metodo,
+            "r": _FUNCIONES[metodo](X, y),
+            "IC inferior": inferior,
+            "IC superior": superior,
+            "n": n,
+        }))
+
+    if not filas:
+        return pd.DataFrame(columns=["Liga", "Posición", "Estadística", "Método", "r", "IC inferior", "IC superior", "n"])
+    tabla = pd.concat(filas, ignore_index=True).dropna(subset=["r"])
+    return tabla.iloc[np.argsort(-tabla["r"].abs().to_numpy(), kind="stable")].reset_index(drop=True)
+
+
+# Función para pivotar la tabla en una matriz estadística × grupo para el mapa de calor
+def matriz_correlaciones(tabla, metodo="pearson", liga=TODAS):
+    seleccion = tabla[(tabla["Método"] == metodo) & (tabla["Liga"] == liga)]
+    matriz = seleccion.pivot(index="Estadística", columns="Posición", values="r")
+    if TODAS in matriz.columns:
+        matriz = matriz[[TODAS] + [c for c in matriz.columns if c != TODAS]]
+        matriz = matriz.iloc[np.argsort(-matriz[TODAS].abs().to_numpy(), kind="stable")]
+    return matriz
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+from nucleo.cache import por_version
+from nucleo.esquema import COL_VALOR_ACTUAL, COL_VALOR_INICIAL, COL_VARIACION_PCT, DIMENSIONES
+
+# Histograma logarítmico del valor actual por celda, para aproximar la mediana
+# al agregar sin volver a leer los jugadores: 80 tramos entre 10 mil y 1000 millones
+LIMITES_HISTOGRAMA = np.logspace(4, 9, 81)
+TRAMOS_HISTOGRAMA = len(LIMITES_HISTOGRAMA) - 1
+
+# Medidas aditivas guardadas en cada celda
+MEDIDAS = ["jugadores", "n_actual", "suma_actual", "n_inicial", "suma_inicial", "n_variacion", "suma_variacion"]
+
+
+# Cubo de agregados precalculados sobre liga × club × posición × tramo de
+# edad. Cada celda guarda medidas aditivas y un histograma del valor, de modo
+# que cualquier agregación por un subconjunto de dimensiones (roll-up) o con
+# filtros se resuelve sumando celdas, sin recorrer los jugadores.
+class CuboMercado:
+    def __init__(self, celdas, histogramas):
+        self.celdas = celdas
+        self.histogramas = histogramas
+
+    @classmethod
+    def desde_snapshot(cls, snapshot):
+        codigos = [snapshot.columnas[d] for d in DIMENSIONES]
+        tamanos = [len(snapshot.categorias[d]) for d in DIMENSIONES]
+        clave = np.ravel_multi_index(codigos, tamanos)
+        claves, celda = np.unique(clave, return_inverse=True)
+        num_celdas = len(claves)
+
+        def suma(pesos):
+            return np.bincount(celda, weights=pesos, minlength=num_celdas)
+
+        actual = snapshot.columnas[COL_VALOR_ACTUAL]
+        inicial = snapshot.columnas.get(COL_VALOR_INICIAL, np.full(len(snapshot), np.nan))
+        variacion = snapshot.columnas.get(COL_VARIACION_PCT, np.full(len(snapshot), np.nan))
+        medidas = {
+            "jugadores": np.bincount(celda, minlength=num_celdas).astype("float64"),
+            "n_actual": suma(~np.isnan(actual)),
+            "suma_actual": suma(np.nan_to_num(actual)),
+            "n_inicial": suma(~np.isnan(inicial)),
+            "suma_inicial": suma(np.nan_to_num(inicial)),
+            "n_variacion": suma(~np.isnan(variacion)),
+            "suma_variacion": suma(np.nan_to_num(variacion)),
+        }
+        etiquetas = {
+            d: snapshot.categorias[d][indices]
+            for d, indices in zip(DIMENSIONES, np.unravel_index(claves, tamanos))
+        }
+        celdas = pd.DataFrame({**etiquetas, **medidas})
+
+        validos = actual > 0
+        tramo = np.clip(np.searchsorted(LIMITES_HISTOGRAMA, actual[validos], side="right") - 1, 0, TRAMOS_HISTOGRAMA - 1)
+        histogramas = np.bincount(
+            celda[validos] * TRAMOS_HISTOGRAMA + tramo,
+            minlength=num_celdas * TRAMOS_HISTOGRAMA,
+        ).reshape(num_celdas, TRAMOS_HISTOGRAMA)
+        return cls(celdas, histogramas)
+
+    # Función para seleccionar las celdas que cumplen los filtros {dimensión: [etiquetas]}
+    def _mascara(self, filtros):
+        mascara = np.ones(len(self.celdas), dtype=bool)
+        for dimension, valores in (filtros or {}).items():
+            if valores:
+                mascara &= self.celdas[dimension].isin(valores).to_numpy()
+        return mascara
+
+    # Agregados por las dimensiones pedidas (ninguna = total), con filtros opcionales
+    def agregar(self, por=(), filtros=None):
+        mascara = self._mascara(filtros)
+        celdas = self.celdas[mascara]
+        histogramas = self.histogramas[mascara]
+        por = list(por)
+        if por:
+            agrupado = celdas.groupby(por, sort=True)
+            resultado = agrupado[MEDIDAS].sum().reset_index()
+            hist = np.zeros((len(resultado), TRAMOS_HISTOGRAMA))
+            np.add.at(hist, agrupado.ngroup().to_numpy(), histogramas)
+        else:
+            resultado = pd.DataFrame([celdas[MEDIDAS].sum()])
+            hist = histogramas.sum(axis=0, keepdims=True)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            resultado["Valor total"] = resultado["suma_actual"]
+            resultado["Valor medio"] = resultado["suma_actual"] / resultado["n_actual"]
+            resultado["Valor mediano (aprox.)"] = _mediana_histograma(hist)
+            resultado["Valor inicial total"] = resultado["suma_inicial"]
+            resultado["Cambio total"] = resultado["suma_actual"] - resultado["suma_inicial"]
+            resultado["Cambio (%)"] = resultado["Cambio total"] / resultado["suma_inicial"] * 100
+            resultado["Variación media (%)"] = resultado["suma_variacion"] / resultado["n_variacion"]
+        resultado = resultado.rename(columns={"jugadores": "Jugadores"})
+        return resultado.drop(columns=[m for m in MEDIDAS if m != "jugadores"]).reset_index(drop=True)
+
+    # Totales globales (o filtrados) como un diccionario de KPIs
+    def total(self, filtros=None):
+        return self.agregar((), filtros).iloc[0].to_dict()
+
+
+# Función para aproximar la mediana de cada fila de histogramas, interpolando
+# en escala logarítmica dentro del tramo que contiene la mitad de los jugadores
+def _mediana_histograma(histogramas):
+    acumulado = np.cumsum(histogramas, axis=1)
+    totales = acumulado[:, -1]
+    mitad = totales / 2
+    tramo = np.minimum((acumulado < mitad[:, None]).sum(axis=1), TRAMOS_HISTOGRAMA - 1)
+    filas = np.arange(len(histogramas))
+    previos = np.where(tramo > 0, acumulado[filas, tramo - 1], 0)
+    en_tramo = histogramas[filas, tramo]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraccion = np.where(en_tramo > 0, (mitad - previos) / en_tramo, 0.5)
+    log_limites = np.log10(LIMITES_HISTOGRAMA)
+    mediana = 10 ** (log_limites[tramo] + fraccion * (log_limites[tramo + 1] - log_limites[tramo]))
+    return np.where(totales > 0, mediana, np.nan)
+
+
+# Cubo de un snapshot, construido una vez por versión de datos
+@por_version
+def cubo_mercado(snapshot):
+    return CuboMercado.desde_snapshot(snapshot)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+# Nombres de columna compartidos por los CSV de LaLiga y Bundesliga
+COL_NOMBRE = "Nombre"
+COL_EDAD = "Edad"
+COL_VALOR_INICIAL = "Valor de Mercado en 01/01/2024"
+COL_VALOR_ACTUAL = "Valor de Mercado Actual"
+COL_LIGA = "Liga"
+COL_CLUB = "Club"
+COL_POSICION = "Posición"
+COL_TRAMO_EDAD = "Tramo de edad"
+COL_VARIACION_PCT = "Variación (%)"
+COL_CAMBIO = "Cambio (€)"
+COL_TENDENCIA = "Tendencia"
+
+# Algunas exportaciones usan otros nombres para las mismas columnas
+ALIAS_COLUMNAS = {
+    "Equipo": COL_CLUB,
+    "Posicion": COL_POSICION,
+}
+
+# Dimensiones categóricas que siempre existen tras la ingesta
+DIMENSIONES = [COL_LIGA, COL_CLUB, COL_POSICION, COL_TRAMO_EDAD]
+SIN_DATOS = "Sin datos"
+
+# Tramos de edad usados para agrupar jugadores
+LIMITES_TRAMOS_EDAD = [21, 25, 29, 33]
+ETIQUETAS_TRAMOS_EDAD = ["≤21", "22-25", "26-29", "30-33", "34+"]
+
+
+# Función para asignar el tramo de edad a cada jugador (vectorizada)
+def tramo_edad(edades):
+    edades = pd.to_numeric(pd.Series(edades), errors="coerce").to_numpy(dtype="float64")
+    posiciones = np.searchsorted(LIMITES_TRAMOS_EDAD, edades, side="left")
+    etiquetas = np.array(ETIQUETAS_TRAMOS_EDAD, dtype=object)[np.minimum(posiciones, len(ETIQUETAS_TRAMOS_EDAD) - 1)]
+    etiquetas[np.isnan(edades)] = SIN_DATOS
+    return etiquetas
+
+
+# Grupos de posición para las restricciones de plantilla, reconocidos por
+# palabras clave en la posición que publica Transfermarkt
+GRUPOS_POSICION = {
+    "Portero": ["portero"],
+    "Defensa": ["defensa", "lateral", "central", "carrilero", "líbero"],
+    "Centrocampista": ["pivote", "medio", "mediapunta", "interior", "centrocampista", "volante"],
+    "Delantero": ["delantero", "extremo", "punta", "atacante"],
+}
+
+
+# Función para asignar a cada etiqueta de posición su grupo (o None si no se reconoce)
+def grupo_posicion(posicion):
+    if not isinstance(posicion, str):
+        return None
+    texto = posicion.lower()
+    for grupo, claves in GRUPOS_POSICION.items():
+        if any(clave in texto for clave in claves):
+            return grupo
+    return None
@@ -0,0 +1,222 @@
+import copy
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from nucleo.cache import por_version
+from nucleo.esquema import (
+    COL_CLUB,
+    COL_LIGA,
+    COL_POSICION,
+    COL_TRAMO_EDAD,
+    COL_VALOR_ACTUAL,
+    COL_VALOR_INICIAL,
+)
+from nucleo.seleccion import UltimoPorLinaje
+
+COLUMNAS_VALOR = [COL_VALOR_INICIAL, COL_VALOR_ACTUAL]
+DIMENSIONES_RESUMEN = [COL_CLUB, COL_POSICION, COL_TRAMO_EDAD]
+METRICAS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max", "skew"]
+
+PARTES = ["n", "media", "m2", "m3"]
+
+
+# Función para identificar el linaje de un snapshot para el servicio: sus ligas
+# y columnas. A diferencia de seleccion.linaje() no incluye los jugadores, así
+# que una liga que gana o pierde filas se sigue actualizando de forma
+# incremental.
+def _linaje_servicio(snapshot):
+    resumen = hashlib.blake2b(digest_size=12)
+    resumen.update("\x1f".join(map(str, snapshot.categorias[COL_LIGA])).encode("utf-8"))
+    resumen.update("\x1f".join(snapshot.columnas).encode("utf-8"))
+    return resumen.hexdigest()
+
+
+# Último servicio de cada fuente (linaje de datos), para refrescarlo
+_ultimos_servicios = UltimoPorLinaje(clave=_linaje_servicio)
+
+
+# Función para calcular por grupo y columna n, la media y las sumas de
+# desviaciones respecto a la media del grupo al cuadrado y al cubo (ignorando
+# NaN). Centrar antes de elevar evita perder precisión cuando los valores son
+# grandes y están muy juntos (p. ej. 50 M€ ± 1 k€).
+def _momentos(datos, claves, columnas):
+    valores = datos[columnas]
+    grupos = [datos[clave] for clave in claves]
+    agrupado = valores.groupby(grupos, observed=True)
+    desviaciones = valores - agrupado.transform("mean")
+    partes = {
+        "n": agrupado.count().astype("float64"),
+        "media": agrupado.mean(),
+        "m2": (desviaciones ** 2).groupby(grupos, observed=True).sum(),
+        "m3": (desviaciones ** 3).groupby(grupos, observed=True).sum(),
+    }
+    return pd.concat(partes, axis=1).fillna(0)
+
+
+# Función para añadir a los momentos `a` los de otras filas `b` (signo=1) o
+# quitarle los de un subconjunto suyo (signo=-1), con las fórmulas de Chan y
+# Pébay para combinar medias y momentos centrados
+def _combinar(a, b, signo=1):
+    indice = a.index.union(b.index)
+    a = a.reindex(indice, fill_value=0)
+    b = b.reindex(indice, fill_value=0)
+    partes = {}
+    for columna in a["n"].columns:
+        na, media_a, m2a, m3a = (a[(parte, columna)] for parte in PARTES)
+        nb, media_b, m2b, m3b = (b[(parte, columna)] for parte in PARTES)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if signo > 0:
+                n = na + nb
+                delta = media_b - media_a
+                media = media_a + delta * nb / n
+                m2 = m2a + m2b + delta ** 2 * na * nb / n
+                m3 = m3a + m3b + delta ** 3 * na * nb * (na - nb) / n ** 2 + 3 * delta * (na * m2b - nb * m2a) / n
+            else:
+                # `a` es el total y `b` una parte: se despeja el resto
+                n = na - nb
+                media = (na * media_a - nb * media_b) / n
+                delta = media_b - media
+                m2 = (m2a - m2b - delta ** 2 * n * nb / na).clip(lower=0)
+                m3 = m3a - m3b - delta ** 3 * n * nb * (n - nb) / na ** 2 - 3 * delta * (n * m2b - nb * m2) / na
+        vacio = n <= 0
+        for parte, valores in zip(PARTES, [n.clip(lower=0), media, m2, m3]):
+            partes[(parte, columna)] = valores.mask(vacio, 0)
+    return pd.DataFrame(partes, index=indice)
+
+
+# Función para pasar de momentos acumulados a count, mean, std y skew
+def _desde_momentos(momentos, columna):
+    n, media, m2, m3 = (momentos[(parte, columna)] for parte in PARTES)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(m2 / (n - 1)).where(n > 1)
+        # Asimetría ajustada de Fisher-Pearson, la misma que Series.skew()
+        asimetria = ((m3 / n) / (m2 / n) ** 1.5 * np.sqrt(n * (n - 1)) / (n - 2)).where((n > 2) & (m2 > 0))
+    return pd.DataFrame({
+        "count": n,
+        "mean": media.where(n > 0),
+        "std": std,
+        "skew": asimetria,
+    })
+
+
+# Función para calcular mínimo, cuartiles y máximo por grupo y columna
+def _cuantiles(datos, claves, columnas):
+    agrupado = datos.groupby(claves, observed=True)[columnas]
+    partes = {"min": agrupado.min(), "max": agrupado.max()}
+    cuartiles = agrupado.quantile([0.25, 0.5, 0.75])
+    for q, etiqueta in [(0.25, "25%"), (0.5, "50%"), (0.75, "75%")]:
+        partes[etiqueta] = cuartiles.xs(q, level=-1)
+    return pd.concat(partes, axis=1)
+
+
+# Servicio de estadísticas resumen (las de describe() más la asimetría) por
+# liga y por liga × club/posición/tramo de edad. Los momentos se calculan una
+# vez por agrupación con un groupby vectorizado y se actualizan combinándolos
+# con los de las filas que entran o salen; los cuantiles solo se recalculan para los
+# grupos afectados y únicamente cuando se vuelven a pedir. Cada versión nueva
+# de los datos se obtiene con refrescar() a partir del servicio de la anterior.
+class ServicioEstadisticas:
+    def __init__(self, datos, columnas=COLUMNAS_VALOR):
+        self.columnas = [columna for columna in columnas if columna in datos.columns]
+        self._datos = datos
+        self._momentos = {}
+        self._cuantiles = {}
+
+    @classmethod
+    def desde_snapshot(cls, snapshot, columnas=COLUMNAS_VALOR):
+        columnas = [columna for columna in columnas if columna in snapshot.columnas]
+        return cls(_datos_servicio(snapshot, columnas), columnas)
+
+    # Función para obtener el servicio de otra versión de los datos: solo se
+    # sustituyen las ligas cuyas filas cambiaron (y se quitan las que ya no
+    # están), así que los momentos y cuantiles del resto se reutilizan.
+    # Devuelve un servicio nuevo; este no se modifica.
+    def refrescar(self, snapshot):
+        datos = _datos_servicio(snapshot, self.columnas)
+        nuevo = copy.copy(self)
+        nuevo._momentos = dict(self._momentos)
+        nuevo._cuantiles = dict(self._cuantiles)
+        for liga in pd.unique(pd.concat([self._datos[COL_LIGA], datos[COL_LIGA]])):
+            antes = self._datos[self._datos[COL_LIGA] == liga]
+            ahora = datos[datos[COL_LIGA] == liga]
+            if not antes.reset_index(drop=True).equals(ahora.reset_index(drop=True)):
+                nuevo.reemplazar_liga(liga, ahora)
+        return nuevo
+
+    def _momentos_de(self, claves):
+        if claves not in self._momentos:
+            self._momentos[claves] = _momentos(self._datos, list(claves), self.columnas)
+        return self._momentos[claves]
+
+    def _cuantiles_de(self, claves):
+        cuantiles = self._cuantiles.get(claves)
+        grupos = self._momentos_de(claves).index
+        faltantes = grupos if cuantiles is None else grupos.difference(cuantiles.index)
+        if len(faltantes):
+            claves_datos = pd.MultiIndex.from_frame(self._datos[list(claves)]) if len(claves) > 1 else self._datos[claves[0]]
+            nuevos = _cuantiles(self._datos[claves_datos.isin(faltantes)], list(claves), self.columnas)
+            cuantiles = nuevos if cuantiles is None else pd.concat([cuantiles, nuevos])
+            self._cuantiles[claves] = cuantiles
+        return cuantiles
+
+    def _tabla(self, claves, columna):
+        momentos = self._momentos_de(claves)
+        tabla = _desde_momentos(momentos, columna).join(self._cuantiles_de(claves).xs(columna, axis=1, level=1))
+        return tabla[tabla["count"] > 0][METRICAS]
+
+    # Resumen de una liga con el formato de describe() (métricas en filas)
+    def resumen(self, liga):
+        return pd.DataFrame({
+            columna: self._tabla((COL_LIGA,), columna).loc[liga]
+            for columna in self.columnas
+        }).reindex(METRICAS)
+
+    # Resumen de una columna por grupos de una dimensión (grupos en filas)
+    def resumen_agrupado(self, dimension, columna=COL_VALOR_ACTUAL, liga=None):
+        tabla = self._tabla((COL_LIGA, dimension), columna)
+        if liga is not None:
+            tabla = tabla.xs(liga, level=COL_LIGA)
+        return tabla
+
+    # Función para aplicar cambios de filas: se eliminan las filas con las
+    # etiquetas indicadas y se añaden las nuevas (con las mismas columnas)
+    def actualizar(self, nuevas=None, eliminadas=None):
+        quitadas = self._datos.loc[list(eliminadas)] if eliminadas is not None else self._datos.iloc[:0]
+        nuevas = nuevas[self._datos.columns] if nuevas is not None else self._datos.iloc[:0]
+        # Las filas nuevas reciben etiquetas propias a continuación de las
+        # existentes: con las suyas podrían coincidir con las de otra liga
+        inicio = int(self._datos.index.max()) + 1 if len(self._datos) else 0
+        nuevas = nuevas.set_axis(pd.RangeIndex(inicio, inicio + len(nuevas)))
+        cambiadas = pd.concat([quitadas, nuevas])
+
+        for claves, momentos in self._momentos.items():
+            momentos = _combinar(momentos, _momentos(quitadas, list(claves), self.columnas), signo=-1)
+            self._momentos[claves] = _combinar(momentos, _momentos(nuevas, list(claves), self.columnas))
+            if claves in self._cuantiles:
+                afectados = pd.MultiIndex.from_frame(cambiadas[list(claves)]) if len(claves) > 1 else pd.Index(cambiadas[claves[0]])
+                self._cuantiles[claves] = self._cuantiles[claves].drop(afectados.unique(), errors="ignore")
+
+        self._datos = pd.concat([self._datos.drop(index=quitadas.index), nuevas])
+        return self
+
+    # Función para sustituir todas las filas de una liga (p. ej. al recargar su CSV)
+    def reemplazar_liga(self, liga, nuevas):
+        eliminadas = self._datos.index[self._datos[COL_LIGA] == liga]
+        return self.actualizar(nuevas=nuevas, eliminadas=eliminadas)
+
+
+# Función para obtener las columnas de un snapshot que usa el servicio
+def _datos_servicio(snapshot, columnas):
+    return snapshot.a_dataframe(columnas=[COL_LIGA] + DIMENSIONES_RESUMEN + columnas)
+
+
+# Servicio de estadísticas de un snapshot, uno por versión de datos: la
+# primera versión de cada fuente se construye entera y las siguientes se
+# derivan de la anterior sustituyendo solo las ligas que cambiaron
+@por_version
+def servicio_estadisticas(snapshot):
+    return _ultimos_servicios.calcular(
+        snapshot, ServicioEstadisticas.desde_snapshot, lambda anterior, snapshot: anterior.refrescar(snapshot)
+    )
@@ -0,0 +1,67 @@
+import tempfile
+
+# Filas que se materializan a la vez al exportar: acota la memoria usada por
+# bloque independientemente del tamaño de la selección
+TAMANO_BLOQUE = 50_000
+
+
+# Función para recorrer la selección en bloques de DataFrame proyectados, con
+# los tipos de los datos de origen (Edad sale como 25 y no como 25.0)
+def iterar_bloques(snapshot, filas, columnas=None, tamano_bloque=TAMANO_BLOQUE):
+    for inicio in range(0, len(filas), tamano_bloque):
+        yield snapshot.a_dataframe(filas[inicio:inicio + tamano_bloque], columnas, tipos_originales=True)
+
+
+# Función para escribir la selección como CSV en un archivo binario, bloque a bloque
+def escribir_csv(snapshot, filas, destino, columnas=None, tamano_bloque=TAMANO_BLOQUE):
+    cabecera = True
+    for bloque in iterar_bloques(snapshot, filas, columnas, tamano_bloque):
+        destino.write(bloque.to_csv(index=False, header=cabecera).encode("utf-8"))
+        cabecera = False
+    if cabecera:
+        destino.write(snapshot.a_dataframe(filas[:0], columnas, tipos_originales=True).to_csv(index=False).encode("utf-8"))
+
+
+# Función para obtener el tipo de Arrow de una columna del snapshot
+def _tipo_arrow(pa, snapshot, nombre):
+    if snapshot.es_categorica(nombre):
+        return pa.string()
+    if nombre in snapshot.tipos:
+        return pa.from_numpy_dtype(snapshot.tipos[nombre])
+    return pa.float64()
+
+
+# Función para escribir la selección como Parquet, un grupo de filas por bloque.
+# El esquema se fija de antemano para que todos los bloques sean compatibles
+# aunque alguno tenga una columna completamente vacía.
+def escribir_parquet(snapshot, filas, destino, columnas=None, tamano_bloque=TAMANO_BLOQUE):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columnas = list(snapshot.columnas) if columnas is None else list(columnas)
+    esquema = pa.schema([
+        (nombre, _tipo_arrow(pa, snapshot, nombre))
+        for nombre in columnas
+    ])
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for bloque in iterar_bloques(snapshot, filas, columnas, tamano_bloque):
+            escritor.write_table(pa.Table.from_pandas(bloque, schema=esquema, preserve_index=False))
+
+
+# Función para generar el contenido a descargar. Los bloques se escriben en un
+# archivo temporal en disco y solo al final se leen como bytes, que es lo que
+# necesita st.download_button; así no conviven en memoria una copia completa
+# del DataFrame filtrado y su serialización.
+def _exportar(escribir, snapshot, filas, columnas):
+    with tempfile.TemporaryFile() as archivo:
+        escribir(snapshot, filas, archivo, columnas)
+        archivo.seek(0)
+        return archivo.read()
+
+
+def exportar_csv(snapshot, filas, columnas=None):
+    return _exportar(escribir_csv, snapshot, filas, columnas)
+
+
+def exportar_parquet(snapshot, filas, columnas=None):
+    return _exportar(escribir_parquet, snapshot, filas, columnas)
@@ -0,0 +1,283 @@
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+
+from nucleo.carga import FUENTES, leer_liga, leer_ligas
+from nucleo.columnar import version_datos
+from nucleo.precalculo import RUTA_CACHE, cache_lista, cargar_precalculo, escribir_atomico
+from nucleo.vigilancia import INTERVALO, VigilanteDirectorio, archivos_ligas
+
+# Segundos tras los que una copia de los datos se considera antigua: se sigue
+# sirviendo, pero se pide una versión nueva en segundo plano
+REFRESCO = 15 * 60
+# Fallos seguidos que abren el interruptor y segundos que permanece abierto
+# antes de dejar pasar una descarga de prueba
+FALLOS_MAXIMOS = 3
+ESPERA_INTERRUPTOR = 5 * 60
+
+# Directorio de datos locales (instalaciones propias): si está definido, los
+# CSV de <directorio>/<fuente>/<Liga>.csv sustituyen a los remotos de esa liga
+# y se vuelven a leer en cuanto cambian, sin reiniciar la aplicación
+DIRECTORIO_LOCAL = os.environ.get("DATOS_LOCALES")
+
+CERRADO = "cerrado"
+ABIERTO = "abierto"
+SEMIABIERTO = "semiabierto"
+
+
+# Interruptor (circuit breaker) de un origen remoto. Tras FALLOS_MAXIMOS fallos
+# seguidos se abre y no deja pasar descargas durante `espera` segundos; después
+# deja pasar una sola de prueba: si funciona se cierra y si falla se vuelve a
+# abrir. Así, con el origen caído, no se acumulan descargas que acaban en
+# tiempo de espera.
+class Interruptor:
+    def __init__(self, fallos_maximos=FALLOS_MAXIMOS, espera=ESPERA_INTERRUPTOR, reloj=time.monotonic):
+        self.fallos_maximos = fallos_maximos
+        self.espera = espera
+        self._reloj = reloj
+        self.fallos = 0
+        self.abierto_desde = None
+        self._prueba_en_curso = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self):
+        if self.abierto_desde is None:
+            return CERRADO
+        if self._reloj() - self.abierto_desde < self.espera:
+            return ABIERTO
+        return SEMIABIERTO
+
+    # Segundos que faltan para dejar pasar la descarga de prueba
+    def restante(self):
+        if self.abierto_desde is None:
+            return 0.0
+        return max(0.0, self.espera - (self._reloj() - self.abierto_desde))
+
+    # Función para saber si se puede intentar una descarga (y, si el
+    # interruptor está semiabierto, reservar la única de prueba)
+    def permitir(self):
+        with self._lock:
+            estado = self.estado
+            if estado == CERRADO:
+                return True
+            if estado == SEMIABIERTO and not self._prueba_en_curso:
+                self._prueba_en_curso = True
+                return True
+            return False
+
+    def exito(self):
+        with self._lock:
+            self.fallos = 0
+            self.abierto_desde = None
+            self._prueba_en_curso = False
+
+    def fallo(self):
+        with self._lock:
+            self.fallos += 1
+            if self._prueba_en_curso or self.fallos >= self.fallos_maximos:
+                self.abierto_desde = self._reloj()
+            self._prueba_en_curso = False
+
+
+# Copia de los datos de una fuente: las ligas leídas (sin congelar), la versión
+# de su contenido y el momento (time.time()) en que se obtuvieron del origen
+class CopiaDatos:
+    def __init__(self, ligas, version, obtenido):
+        self.ligas = ligas
+        self.version = version
+        self.obtenido = obtenido
+
+    @property
+    def edad(self):
+        return max(0.0, time.time() - self.obtenido)
+
+
+# Origen de los datos de una fuente con la estrategia stale-while-revalidate:
+# obtener() devuelve al momento la última copia buena y, si es más antigua que
+# `refresco`, la renueva en un hilo aparte sin que nadie la espere. Solo se
+# descarga en primer plano si no hay ninguna copia (ni en memoria ni en disco).
+# Cada copia descargada se guarda en disco, así que un reinicio con el origen
+# caído sigue sirviendo datos; el precálculo también sirve como copia inicial.
+# Con vigilar(), los CSV de un directorio local sustituyen a las ligas remotas
+# del mismo nombre y cada cambio en ellos publica una copia nueva.
+class OrigenDatos:
+    def __init__(self, fuente, rutas=None, directorio=RUTA_CACHE, refresco=REFRESCO, interruptor=None):
+        self.fuente = fuente
+        self.rutas = rutas if rutas is not None else FUENTES[fuente]
+        self.directorio = directorio
+        self.refresco = refresco
+        self.interruptor = interruptor if interruptor is not None else Interruptor()
+        self.copia = None
+        self.ultimo_error = None
+        self.locales = {}
+        self.vigilante = None
+        self._suscriptores = []
+        self._refrescando = False
+        self._lock = threading.Lock()
+        self._lock_inicial = threading.Lock()
+        # Serializa las lecturas que acaban publicando una copia (descargas e
+        # ingestas), para que una lectura antigua no sustituya a una más nueva
+        self._lock_datos = threading.RLock()
+
+    @property
+    def _ruta_ultima(self):
+        return os.path.join(self.directorio, f"{self.fuente}-ultima.pkl")
+
+    # Función para leer la copia más reciente guardada en disco: la última
+    # descarga buena o el precálculo. Devuelve None si no hay ninguna.
+    def _copia_en_disco(self):
+        candidatas = []
+        try:
+            with open(self._ruta_ultima, "rb") as archivo:
+                contenido = pickle.load(archivo)
+            candidatas.append(CopiaDatos(contenido["ligas"], contenido["version"], contenido["obtenido"]))
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, AttributeError, ImportError):
+            pass
+        precalculo = cargar_precalculo(self.fuente, self.directorio, derivados=False)
+        if precalculo is not None:
+            creado = (cache_lista(self.directorio) or {}).get("creado")
+            obtenido = datetime.fromisoformat(creado).timestamp() if creado else 0.0
+            candidatas.append(CopiaDatos(precalculo.ligas, version_datos(precalculo.ligas), obtenido))
+        return max(candidatas, key=lambda copia: copia.obtenido, default=None)
+
+    # Función para suscribirse a los cambios de versión: funcion(anterior,
+    # nueva) se llama con las dos copias cada vez que se publica una distinta
+    def suscribir(self, funcion):
+        self._suscriptores.append(funcion)
+
+    # Función para publicar una copia nueva: se sustituye de una vez (quien ya
+    # tenía la anterior la sigue usando entera), se guarda como la última
+    # copia buena y se avisa a los suscriptores si cambió la versión
+    def _publicar(self, ligas):
+        anterior = self.copia
+        copia = CopiaDatos(ligas, version_datos(ligas), time.time())
+        self.copia = copia
+        self.ultimo_error = None
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            escribir_atomico(self._ruta_ultima, pickle.dumps(
+                {"ligas": ligas, "version": copia.version, "obtenido": copia.obtenido}
+            ))
+        except OSError:
+            pass
+        if anterior is not None and anterior.version != copia.version:
+            for funcion in self._suscriptores:
+                funcion(anterior, copia)
+        return copia
+
+    # Función para descargar los datos a través del interruptor (las ligas
+    # locales se leen del directorio vigilado) y publicarlos
+    def descargar(self):
+        with self._lock_datos:
+            if not self.interruptor.permitir():
+                raise RuntimeError(
+                    f"El origen de datos '{self.fuente}' no responde; "
+                    f"se volverá a intentar en {self.interruptor.restante():.0f} s"
+                )
+            try:
+                ligas = leer_ligas({**self.rutas, **self.locales})
+            except Exception as error:
+                self.interruptor.fallo()
+                self.ultimo_error = error
+                raise
+            self.interruptor.exito()
+            return self._publicar(ligas)
+
+    # Función para incorporar a la copia actual solo las ligas locales que han
+    # cambiado ({liga: ruta}) y quitar las borradas que no tienen origen
+    # remoto. El resto de ligas se reutilizan sin volver a leerlas. Si un CSV
+    # no se puede leer (p. ej. está a medio copiar) se conserva la copia
+    # anterior y el error queda en ultimo_error.
+    def ingerir(self, cambiadas, borradas=()):
+        with self._lock_datos:
+            if self.copia is None:
+                return self.descargar()
+            ligas = {liga: df for liga, df in self.copia.ligas.items() if liga not in borradas or liga in self.rutas}
+            try:
+                ligas.update({liga: leer_liga(ruta) for liga, ruta in cambiadas.items()})
+            except Exception as error:
+                self.ultimo_error = error
+                raise
+            return self._publicar(ligas)
+
+    # Función para vigilar un directorio de CSV locales. Los que ya existen se
+    # incorporan en la primera carga; después, cada cambio se ingiere en el
+    # hilo del vigilante. Las ligas borradas que también tienen origen remoto
+    # vuelven a él en el siguiente refresco, que se pide al momento. Si la
+    # ingesta falla, la lista de ligas locales no cambia y el vigilante repite
+    # el aviso con los mismos archivos.
+    def vigilar(self, directorio, intervalo=INTERVALO):
+        self.locales = archivos_ligas(directorio)
+        self.vigilante = VigilanteDirectorio(directorio, self._al_cambiar, intervalo).iniciar()
+        return self.vigilante
+
+    def _al_cambiar(self, nombres):
+        locales = archivos_ligas(self.vigilante.directorio)
+        cambiadas = {liga: ruta for liga, ruta in locales.items() if os.path.basename(ruta) in nombres}
+        borradas = [liga for liga in self.locales if liga not in locales]
+        if cambiadas or borradas:
+            self.ingerir(cambiadas, borradas)
+        self.locales = locales
+        if any(liga in self.rutas for liga in borradas):
+            self.refrescar_en_segundo_plano()
+
+    # Función para obtener la copia actual de los datos sin esperar al origen
+    def obtener(self):
+        copia = self.copia
+        if copia is None:
+            with self._lock_inicial:
+                if self.copia is None:
+                    copia = self._copia_en_disco()
+                    if copia is None:
+                        return self.descargar()
+                    self.copia = copia
+                    if self.locales:
+                        # La copia de disco puede ser anterior a los CSV
+                        # locales; si no se pueden leer, se sirve tal cual
+                        try:
+                            self.ingerir(self.locales)
+                        except Exception:
+                            pass
+                copia = self.copia
+        if copia.edad > self.refresco:
+            self.refrescar_en_segundo_plano()
+        return copia
+
+    # Función para renovar la copia en un hilo aparte. Solo hay un refresco en
+    # curso por origen y no se lanza con el interruptor abierto.
+    def refrescar_en_segundo_plano(self):
+        with self._lock:
+            if self._refrescando or self.interruptor.estado == ABIERTO:
+                return
+            self._refrescando = True
+        threading.Thread(target=self._refrescar, name=f"refresco-{self.fuente}", daemon=True).start()
+
+    def _refrescar(self):
+        try:
+            self.descargar()
+        except Exception:
+            # El error queda en ultimo_error y en el interruptor; se sigue
+            # sirviendo la copia anterior
+            pass
+        finally:
+            with self._lock:
+                self._refrescando = False
+
+    # Función para describir el estado del origen: edad de la copia servida (en
+    # segundos, None si aún no hay copia), estado del interruptor, último error
+    # (de la descarga, de la ingesta o del vigilante) y si hay un refresco en
+    # curso
+    def estado(self):
+        copia = self.copia
+        error = self.ultimo_error
+        if error is None and self.vigilante is not None:
+            error = self.vigilante.ultimo_error
+        return {
+            "edad": None if copia is None else copia.edad,
+            "interruptor": self.interruptor.estado,
+            "error": None if error is None else f"{type(error).__name__}: {error}",
+            "refrescando": self._refrescando,
+        }
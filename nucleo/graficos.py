@@ -0,0 +1,86 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from nucleo.cache import por_version
+from nucleo.esquema import COL_LIGA, COL_VALOR_ACTUAL
+
+# Colores de línea y relleno de cada liga en las gráficas comparativas
+COLORES_LIGA = {
+    "LaLiga": ("blue", "rgba(0, 0, 255, 0.3)"),
+    "Bundesliga": ("green", "rgba(0, 255, 0, 0.3)"),
+}
+
+
+# Gráfica de evolución mensual del valor de mercado, una línea por serie
+# ({nombre: valores}) sobre los mismos meses
+def grafico_evolucion(meses, series, titulo, tamano_marcador=10):
+    fig = go.Figure()
+    for nombre, valores in series.items():
+        fig.add_trace(go.Scatter(
+            x=meses,
+            y=valores,
+            mode='lines+markers',
+            name=nombre,
+            line=dict(width=3),
+            marker=dict(size=tamano_marcador)
+        ))
+    fig.update_layout(
+        title=titulo,
+        xaxis_title='Mes',
+        yaxis_title='Valor de Mercado (€)',
+        hovermode='x unified',
+        showlegend=True
+    )
+    return fig
+
+
+# Gráfica de violín de la distribución de valores de mercado de cada liga
+def grafico_violin_ligas(valores_por_liga, mostrar_leyenda=False):
+    fig = go.Figure()
+    for liga, valores in valores_por_liga.items():
+        linea, relleno = COLORES_LIGA.get(liga, (None, None))
+        fig.add_trace(go.Violin(
+            y=valores,
+            name=liga,
+            box_visible=True,
+            meanline_visible=True,
+            line_color=linea,
+            fillcolor=relleno,
+            opacity=0.7
+        ))
+    fig.update_layout(
+        title="Distribución de Valores de Mercado por Liga",
+        yaxis_title="Valor de Mercado (€)",
+        xaxis_title="Ligas",
+        violingap=0.5,
+        violingroupgap=0.3,
+        showlegend=mostrar_leyenda
+    )
+    return fig
+
+
+# Violín de las ligas indicadas a partir del snapshot, construido una vez por
+# versión de datos. La figura se comparte: se puede mostrar pero no modificar.
+@por_version
+def figura_violin_ligas(snapshot, ligas, mostrar_leyenda=False):
+    codigos = snapshot.columnas[COL_LIGA]
+    valores = snapshot.columnas[COL_VALOR_ACTUAL]
+    return grafico_violin_ligas(
+        {liga: valores[np.isin(codigos, snapshot.codigos(COL_LIGA, [liga]))] for liga in ligas},
+        mostrar_leyenda
+    )
+
+
+# Gráfica de cajas de varias series de valores de mercado ({nombre: valores})
+def grafico_cajas(series, titulo):
+    fig = go.Figure()
+    for nombre, valores in series.items():
+        fig.add_trace(go.Box(
+            y=valores,
+            name=nombre
+        ))
+    fig.update_layout(
+        title=titulo,
+        yaxis_title='Valor de Mercado (€)'
+    )
+    return fig
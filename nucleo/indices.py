@@ -0,0 +1,33 @@
+import numpy as np
+
+
+# Índice ordenado sobre una columna numérica: guarda los valores ordenados y la
+# permutación de filas, de modo que un filtro por rango se resuelve con dos
+# búsquedas binarias y un corte en lugar de recorrer toda la columna.
+class IndiceOrdenado:
+    def __init__(self, valores):
+        valores = np.asarray(valores, dtype="float64")
+        # Las filas sin valor (None/NaN tras convertir_valor) nunca cumplen un
+        # filtro de rango, así que quedan fuera del índice
+        filas = np.flatnonzero(~np.isnan(valores))
+        orden = np.argsort(valores[filas], kind="stable")
+        self.valores = valores[filas][orden]
+        self.filas = filas[orden]
+        self.minimo = self.valores[0] if len(self.valores) else 0.0
+        self.maximo = self.valores[-1] if len(self.valores) else 0.0
+
+    def __len__(self):
+        return len(self.filas)
+
+    # Posiciones (iloc) de las filas con minimo <= valor <= maximo, ordenadas
+    # por valor. Los límites en None equivalen a un rango abierto.
+    def rango(self, minimo=None, maximo=None):
+        inicio = 0 if minimo is None else np.searchsorted(self.valores, minimo, side="left")
+        fin = len(self.valores) if maximo is None else np.searchsorted(self.valores, maximo, side="right")
+        return self.filas[inicio:fin]
+
+    # Número de filas en el rango, sin materializar las posiciones
+    def contar(self, minimo=None, maximo=None):
+        inicio = 0 if minimo is None else np.searchsorted(self.valores, minimo, side="left")
+        fin = len(self.valores) if maximo is None else np.searchsorted(self.valores, maximo, side="right")
+        return max(int(fin - inicio), 0)
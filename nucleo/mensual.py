@@ -0,0 +1,77 @@
+from datetime import date
+
+import numpy as np
+
+from nucleo.cache import por_version
+from nucleo.consultas import filas_de_jugadores
+from nucleo.esquema import COL_LIGA, COL_NOMBRE, COL_VALOR_ACTUAL, COL_VALOR_INICIAL
+
+# Primer mes de la evolución: el valor inicial es el de 01/01/2024
+INICIO_EVOLUCION = date(2024, 1, 1)
+
+
+# Función para obtener el mes actual ("AAAA-MM"), que forma parte de la clave
+# de caché: la matriz mensual cambia al empezar un mes nuevo
+def mes_actual():
+    return date.today().strftime("%Y-%m")
+
+
+# Función para obtener las etiquetas de los meses desde enero de 2024 hasta el mes indicado
+def meses_evolucion(mes):
+    anio, numero = map(int, mes.split("-"))
+    total = max((anio - INICIO_EVOLUCION.year) * 12 + numero - INICIO_EVOLUCION.month + 1, 1)
+    return [
+        date(INICIO_EVOLUCION.year + (INICIO_EVOLUCION.month - 1 + i) // 12, (INICIO_EVOLUCION.month - 1 + i) % 12 + 1, 1).strftime("%B %Y")
+        for i in range(total)
+    ]
+
+
+# Función para generar los valores mensuales interpolados de un solo jugador
+# (valores ausentes como NaN)
+def generar_valores_mensuales(valor_inicial, valor_final, mes=None):
+    meses = meses_evolucion(mes or mes_actual())
+    inicial = np.nan if valor_inicial is None else float(valor_inicial)
+    final = np.nan if valor_final is None else float(valor_final)
+    return meses, list(inicial + (final - inicial) * np.linspace(0.0, 1.0, len(meses)))
+
+
+# Valores mensuales interpolados de todos los jugadores: una fila por jugador
+# del snapshot y una columna por mes, calculados con una sola operación
+class MatrizMensual:
+    def __init__(self, meses, valores):
+        self.meses = meses
+        self.valores = valores
+
+    @classmethod
+    def desde_snapshot(cls, snapshot, mes):
+        meses = meses_evolucion(mes)
+        inicial = snapshot.columnas[COL_VALOR_INICIAL]
+        actual = snapshot.columnas[COL_VALOR_ACTUAL]
+        avance = np.linspace(0.0, 1.0, len(meses))
+        valores = inicial[:, None] + (actual - inicial)[:, None] * avance[None, :]
+        valores.setflags(write=False)
+        return cls(meses, valores)
+
+
+# Matriz mensual de un snapshot, una por versión de datos y mes
+@por_version
+def matriz_mensual(snapshot, mes):
+    return MatrizMensual.desde_snapshot(snapshot, mes)
+
+
+# Función para obtener la evolución de varios jugadores, dados como parejas
+# (nombre, liga). Todos se localizan con una única búsqueda en el índice de
+# nombres (si un nombre se repite en una liga se toma su primera fila) y sus
+# valores salen de un solo corte de la matriz mensual. Devuelve las parejas
+# encontradas, las etiquetas de los meses y la matriz jugadores × meses.
+def evolucion_jugadores(snapshot, jugadores, mes=None):
+    jugadores = list(jugadores)
+    filas = filas_de_jugadores(snapshot, [nombre for nombre, _ in jugadores])
+    etiquetas = snapshot.a_dataframe(filas, [COL_NOMBRE, COL_LIGA])
+    primeras = {}
+    for fila, nombre, liga in zip(filas, etiquetas[COL_NOMBRE], etiquetas[COL_LIGA]):
+        primeras.setdefault((nombre, liga), fila)
+    encontrados = [jugador for jugador in jugadores if jugador in primeras]
+    filas = np.array([primeras[jugador] for jugador in encontrados], dtype="int64")
+    matriz = matriz_mensual(snapshot, mes or mes_actual())
+    return encontrados, matriz.meses, matriz.valores[filas]
@@ -0,0 +1,81 @@
+import copy
+
+import numpy as np
+
+from nucleo.cache import por_version
+from nucleo.esquema import (
+    COL_CAMBIO,
+    COL_CLUB,
+    COL_LIGA,
+    COL_NOMBRE,
+    COL_POSICION,
+    COL_VALOR_ACTUAL,
+    COL_VALOR_INICIAL,
+    COL_VARIACION_PCT,
+)
+from nucleo.seleccion import SeleccionTopN, UltimoPorLinaje, mismos_jugadores
+
+# Jugadores que se mantienen en cada clasificación
+TOP_N = 50
+CRITERIOS = [COL_CAMBIO, COL_VARIACION_PCT]
+SENTIDOS = ["subidas", "bajadas"]
+
+# Última tabla de cada fuente (linaje de datos), para refrescarla
+_ultimas_tablas = UltimoPorLinaje()
+
+
+# Clasificación de los jugadores que más suben y más bajan, por cambio
+# absoluto y por variación porcentual, en todas las ligas y en cada liga.
+# Cada clasificación es una selección parcial sobre la columna de variación
+# ya calculada en la ingesta, así que no se ordena la tabla completa.
+class TablaMovimientos:
+    def __init__(self, snapshot, n=TOP_N):
+        self.snapshot = snapshot
+        self.n = n
+        self.selecciones = {}
+        ligas = snapshot.columnas[COL_LIGA]
+        for clave, mascara in [(None, None)] + [(liga, ligas == i) for i, liga in enumerate(snapshot.categorias[COL_LIGA])]:
+            for criterio in CRITERIOS:
+                for sentido, signo in zip(SENTIDOS, (1, -1)):
+                    puntuaciones = signo * snapshot.columnas[criterio]
+                    if mascara is not None:
+                        puntuaciones = np.where(mascara, puntuaciones, np.nan)
+                    self.selecciones[(criterio, sentido, clave)] = SeleccionTopN(puntuaciones, n)
+
+    # Función para reutilizar las clasificaciones de la versión anterior
+    # cuando los jugadores son los mismos: solo se actualizan las filas cuya
+    # variación cambió. Devuelve una tabla nueva; la anterior no se modifica.
+    def refrescar(self, snapshot):
+        if not mismos_jugadores(snapshot, self.snapshot):
+            return TablaMovimientos(snapshot, self.n)
+        nueva = copy.copy(self)
+        nueva.selecciones = copy.deepcopy(self.selecciones)
+        ligas = list(snapshot.categorias[COL_LIGA])
+        for criterio in CRITERIOS:
+            antes = self.snapshot.columnas[criterio]
+            ahora = snapshot.columnas[criterio]
+            cambiadas = np.flatnonzero(~((ahora == antes) | (np.isnan(ahora) & np.isnan(antes))))
+            if len(cambiadas) == 0:
+                continue
+            ligas_cambiadas = snapshot.columnas[COL_LIGA][cambiadas]
+            for sentido, signo in zip(SENTIDOS, (1, -1)):
+                for liga in [None] + ligas:
+                    puntuaciones = signo * ahora[cambiadas]
+                    if liga is not None:
+                        puntuaciones = np.where(ligas_cambiadas == ligas.index(liga), puntuaciones, np.nan)
+                    nueva.selecciones[(criterio, sentido, liga)].actualizar(cambiadas, puntuaciones)
+        nueva.snapshot = snapshot
+        return nueva
+
+    # Tabla de una clasificación (todas las ligas si liga es None)
+    def tabla(self, criterio, sentido, liga=None, n=None):
+        filas = self.selecciones[(criterio, sentido, liga)].filas[:n]
+        columnas = [COL_NOMBRE, COL_LIGA, COL_CLUB, COL_POSICION, COL_VALOR_INICIAL, COL_VALOR_ACTUAL, COL_CAMBIO, COL_VARIACION_PCT]
+        return self.snapshot.a_dataframe(filas, [c for c in columnas if c in self.snapshot.columnas])
+
+
+# Clasificaciones de una versión de datos; si existen las de la versión
+# anterior de la misma fuente se refrescan de forma incremental
+@por_version
+def tabla_movimientos(snapshot):
+    return _ultimas_tablas.calcular(snapshot, TablaMovimientos, lambda anterior, snapshot: anterior.refrescar(snapshot))
@@ -0,0 +1,46 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Bloques en que se reparten las repeticiones de un bootstrap. Es fijo para
+# que el resultado (una semilla por bloque) no dependa de cuántos procesos lo
+# calculen.
+BLOQUES = 8
+
+# Procesos que se usan cuando no se indican. Por defecto uno, es decir, en
+# serie: dentro del servidor de Streamlit hay otros hilos (refrescos de datos,
+# vigilancia de directorios, cerrojos de nucleo.cache) y crear procesos por
+# fork desde un proceso con hilos puede dejarlos bloqueados. Solo los comandos
+# fuera de línea, como python -m nucleo.precalculo, activan el pool.
+_procesos = 1
+
+
+# Función para activar el pool de procesos en un comando fuera de línea
+# (por defecto, un proceso por CPU)
+def usar_procesos(procesos=None):
+    global _procesos
+    _procesos = procesos or os.cpu_count() or 1
+
+
+# Función para aplicar una función a una lista de tareas en un pool de procesos.
+# La función debe estar definida a nivel de módulo para poder enviarse a los
+# procesos hijos. Con un solo proceso (lo normal dentro de la aplicación), una
+# sola tarea o si el entorno no permite crear procesos, se ejecuta en serie en
+# el proceso actual.
+def mapear_en_procesos(funcion, tareas, procesos=None):
+    tareas = list(tareas)
+    procesos = min(procesos or _procesos, len(tareas))
+    if procesos <= 1:
+        return [funcion(tarea) for tarea in tareas]
+    try:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            return list(pool.map(funcion, tareas))
+    except (OSError, BrokenProcessPool):
+        return [funcion(tarea) for tarea in tareas]
+
+
+# Función para repartir un número de repeticiones en bloques, uno por proceso
+def repartir(total, partes):
+    partes = max(1, min(partes, total))
+    base, resto = divmod(total, partes)
+    return [base + (1 if i < resto else 0) for i in range(partes)]
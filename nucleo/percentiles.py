@@ -0,0 +1,48 @@
+import pandas as pd
+
+from nucleo.cache import por_version
+from nucleo.esquema import COL_LIGA, COL_POSICION
+
+# Ámbitos de comparación: dentro de la liga, dentro de la misma posición en la
+# liga y entre todas las ligas
+AMBITOS = {
+    "Liga": [COL_LIGA],
+    "Posición": [COL_LIGA, COL_POSICION],
+    "Global": [],
+}
+
+
+# Percentiles (0-100) de todos los jugadores en todas las columnas numéricas,
+# alineados con las filas del snapshot. Una matriz float32 por ámbito.
+class TablaPercentiles:
+    def __init__(self, columnas, matrices):
+        self.columnas = columnas
+        self.matrices = matrices
+
+    # Percentiles de un jugador (fila del snapshot): columnas en filas, ámbitos en columnas
+    def jugador(self, fila):
+        return pd.DataFrame(
+            {ambito: matriz[fila] for ambito, matriz in self.matrices.items()},
+            index=pd.Index(self.columnas, name="Estadística"),
+        )
+
+    # Percentiles de una columna para todos los jugadores en un ámbito
+    def columna(self, columna, ambito="Liga"):
+        return self.matrices[ambito][:, self.columnas.index(columna)]
+
+
+# Función para calcular los percentiles de un snapshot con rank() vectorizado:
+# una sola llamada por ámbito ordena todas las columnas de todos los grupos
+@por_version
+def tabla_percentiles(snapshot):
+    columnas = snapshot.columnas_numericas()
+    valores = pd.DataFrame({columna: snapshot.columnas[columna] for columna in columnas})
+    matrices = {}
+    for ambito, claves in AMBITOS.items():
+        if claves:
+            grupos = [snapshot.columnas[clave] for clave in claves]
+            rangos = valores.groupby(grupos).rank(pct=True, method="average")
+        else:
+            rangos = valores.rank(pct=True, method="average")
+        matrices[ambito] = (rangos.to_numpy(dtype="float32") * 100)
+    return TablaPercentiles(columnas, matrices)
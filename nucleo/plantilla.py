@@ -0,0 +1,151 @@
+import heapq
+
+import numpy as np
+
+from nucleo.esquema import (
+    COL_CLUB,
+    COL_LIGA,
+    COL_NOMBRE,
+    COL_POSICION,
+    COL_VALOR_ACTUAL,
+    grupo_posicion,
+)
+
+FORMACIONES = {
+    "4-3-3": {"Portero": 1, "Defensa": 4, "Centrocampista": 3, "Delantero": 3},
+    "4-4-2": {"Portero": 1, "Defensa": 4, "Centrocampista": 4, "Delantero": 2},
+    "3-5-2": {"Portero": 1, "Defensa": 3, "Centrocampista": 5, "Delantero": 2},
+}
+# Número de tramos en que se discretiza el presupuesto. Los costes se
+# redondean hacia arriba, así que toda plantilla devuelta cabe en el presupuesto.
+RESOLUCION = 1000
+
+
+# Plantilla resultante: filas elegidas, puntuación total y coste total
+class Plantilla:
+    def __init__(self, filas, puntuacion, coste):
+        self.filas = filas
+        self.puntuacion = puntuacion
+        self.coste = coste
+
+
+# Función para descartar jugadores dominados: si hay al menos k jugadores del
+# mismo grupo que cuestan lo mismo o menos y puntúan igual o más, el jugador
+# nunca es necesario para elegir k. Se recorre por coste con un heap de los k
+# mejores vistos (O(n log k)).
+def _podar(costes, puntuaciones, k):
+    orden = np.lexsort((-puntuaciones, costes))
+    mejores = []
+    conservados = []
+    for fila in orden:
+        puntuacion = puntuaciones[fila]
+        if len(mejores) < k or puntuacion > mejores[0]:
+            conservados.append(fila)
+        if len(mejores) < k:
+            heapq.heappush(mejores, puntuacion)
+        elif puntuacion > mejores[0]:
+            heapq.heapreplace(mejores, puntuacion)
+    return np.array(conservados, dtype="int64")
+
+
+# Programación dinámica de un grupo de posición: mejor puntuación eligiendo
+# exactamente k jugadores con coste (en tramos) como máximo b, para todo b.
+# Cada jugador actualiza la tabla (k+1) × (B+1) con operaciones vectorizadas y
+# se guardan las decisiones para reconstruir la elección.
+def _mochila_grupo(costes, puntuaciones, k, tramos):
+    tabla = np.full((k + 1, tramos + 1), -np.inf)
+    tabla[0, :] = 0.0
+    decisiones = np.zeros((len(costes), k + 1, tramos + 1), dtype=bool)
+    for i, (coste, puntuacion) in enumerate(zip(costes, puntuaciones)):
+        if coste > tramos:
+            continue
+        for c in range(min(k, i + 1), 0, -1):
+            candidato = tabla[c - 1, :tramos + 1 - coste] + puntuacion
+            mejora = candidato > tabla[c, coste:]
+            tabla[c, coste:][mejora] = candidato[mejora]
+            decisiones[i, c, coste:] = mejora
+    return tabla[k], decisiones
+
+
+# Función para reconstruir los jugadores elegidos de un grupo
+def _reconstruir(decisiones, costes, k, b):
+    elegidos = []
+    for i in range(len(costes) - 1, -1, -1):
+        if k == 0:
+            break
+        if decisiones[i, k, b]:
+            elegidos.append(i)
+            b -= costes[i]
+            k -= 1
+    return elegidos
+
+
+# Función para elegir la plantilla de mayor puntuación total con exactamente
+# formacion[grupo] jugadores de cada grupo y coste total <= presupuesto.
+# Devuelve None si no existe ninguna plantilla que cumpla las restricciones.
+def optimizar_plantilla(costes, puntuaciones, grupos, formacion, presupuesto, resolucion=RESOLUCION):
+    costes = np.asarray(costes, dtype="float64")
+    puntuaciones = np.asarray(puntuaciones, dtype="float64")
+    grupos = np.asarray(grupos, dtype=object)
+    unidad = max(presupuesto / resolucion, 1.0)
+    tramos = int(presupuesto // unidad)
+    validos = np.isfinite(costes) & np.isfinite(puntuaciones) & (costes <= presupuesto)
+
+    # Mejor puntuación acumulada por presupuesto al ir añadiendo grupos
+    total = np.zeros(tramos + 1)
+    resultados_grupo = []
+    for grupo, k in formacion.items():
+        if k == 0:
+            continue
+        filas = np.flatnonzero(validos & (grupos == grupo))
+        if len(filas) < k:
+            return None
+        filas = filas[_podar(costes[filas], puntuaciones[filas], k)]
+        costes_grupo = np.ceil(costes[filas] / unidad - 1e-9).astype("int64")
+        mejor, decisiones = _mochila_grupo(costes_grupo, puntuaciones[filas], k, tramos)
+
+        # Convolución max-plus: presupuesto b repartido entre lo acumulado y el grupo
+        nuevo = np.full(tramos + 1, -np.inf)
+        reparto = np.zeros(tramos + 1, dtype="int64")
+        for b in range(tramos + 1):
+            candidatos = total[b::-1] + mejor[:b + 1]
+            j = int(np.argmax(candidatos))
+            nuevo[b], reparto[b] = candidatos[j], j
+        total = nuevo
+        resultados_grupo.append((filas, costes_grupo, decisiones, k, reparto))
+
+    if not np.isfinite(total[tramos]):
+        return None
+
+    elegidas = []
+    b = tramos
+    for filas, costes_grupo, decisiones, k, reparto in reversed(resultados_grupo):
+        b_grupo = int(reparto[b])
+        elegidas.extend(filas[_reconstruir(decisiones, costes_grupo, k, b_grupo)])
+        b -= b_grupo
+    elegidas = np.array(sorted(elegidas), dtype="int64")
+    return Plantilla(elegidas, float(puntuaciones[elegidas].sum()), float(costes[elegidas].sum()))
+
+
+# Función para obtener el grupo de posición de cada fila del snapshot
+# (clasificando una vez cada etiqueta del diccionario, no cada jugador)
+def grupos_de_posicion(snapshot):
+    posiciones = np.array([grupo_posicion(p) for p in snapshot.categorias[COL_POSICION]] + [None], dtype=object)
+    return posiciones[snapshot.columnas[COL_POSICION]]
+
+
+# Función para construir la mejor plantilla de un snapshot. La puntuación es un
+# array alineado con las filas (p. ej. el valor estimado por el modelo) y el
+# coste, el valor de mercado actual.
+def plantilla_optima(snapshot, puntuaciones, presupuesto, formacion=FORMACIONES["4-3-3"], ligas=None):
+    grupos = grupos_de_posicion(snapshot)
+    if ligas is not None:
+        codigos = snapshot.codigos(COL_LIGA, ligas)
+        grupos = np.where(np.isin(snapshot.columnas[COL_LIGA], codigos), grupos, None)
+    plantilla = optimizar_plantilla(snapshot.columnas[COL_VALOR_ACTUAL], puntuaciones, grupos, formacion, presupuesto)
+    if plantilla is None:
+        return None, None
+    tabla = snapshot.a_dataframe(plantilla.filas, [COL_NOMBRE, COL_LIGA, COL_CLUB, COL_POSICION, COL_VALOR_ACTUAL])
+    tabla.insert(3, "Grupo", grupos[plantilla.filas])
+    tabla["Puntuación"] = np.asarray(puntuaciones)[plantilla.filas]
+    return plantilla, tabla
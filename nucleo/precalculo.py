@@ -0,0 +1,212 @@
+import argparse
+import glob
+import json
+import os
+import pickle
+import time
+from datetime import datetime
+
+from nucleo.arquetipos import arquetipos
+from nucleo.cache import resultados_version
+from nucleo.carga import FUENTES, leer_ligas
+from nucleo.clubes import plantillas_clubes
+from nucleo.columnar import SnapshotColumnar
+from nucleo.compartido import congelar_ligas
+from nucleo.contrastes import contrastes_ligas
+from nucleo.correlaciones import columnas_estadisticas, tabla_correlaciones
+from nucleo.cubo import cubo_mercado
+from nucleo.estadisticas import servicio_estadisticas
+from nucleo.graficos import figura_violin_ligas
+from nucleo.mensual import matriz_mensual, mes_actual
+from nucleo.movimientos import tabla_movimientos
+from nucleo.paralelo import mapear_en_procesos, usar_procesos
+from nucleo.percentiles import tabla_percentiles
+from nucleo.prediccion import predicciones
+from nucleo.recomendaciones import escaner_oportunidades
+from nucleo.similares import indice_similitud
+
+RUTA_CACHE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+# Indicador de que el precálculo terminó: se escribe el último, con la versión
+# de datos de cada fuente, y las aplicaciones solo usan la caché si existe
+ARCHIVO_LISTO = "listo.json"
+
+
+# Precálculo de una fuente cargado desde disco: las ligas leídas (sin
+# congelar), el snapshot con sus índices y los resultados derivados por clave
+class Precalculo:
+    def __init__(self, fuente, ligas, snapshot, resultados):
+        self.fuente = fuente
+        self.ligas = ligas
+        self.snapshot = snapshot
+        self.resultados = resultados
+
+
+# Función para obtener la ruta de un archivo de la caché. Los nombres incluyen
+# la versión de datos, así que un archivo escrito nunca se modifica.
+def _ruta(directorio, fuente, version, tipo):
+    return os.path.join(directorio, f"{fuente}-{version}-{tipo}.pkl")
+
+
+# Función para escribir un archivo de forma atómica (temporal + renombrado)
+def escribir_atomico(ruta, contenido):
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(contenido)
+    os.replace(temporal, ruta)
+
+
+# Cálculos derivados que piden las aplicaciones, con los mismos argumentos con
+# que los piden: la clave de por_version depende de ellos. Los que necesitan
+# estadísticas de rendimiento solo se calculan si el snapshot las tiene.
+def artefactos(snapshot, ligas):
+    tareas = [
+        (servicio_estadisticas, (), {}),
+        (tabla_percentiles, (), {}),
+        (tabla_movimientos, (), {}),
+        (cubo_mercado, (), {}),
+        (plantillas_clubes, (), {}),
+        (matriz_mensual, (mes_actual(),), {}),
+        (figura_violin_ligas, (ligas,), {}),
+        (figura_violin_ligas, (ligas,), {"mostrar_leyenda": True}),
+    ]
+    if len(ligas) >= 2:
+        tareas.append((contrastes_ligas, ligas[:2], {}))
+    if columnas_estadisticas(snapshot):
+        tareas += [
+            (predicciones, (), {}),
+            (escaner_oportunidades, (), {}),
+            (tabla_correlaciones, (), {}),
+            (arquetipos, (), {}),
+            (indice_similitud, ("coseno",), {}),
+            (indice_similitud, ("euclidea",), {}),
+        ]
+    return tareas
+
+
+# Función para construir el snapshot de unas ligas (igual que las aplicaciones,
+# a partir de los datos congelados), sus índices y todos los cálculos derivados
+def precalcular(ligas):
+    snapshot = SnapshotColumnar.desde_ligas(congelar_ligas(ligas))
+    for columna in snapshot.columnas:
+        snapshot.indice(columna)
+    for funcion, args, kwargs in artefactos(snapshot, tuple(ligas)):
+        funcion(snapshot, *args, **kwargs)
+    return snapshot, resultados_version(snapshot.version)
+
+
+# Función para precalcular una fuente y guardarla en disco. Se ejecuta en un
+# proceso hijo por fuente; los errores (p. ej. de descarga) se devuelven en
+# lugar de lanzarse para no perder las demás fuentes.
+def precalcular_fuente(tarea):
+    fuente, rutas, directorio = tarea
+    inicio = time.perf_counter()
+    try:
+        ligas = leer_ligas(rutas)
+        snapshot, resultados = precalcular(ligas)
+        escribir_atomico(_ruta(directorio, fuente, snapshot.version, "ligas"), pickle.dumps(ligas))
+        escribir_atomico(
+            _ruta(directorio, fuente, snapshot.version, "derivados"),
+            pickle.dumps({"snapshot": snapshot, "resultados": resultados}),
+        )
+    except Exception as error:
+        return {"fuente": fuente, "error": f"{type(error).__name__}: {error}"}
+    return {
+        "fuente": fuente,
+        "version": snapshot.version,
+        "jugadores": len(snapshot),
+        "artefactos": len(resultados),
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+# Función para leer el indicador de caché lista: {"fuentes": {fuente: versión},
+# "creado": fecha} o None si el precálculo no ha terminado nunca
+def cache_lista(directorio=RUTA_CACHE):
+    try:
+        with open(os.path.join(directorio, ARCHIVO_LISTO), encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return None
+
+
+# Función para cargar el precálculo de una fuente. Devuelve None si la caché no
+# está lista, no incluye la fuente o sus archivos no se pueden leer, y entonces
+# la aplicación sigue el camino normal (descarga y cálculo bajo demanda).
+def cargar_precalculo(fuente, directorio=RUTA_CACHE, derivados=True):
+    lista = cache_lista(directorio)
+    version = (lista or {}).get("fuentes", {}).get(fuente)
+    if version is None:
+        return None
+    try:
+        with open(_ruta(directorio, fuente, version, "ligas"), "rb") as archivo:
+            ligas = pickle.load(archivo)
+        snapshot, resultados = None, {}
+        if derivados:
+            with open(_ruta(directorio, fuente, version, "derivados"), "rb") as archivo:
+                contenido = pickle.load(archivo)
+            snapshot, resultados = contenido["snapshot"], contenido["resultados"]
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, AttributeError, ImportError):
+        return None
+    return Precalculo(fuente, ligas, snapshot, resultados)
+
+
+# Función para precalcular varias fuentes en paralelo (un proceso por fuente,
+# si se indican procesos o se activó el pool con usar_procesos) y marcar la
+# caché como lista. Las fuentes que fallan no entran en el indicador; las que
+# ya estaban precalculadas de antes se conservan.
+def precalcular_fuentes(fuentes, directorio=RUTA_CACHE, procesos=None):
+    os.makedirs(directorio, exist_ok=True)
+    informes = mapear_en_procesos(
+        precalcular_fuente,
+        [(fuente, FUENTES[fuente], directorio) for fuente in fuentes],
+        procesos,
+    )
+    versiones = dict((cache_lista(directorio) or {}).get("fuentes", {}))
+    versiones.update({informe["fuente"]: informe["version"] for informe in informes if "version" in informe})
+    if versiones:
+        contenido = json.dumps({"creado": datetime.now().isoformat(timespec="seconds"), "fuentes": versiones}, indent=2)
+        escribir_atomico(os.path.join(directorio, ARCHIVO_LISTO), contenido.encode("utf-8"))
+
+    # Se borran los archivos de versiones que ya no están en el indicador
+    for ruta in glob.glob(os.path.join(directorio, "*-*-*.pkl")):
+        fuente, version = os.path.basename(ruta).rsplit("-", 2)[:2]
+        if versiones.get(fuente) != version:
+            os.remove(ruta)
+    return informes
+
+
+# Precálculo antes de servir la aplicación: python -m nucleo.precalculo [--fuente F ...]
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Precalcula los datos y cálculos derivados de las aplicaciones.")
+    parser.add_argument("--fuente", action="append", choices=list(FUENTES), default=[],
+                        help="Fuente a precalcular (por defecto, todas)")
+    parser.add_argument("--directorio", default=RUTA_CACHE, help="Directorio de la caché")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos en paralelo")
+    parser.add_argument("--comprobar", action="store_true",
+                        help="Solo comprobar si la caché está lista (código 1 si no lo está)")
+    args = parser.parse_args(argumentos)
+
+    if args.comprobar:
+        lista = cache_lista(args.directorio)
+        if lista is None:
+            print("La caché no está lista")
+            raise SystemExit(1)
+        print(f"Caché lista desde {lista['creado']}: {', '.join(lista['fuentes'])}")
+        return
+
+    # Fuera del servidor sí se usan procesos: para las fuentes y, dentro de
+    # cada una, para los bootstrap de correlaciones y contrastes
+    usar_procesos(args.procesos)
+    informes = precalcular_fuentes(args.fuente or list(FUENTES), args.directorio)
+    for informe in informes:
+        if "error" in informe:
+            print(f"{informe['fuente']}: error ({informe['error']})")
+        else:
+            print(f"{informe['fuente']}: {informe['jugadores']} jugadores, {informe['artefactos']} cálculos "
+                  f"derivados en {informe['segundos']:.1f} s (versión {informe['version']})")
+    if any("error" in informe for informe in informes):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+from nucleo.cache import por_version
+from nucleo.correlaciones import columnas_estadisticas
+from nucleo.esquema import COL_EDAD, COL_LIGA, COL_POSICION, COL_VALOR_ACTUAL
+
+RUTA_MODELO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "modelos", "valor_mercado.json")
+# Regularización L2 de la regresión ridge
+ALFA = 1.0
+# Dimensiones categóricas que entran al modelo como variables indicadoras
+CATEGORICAS = [COL_LIGA, COL_POSICION]
+# Aviso que muestran las aplicaciones cuando no hay modelo que aplicar
+MENSAJE_SIN_MODELO = "Modelo no disponible; ejecute python -m nucleo.prediccion"
+
+
+# Modelo de regresión ridge sobre log(valor de mercado). Las estadísticas se
+# estandarizan con las medias y escalas del entrenamiento y la liga y la
+# posición se codifican como variables indicadoras. Se entrena fuera de la
+# aplicación, se guarda en JSON y la inferencia es un único producto matricial.
+class ModeloValor:
+    def __init__(self, columnas, medias, escalas, categorias, coeficientes, intercepto, alfa=ALFA):
+        self.columnas = list(columnas)
+        self.medias = np.asarray(medias, dtype="float64")
+        self.escalas = np.asarray(escalas, dtype="float64")
+        self.categorias = {nombre: list(valores) for nombre, valores in categorias.items()}
+        self.coeficientes = np.asarray(coeficientes, dtype="float64")
+        self.intercepto = float(intercepto)
+        self.alfa = alfa
+
+    # Función para construir la matriz de diseño de un snapshot. Las columnas o
+    # categorías que el snapshot no tenga se dejan en 0 (la media o la categoría base).
+    def _diseno(self, snapshot):
+        n = len(snapshot)
+        partes = []
+        for columna, media, escala in zip(self.columnas, self.medias, self.escalas):
+            valores = snapshot.columnas.get(columna)
+            if valores is None or snapshot.es_categorica(columna):
+                partes.append(np.zeros(n))
+            else:
+                partes.append(np.nan_to_num((valores - media) / escala, nan=0.0))
+        for nombre, valores in self.categorias.items():
+            if nombre not in snapshot.categorias:
+                partes.extend(np.zeros(n) for _ in valores)
+                continue
+            etiquetas = np.append(snapshot.categorias[nombre], None)[snapshot.columnas[nombre]]
+            partes.extend((etiquetas == valor).astype("float64") for valor in valores)
+        return np.column_stack(partes) if partes else np.empty((n, 0))
+
+    @classmethod
+    def entrenar(cls, snapshot, alfa=ALFA):
+        # La edad acompaña a las estadísticas de rendimiento, pero por sí sola
+        # no basta para entrenar el modelo
+        columnas = columnas_estadisticas(snapshot)
+        if columnas and COL_EDAD in snapshot.columnas:
+            columnas.append(COL_EDAD)
+        medias = np.array([np.nanmean(snapshot.columnas[c]) for c in columnas])
+        escalas = np.array([np.nanstd(snapshot.columnas[c]) for c in columnas])
+        escalas[~(escalas > 0)] = 1.0
+        categorias = {
+            nombre: list(snapshot.categorias[nombre])
+            for nombre in CATEGORICAS
+            if nombre in snapshot.categorias and len(snapshot.categorias[nombre]) > 1
+        }
+        modelo = cls(columnas, medias, escalas, categorias, np.zeros(0), 0.0, alfa)
+
+        y = snapshot.columnas[COL_VALOR_ACTUAL]
+        validas = y > 0
+        if not validas.any():
+            raise ValueError("No hay jugadores con valor de mercado para entrenar el modelo")
+        X = modelo._diseno(snapshot)[validas]
+        y = np.log(y[validas])
+        media_x = X.mean(axis=0)
+        media_y = y.mean()
+        Xc = X - media_x
+        coeficientes = np.linalg.solve(Xc.T @ Xc + alfa * np.eye(X.shape[1]), Xc.T @ (y - media_y))
+        modelo.coeficientes = coeficientes
+        modelo.intercepto = media_y - media_x @ coeficientes
+        return modelo
+
+    # Valor estimado (€) de todos los jugadores del snapshot de una vez
+    def predecir(self, snapshot):
+        return np.exp(self._diseno(snapshot) @ self.coeficientes + self.intercepto)
+
+    def guardar(self, ruta=RUTA_MODELO):
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({
+                "columnas": self.columnas,
+                "medias": self.medias.tolist(),
+                "escalas": self.escalas.tolist(),
+                "categorias": self.categorias,
+                "coeficientes": self.coeficientes.tolist(),
+                "intercepto": self.intercepto,
+                "alfa": self.alfa,
+            }, archivo, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def cargar(cls, ruta=RUTA_MODELO):
+        with open(ruta, encoding="utf-8") as archivo:
+            return cls(**json.load(archivo))
+
+
+# Resultado de la inferencia por lotes, alineado con las filas del snapshot
+class Predicciones:
+    def __init__(self, estimado, actual):
+        self.estimado = estimado
+        # Residuo: positivo si el jugador vale más de lo que indican sus estadísticas
+        self.residuo = actual - estimado
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.residuo_relativo = np.where(estimado > 0, self.residuo / estimado * 100, np.nan)
+
+
+# Función para cargar el modelo entrenado fuera de línea. El modelo nunca se
+# entrena durante una petición: devuelve None si no hay modelo guardado o si
+# el snapshot no tiene las estadísticas con que se entrenó (p. ej. una fuente
+# sin estadísticas), en lugar de aplicarlo con esas columnas vacías.
+def cargar_modelo(snapshot, ruta=RUTA_MODELO):
+    try:
+        modelo = ModeloValor.cargar(ruta)
+    except (OSError, ValueError, TypeError):
+        return None
+    if not modelo.columnas or any(
+        columna not in snapshot.columnas or snapshot.es_categorica(columna) for columna in modelo.columnas
+    ):
+        return None
+    return modelo
+
+
+# Predicción del valor de todos los jugadores, cacheada por versión de datos.
+# Devuelve None si no hay un modelo aplicable (ver cargar_modelo).
+@por_version
+def predicciones(snapshot, ruta=RUTA_MODELO):
+    modelo = cargar_modelo(snapshot, ruta)
+    if modelo is None:
+        return None
+    return Predicciones(modelo.predecir(snapshot), snapshot.columnas[COL_VALOR_ACTUAL])
+
+
+# Entrenamiento fuera de línea: python -m nucleo.prediccion [--salida RUTA] [--csv LIGA=RUTA ...]
+def main(argumentos=None):
+    from nucleo.carga import FUENTES, leer_ligas
+    from nucleo.columnar import SnapshotColumnar
+
+    parser = argparse.ArgumentParser(description="Entrena el modelo de valor de mercado.")
+    parser.add_argument("--salida", default=RUTA_MODELO, help="Ruta del modelo JSON")
+    parser.add_argument("--csv", action="append", default=[], metavar="LIGA=RUTA",
+                        help="CSV de una liga (por defecto, los CSV con estadísticas del proyecto)")
+    parser.add_argument("--alfa", type=float, default=ALFA, help="Regularización L2")
+    args = parser.parse_args(argumentos)
+
+    fuentes = dict(valor.split("=", 1) for valor in args.csv) if args.csv else FUENTES["estadisticas"]
+    snapshot = SnapshotColumnar.desde_ligas(leer_ligas(fuentes))
+    modelo = ModeloValor.entrenar(snapshot, args.alfa)
+    modelo.guardar(args.salida)
+
+    resultado = Predicciones(modelo.predecir(snapshot), snapshot.columnas[COL_VALOR_ACTUAL])
+    validos = snapshot.columnas[COL_VALOR_ACTUAL] > 0
+    error = np.nanmedian(np.abs(resultado.residuo_relativo[validos]))
+    print(f"Modelo guardado en {args.salida} ({len(modelo.columnas)} estadísticas, "
+          f"{int(validos.sum())} jugadores, error relativo mediano {error:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
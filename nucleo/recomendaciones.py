@@ -0,0 +1,86 @@
+import copy
+
+import numpy as np
+
+from nucleo.cache import por_version
+from nucleo.esquema import COL_CLUB, COL_EDAD, COL_LIGA, COL_NOMBRE, COL_POSICION, COL_VALOR_ACTUAL
+from nucleo.prediccion import predicciones
+from nucleo.seleccion import SeleccionTopN, UltimoPorLinaje, mismos_jugadores
+
+# Jugadores que se mantienen en cada ranking
+TOP_N = 50
+TIPOS = ["infravalorados", "sobrevalorados"]
+
+# Último escáner de cada fuente (linaje de datos), para refrescarlo
+_ultimos_escaneres = UltimoPorLinaje()
+
+
+# Función para calcular la brecha entre valor estimado y valor actual en
+# escala logarítmica: positiva si el jugador vale menos de lo que indican sus
+# estadísticas (infravalorado) y negativa si vale más (sobrevalorado)
+def brecha_valor(snapshot, estimacion):
+    actual = snapshot.columnas[COL_VALOR_ACTUAL]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        brecha = np.log(estimacion.estimado) - np.log(actual)
+    return np.where(actual > 0, brecha, np.nan)
+
+
+# Escáner de oportunidades de mercado: mantiene los rankings de infravalorados
+# y sobrevalorados en todas las ligas y en cada liga por separado
+class EscanerOportunidades:
+    def __init__(self, snapshot, brecha, n=TOP_N):
+        self.snapshot = snapshot
+        self.brecha = brecha
+        self.n = n
+        self.selecciones = {}
+        ligas = snapshot.columnas[COL_LIGA]
+        for clave, mascara in [(None, None)] + [(liga, ligas == i) for i, liga in enumerate(snapshot.categorias[COL_LIGA])]:
+            for tipo, signo in zip(TIPOS, (1, -1)):
+                puntuaciones = signo * brecha if mascara is None else np.where(mascara, signo * brecha, np.nan)
+                self.selecciones[(tipo, clave)] = SeleccionTopN(puntuaciones, n)
+
+    # Función para reutilizar los rankings de la versión anterior cuando los
+    # jugadores son los mismos: solo se actualizan las filas cuya brecha cambió.
+    # Devuelve un escáner nuevo; el de la versión anterior no se modifica.
+    def refrescar(self, snapshot, brecha):
+        if not mismos_jugadores(snapshot, self.snapshot):
+            return EscanerOportunidades(snapshot, brecha, self.n)
+        nuevo = copy.copy(self)
+        nuevo.selecciones = copy.deepcopy(self.selecciones)
+        cambiadas = np.flatnonzero(~((brecha == self.brecha) | (np.isnan(brecha) & np.isnan(self.brecha))))
+        ligas = snapshot.columnas[COL_LIGA][cambiadas]
+        for (tipo, liga), seleccion in nuevo.selecciones.items():
+            signo = 1 if tipo == "infravalorados" else -1
+            puntuaciones = signo * brecha[cambiadas]
+            if liga is not None:
+                puntuaciones = np.where(ligas == list(snapshot.categorias[COL_LIGA]).index(liga), puntuaciones, np.nan)
+            seleccion.actualizar(cambiadas, puntuaciones)
+        nuevo.snapshot = snapshot
+        nuevo.brecha = brecha
+        return nuevo
+
+    # Tabla de un ranking (todas las ligas si liga es None)
+    def tabla(self, tipo, liga=None, n=None):
+        filas = self.selecciones[(tipo, liga)].filas[:n]
+        columnas = [COL_NOMBRE, COL_LIGA, COL_CLUB, COL_POSICION, COL_EDAD, COL_VALOR_ACTUAL]
+        tabla = self.snapshot.a_dataframe(filas, [c for c in columnas if c in self.snapshot.columnas])
+        estimado = predicciones(self.snapshot).estimado[filas]
+        tabla["Valor Estimado"] = estimado
+        tabla["Diferencia (%)"] = (estimado / self.snapshot.columnas[COL_VALOR_ACTUAL][filas] - 1) * 100
+        return tabla
+
+
+# Escáner de una versión de datos; si existe el de la versión anterior de la
+# misma fuente se refresca de forma incremental en lugar de recalcular los
+# rankings. Devuelve None si no hay modelo de valor que aplicar.
+@por_version
+def escaner_oportunidades(snapshot):
+    estimacion = predicciones(snapshot)
+    if estimacion is None:
+        return None
+    brecha = brecha_valor(snapshot, estimacion)
+    return _ultimos_escaneres.calcular(
+        snapshot,
+        lambda snapshot: EscanerOportunidades(snapshot, brecha),
+        lambda anterior, snapshot: anterior.refrescar(snapshot, brecha),
+    )
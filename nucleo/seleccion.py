@@ -0,0 +1,99 @@
+import hashlib
+import heapq
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from nucleo.esquema import COL_LIGA, COL_NOMBRE
+
+# Linajes de datos cuyo último resultado se conserva para refrescarlo
+MAX_LINAJES = 4
+
+
+# Selección de las N filas con mayor puntuación. La selección inicial es
+# parcial (argpartition) y las actualizaciones posteriores solo mezclan con un
+# heap las filas que cambian con el top actual, salvo que un miembro del top
+# empeore, en cuyo caso otra fila podría entrar y se vuelve a seleccionar todo.
+class SeleccionTopN:
+    def __init__(self, puntuaciones, n):
+        self.n = n
+        self.puntuaciones = np.array(puntuaciones, dtype="float64")
+        self.puntuaciones[np.isnan(self.puntuaciones)] = -np.inf
+        self._seleccionar()
+
+    def _seleccionar(self):
+        k = min(self.n, len(self.puntuaciones))
+        if k == 0:
+            self.filas = np.empty(0, dtype="int64")
+            return
+        filas = np.argpartition(-self.puntuaciones, k - 1)[:k]
+        filas = filas[np.argsort(-self.puntuaciones[filas], kind="stable")]
+        self.filas = filas[np.isfinite(self.puntuaciones[filas])]
+
+    def actualizar(self, filas, puntuaciones):
+        filas = np.asarray(filas, dtype="int64")
+        puntuaciones = np.asarray(puntuaciones, dtype="float64")
+        puntuaciones = np.where(np.isnan(puntuaciones), -np.inf, puntuaciones)
+        anteriores = self.puntuaciones[filas]
+        self.puntuaciones[filas] = puntuaciones
+
+        en_top = np.isin(filas, self.filas)
+        if (en_top & (puntuaciones < anteriores)).any():
+            self._seleccionar()
+            return self
+        candidatas = set(self.filas.tolist()) | set(filas[np.isfinite(puntuaciones)].tolist())
+        mejores = heapq.nlargest(self.n, candidatas, key=lambda fila: (self.puntuaciones[fila], -fila))
+        self.filas = np.array(mejores, dtype="int64")
+        return self
+
+
+# Función para saber si dos snapshots tienen los mismos jugadores en las
+# mismas filas, condición para actualizar una selección de forma incremental
+def mismos_jugadores(snapshot, anterior):
+    return (
+        len(snapshot) == len(anterior)
+        and np.array_equal(snapshot.columnas[COL_NOMBRE], anterior.columnas[COL_NOMBRE])
+        and np.array_equal(snapshot.categorias[COL_NOMBRE], anterior.categorias[COL_NOMBRE])
+        and np.array_equal(snapshot.columnas[COL_LIGA], anterior.columnas[COL_LIGA])
+    )
+
+
+# Función para identificar el linaje de un snapshot: los jugadores y ligas de
+# cada fila. Las versiones sucesivas de una misma fuente con los mismos
+# jugadores comparten linaje; fuentes distintas no.
+def linaje(snapshot):
+    resumen = hashlib.blake2b(digest_size=12)
+    for columna in (COL_NOMBRE, COL_LIGA):
+        resumen.update(np.ascontiguousarray(snapshot.columnas[columna]).tobytes())
+        resumen.update("\x1f".join(map(str, snapshot.categorias[columna])).encode("utf-8"))
+    return resumen.hexdigest()
+
+
+# Último resultado calculado de cada linaje, para construir el de una versión
+# nueva de forma incremental a partir del de la anterior. Cada fuente tiene su
+# propio linaje, así que varias fuentes que se alternan no se pisan; el acceso
+# está protegido por un cerrojo y solo se guardan los MAX_LINAJES más recientes.
+# `clave` calcula el linaje de un snapshot (por defecto, linaje()).
+class UltimoPorLinaje:
+    def __init__(self, maximo=MAX_LINAJES, clave=linaje):
+        self.maximo = maximo
+        self.clave = clave
+        self._ultimos = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Función para obtener el resultado de un snapshot: crear(snapshot) si su
+    # linaje no tiene resultado anterior o refrescar(anterior, snapshot) si lo
+    # tiene. Los resultados no se modifican, así que dos versiones del mismo
+    # linaje pueden calcularse a la vez sin coordinarse.
+    def calcular(self, snapshot, crear, refrescar):
+        clave = self.clave(snapshot)
+        with self._lock:
+            anterior = self._ultimos.get(clave)
+        resultado = crear(snapshot) if anterior is None else refrescar(anterior, snapshot)
+        with self._lock:
+            self._ultimos[clave] = resultado
+            self._ultimos.move_to_end(clave)
+            while len(self._ultimos) > self.maximo:
+                self._ultimos.popitem(last=False)
+        return resultado
@@ -0,0 +1,114 @@
+import numpy as np
+
+from nucleo.cache import por_version
+from nucleo.correlaciones import columnas_estadisticas
+from nucleo.esquema import COL_CLUB, COL_LIGA, COL_NOMBRE, COL_POSICION, COL_VALOR_ACTUAL
+
+METRICAS = ["coseno", "euclidea"]
+# Filas procesadas por multiplicación de matrices en la búsqueda exacta
+TAMANO_BLOQUE = 32_768
+# Límites para usar el KD-tree con la distancia euclídea: al menos FILAS_ARBOL
+# filas (con menos, construir el árbol cuesta más de lo que ahorra) y como
+# mucho DIMENSIONES_ARBOL columnas (con más, el árbol acaba visitando casi
+# todas las hojas y es más lento que la búsqueda por bloques)
+FILAS_ARBOL = 50_000
+DIMENSIONES_ARBOL = 10
+
+
+# Función para construir la matriz de características: cada estadística se
+# estandariza (media 0, desviación 1) y los valores ausentes quedan en la media
+def matriz_estandarizada(snapshot, columnas):
+    matriz = np.column_stack([snapshot.columnas[c] for c in columnas]).astype("float32")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        matriz = (matriz - np.nanmean(matriz, axis=0)) / np.nanstd(matriz, axis=0)
+    return np.nan_to_num(matriz, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+# Índice de vecinos más cercanos sobre la matriz estandarizada. La búsqueda
+# exacta recorre la matriz por bloques con un producto matricial y selección
+# parcial (argpartition) en cada bloque. Para la distancia euclídea puede usarse
+# además un KD-tree de scipy si está instalado.
+class IndiceSimilitud:
+    def __init__(self, matriz, metrica="coseno", usar_arbol=False):
+        if metrica not in METRICAS:
+            raise ValueError(f"Métrica desconocida: {metrica}")
+        self.metrica = metrica
+        if metrica == "coseno":
+            normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+            matriz = np.divide(matriz, normas, out=np.zeros_like(matriz), where=normas > 0)
+        self.matriz = matriz
+        self._normas2 = np.einsum("ij,ij->i", matriz, matriz)
+        self._arbol = None
+        if usar_arbol and metrica == "euclidea":
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                cKDTree = None
+            if cKDTree is not None:
+                self._arbol = cKDTree(matriz)
+
+    def __len__(self):
+        return len(self.matriz)
+
+    # Puntuación de un bloque frente a la consulta: mayor es más parecido
+    def _puntuar(self, inicio, fin, vector):
+        productos = self.matriz[inicio:fin] @ vector
+        if self.metrica == "coseno":
+            return productos
+        return -(self._normas2[inicio:fin] - 2 * productos + vector @ vector)
+
+    # Los k jugadores más parecidos a la fila indicada (excluida ella misma).
+    # Devuelve las filas ordenadas y su similitud (coseno) o distancia (euclídea).
+    def vecinos(self, fila, k=10):
+        vector = self.matriz[fila]
+        k = min(k, len(self) - 1)
+        if k <= 0:
+            return np.empty(0, dtype="int64"), np.empty(0, dtype="float32")
+
+        if self._arbol is not None:
+            distancias, filas = self._arbol.query(vector, k=k + 1)
+            seleccion = filas != fila
+            return filas[seleccion][:k], distancias[seleccion][:k]
+
+        candidatos = []
+        puntuaciones = []
+        for inicio in range(0, len(self), TAMANO_BLOQUE):
+            fin = min(inicio + TAMANO_BLOQUE, len(self))
+            bloque = self._puntuar(inicio, fin, vector)
+            if inicio <= fila < fin:
+                bloque[fila - inicio] = -np.inf
+            mejores = np.argpartition(-bloque, k - 1)[:k] if len(bloque) > k else np.arange(len(bloque))
+            candidatos.append(mejores + inicio)
+            puntuaciones.append(bloque[mejores])
+        candidatos = np.concatenate(candidatos)
+        puntuaciones = np.concatenate(puntuaciones)
+        orden = np.argsort(-puntuaciones, kind="stable")[:k]
+        filas, puntuaciones = candidatos[orden], puntuaciones[orden]
+        if self.metrica == "euclidea":
+            puntuaciones = np.sqrt(np.maximum(-puntuaciones, 0))
+        return filas, puntuaciones
+
+
+# Índice de similitud de un snapshot (todas las ligas), uno por versión y
+# métrica. Por defecto se usa la búsqueda exacta por bloques; con
+# usar_arbol=None, el KD-tree se usa para la distancia euclídea solo si la
+# matriz es grande y de pocas dimensiones (FILAS_ARBOL, DIMENSIONES_ARBOL).
+@por_version
+def indice_similitud(snapshot, metrica="coseno", usar_arbol=None):
+    columnas = columnas_estadisticas(snapshot)
+    if not columnas:
+        return None
+    if usar_arbol is None:
+        usar_arbol = metrica == "euclidea" and len(snapshot) >= FILAS_ARBOL and len(columnas) <= DIMENSIONES_ARBOL
+    return IndiceSimilitud(matriz_estandarizada(snapshot, columnas), metrica, usar_arbol)
+
+
+# Función para obtener la tabla de jugadores más parecidos a uno dado
+def jugadores_similares(snapshot, fila, k=10, metrica="coseno"):
+    indice = indice_similitud(snapshot, metrica)
+    if indice is None:
+        return None
+    filas, puntuaciones = indice.vecinos(fila, k)
+    tabla = snapshot.a_dataframe(filas, [COL_NOMBRE, COL_LIGA, COL_CLUB, COL_POSICION, COL_VALOR_ACTUAL])
+    tabla["Similitud" if metrica == "coseno" else "Distancia"] = puntuaciones
+    return tabla
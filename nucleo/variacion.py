@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from nucleo.esquema import (
+    COL_CAMBIO,
+    COL_TENDENCIA,
+    COL_VALOR_ACTUAL,
+    COL_VALOR_INICIAL,
+    COL_VARIACION_PCT,
+    SIN_DATOS,
+)
+
+TENDENCIA_POSITIVA = "Positiva ↑"
+TENDENCIA_NEGATIVA = "Negativa ↓"
+TENDENCIA_ESTABLE = "Estable →"
+TENDENCIAS = [TENDENCIA_POSITIVA, TENDENCIA_NEGATIVA, TENDENCIA_ESTABLE, SIN_DATOS]
+# Columnas derivadas que se añaden a cada jugador en la ingesta
+COLUMNAS_VARIACION = [COL_CAMBIO, COL_VARIACION_PCT, COL_TENDENCIA]
+
+
+# Función para calcular, de una vez para todos los jugadores, el cambio
+# absoluto, la variación porcentual y la tendencia. Los valores que no se
+# pudieron convertir (None) se tratan como ausentes: sin alguno de los dos
+# valores no hay cambio ni tendencia, y sin un valor inicial positivo no hay
+# variación porcentual (se evita dividir por cero).
+def calcular_variacion(inicial, actual):
+    inicial = pd.to_numeric(pd.Series(inicial), errors="coerce").to_numpy(dtype="float64")
+    actual = pd.to_numeric(pd.Series(actual), errors="coerce").to_numpy(dtype="float64")
+    cambio = actual - inicial
+    with np.errstate(divide="ignore", invalid="ignore"):
+        porcentaje = np.where(inicial > 0, cambio / inicial * 100, np.nan)
+    tendencia = np.select(
+        [cambio > 0, cambio < 0, cambio == 0],
+        [TENDENCIA_POSITIVA, TENDENCIA_NEGATIVA, TENDENCIA_ESTABLE],
+        default=SIN_DATOS,
+    ).astype(object)
+    return cambio, porcentaje, tendencia
+
+
+# Función para añadir (en el propio DataFrame) las columnas de variación
+def anadir_variacion(df):
+    if COL_VALOR_INICIAL not in df.columns or COL_VALOR_ACTUAL not in df.columns:
+        return df
+    df[COL_CAMBIO], df[COL_VARIACION_PCT], df[COL_TENDENCIA] = calcular_variacion(
+        df[COL_VALOR_INICIAL], df[COL_VALOR_ACTUAL]
+    )
+    return df
+
+
+# Función para mostrar una variación porcentual, o "Sin datos" si no existe
+def formatear_variacion(porcentaje, decimales=2):
+    if porcentaje is None or pd.isna(porcentaje):
+        return SIN_DATOS
+    return f"{porcentaje:.{decimales}f}%"
@@ -0,0 +1,239 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# Eventos de inotify que indican un archivo completo: escrito y cerrado, o
+# movido al directorio (el caso de quien escribe en un temporal y renombra), y
+# los que indican que desapareció. IN_MODIFY no se usa porque llega a mitad de
+# la escritura.
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+# Eventos del propio directorio: si se borra o se mueve, el sistema retira la
+# vigilancia (IN_IGNORED) y hay que volver a crearla
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_IGNORED = 0x8000
+EVENTOS = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+FIN_VIGILANCIA = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+# Cabecera de cada evento: wd, mask, cookie y longitud del nombre
+CABECERA = struct.Struct("iIII")
+
+# Segundos entre comprobaciones (sondeo) o entre esperas de eventos (inotify)
+INTERVALO = 1.0
+# Segundos sin cambios que se esperan antes de avisar, para agrupar en un solo
+# aviso los archivos que se copian a la vez
+ESPERA = 0.5
+# Segundos tras los que se repite un aviso que falló (p. ej. un CSV que aún no
+# se puede leer)
+REINTENTO = 5.0
+
+
+# Función para cargar la libc con inotify (solo en Linux). Devuelve None si no
+# está disponible y entonces se vigila por sondeo.
+def _libc_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1") or not hasattr(libc, "inotify_add_watch"):
+        return None
+    return libc
+
+
+# Función para listar los CSV de ligas de un directorio: {liga: ruta}, con la
+# liga tomada del nombre del archivo (LaLiga.csv -> LaLiga). Se ignoran los
+# archivos ocultos, que suelen ser temporales de una copia en curso.
+def archivos_ligas(directorio):
+    try:
+        nombres = sorted(os.listdir(directorio))
+    except OSError:
+        return {}
+    return {
+        os.path.splitext(nombre)[0]: os.path.join(directorio, nombre)
+        for nombre in nombres
+        if nombre.endswith(".csv") and not nombre.startswith(".")
+    }
+
+
+# Vigilante de los CSV de un directorio. Llama a al_cambiar(nombres) desde su
+# propio hilo con los nombres de los archivos nuevos, modificados o borrados,
+# una vez que llevan ESPERA segundos sin cambiar; si al_cambiar lanza una
+# excepción, la guarda en ultimo_error y repite el aviso cada REINTENTO
+# segundos hasta que funcione. Usa inotify si el sistema lo tiene y, si no (u
+# otro sistema, o el directorio no existe), compara cada INTERVALO segundos la
+# fecha y el tamaño de los archivos. Si el directorio se borra o se mueve, se
+# pasa a vigilar por sondeo y, en cuanto vuelve a existir, se vuelve a inotify.
+class VigilanteDirectorio:
+    def __init__(self, directorio, al_cambiar, intervalo=INTERVALO, espera=ESPERA, inotify=True):
+        self.directorio = directorio
+        self.al_cambiar = al_cambiar
+        self.intervalo = intervalo
+        self.espera = espera
+        self._libc = _libc_inotify() if inotify else None
+        self.modo = None
+        self.ultimo_error = None
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        descriptor = self._abrir_inotify()
+        self.modo = "sondeo" if descriptor is None else "inotify"
+        # El estado inicial se toma aquí y no en el hilo, para no perder los
+        # cambios que lleguen mientras el hilo arranca
+        anterior = self._estado()
+        self._hilo = threading.Thread(
+            target=self._ejecutar, args=(descriptor, anterior), name=f"vigilancia-{self.directorio}", daemon=True
+        )
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+
+    # Función para crear el descriptor de inotify del directorio, o None
+    def _abrir_inotify(self):
+        if self._libc is None:
+            return None
+        descriptor = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if descriptor < 0:
+            return None
+        if not self._vigilar(descriptor):
+            os.close(descriptor)
+            return None
+        return descriptor
+
+    # Función para añadir el directorio a un descriptor de inotify
+    def _vigilar(self, descriptor):
+        return self._libc.inotify_add_watch(descriptor, os.fsencode(self.directorio), EVENTOS) >= 0
+
+    # Función para avisar de unos cambios. Devuelve si el aviso funcionó; un
+    # error no para la vigilancia, queda en ultimo_error y el aviso se repite.
+    def _avisar(self, nombres):
+        try:
+            self.al_cambiar(sorted(nombres))
+        except Exception as error:
+            self.ultimo_error = error
+            return False
+        self.ultimo_error = None
+        return True
+
+    # Función para avisar de los cambios pendientes si ya toca. Devuelve los
+    # pendientes y el momento del próximo aviso (None si no queda ninguno).
+    def _avisar_si_toca(self, pendientes, aviso_en):
+        if aviso_en is None or time.monotonic() < aviso_en:
+            return pendientes, aviso_en
+        if not pendientes:
+            return pendientes, None
+        if self._avisar(pendientes):
+            return set(), None
+        return pendientes, time.monotonic() + REINTENTO
+
+    # Función para calcular cuánto esperar hasta el próximo aviso o comprobación
+    def _espera_hasta(self, aviso_en):
+        if aviso_en is None:
+            return self.intervalo
+        return min(self.intervalo, max(0.0, aviso_en - time.monotonic()))
+
+    # Función del hilo: alterna entre inotify y sondeo según se pierda o se
+    # recupere la vigilancia del directorio, conservando los avisos pendientes
+    def _ejecutar(self, descriptor, anterior):
+        pendientes = set()
+        aviso_en = None
+        while not self._detener.is_set():
+            if descriptor is not None:
+                self.modo = "inotify"
+                pendientes, aviso_en = self._bucle_inotify(descriptor, pendientes, aviso_en)
+                descriptor = None
+                anterior = self._estado()
+            else:
+                self.modo = "sondeo"
+                descriptor, pendientes, aviso_en = self._bucle_sondeo(anterior, pendientes, aviso_en)
+
+    # Bucle de inotify. Termina (cerrando el descriptor) al detener el
+    # vigilante o si el directorio desaparece; devuelve los avisos pendientes.
+    def _bucle_inotify(self, descriptor, pendientes, aviso_en):
+        try:
+            while not self._detener.is_set():
+                listos, _, _ = select.select([descriptor], [], [], self._espera_hasta(aviso_en))
+                if listos:
+                    try:
+                        datos = os.read(descriptor, 64 * 1024)
+                    except BlockingIOError:
+                        datos = b""
+                    nombres, vigilancia_perdida = self._leer_eventos(datos)
+                    if nombres:
+                        pendientes |= nombres
+                        aviso_en = time.monotonic() + self.espera
+                    if vigilancia_perdida:
+                        if not self._vigilar(descriptor):
+                            break
+                        # Los archivos creados antes de volver a vigilar no
+                        # han generado eventos: se revisan todos
+                        pendientes |= set(self._estado())
+                        aviso_en = time.monotonic() + self.espera
+                pendientes, aviso_en = self._avisar_si_toca(pendientes, aviso_en)
+        finally:
+            os.close(descriptor)
+        return pendientes, aviso_en
+
+    # Función para leer un bloque de eventos de inotify. Devuelve los nombres
+    # de los CSV afectados y si el sistema retiró la vigilancia del directorio.
+    def _leer_eventos(self, datos):
+        nombres = set()
+        vigilancia_perdida = False
+        posicion = 0
+        while posicion < len(datos):
+            _, mascara, _, longitud = CABECERA.unpack_from(datos, posicion)
+            posicion += CABECERA.size
+            nombre = os.fsdecode(datos[posicion:posicion + longitud].rstrip(b"\0"))
+            posicion += longitud
+            if mascara & FIN_VIGILANCIA:
+                vigilancia_perdida = True
+            elif nombre.endswith(".csv") and not nombre.startswith("."):
+                nombres.add(nombre)
+        return nombres, vigilancia_perdida
+
+    # Función para leer la fecha y el tamaño de los CSV del directorio
+    def _estado(self):
+        estado = {}
+        for ruta in archivos_ligas(self.directorio).values():
+            try:
+                informacion = os.stat(ruta)
+            except OSError:
+                continue
+            estado[os.path.basename(ruta)] = (informacion.st_mtime_ns, informacion.st_size)
+        return estado
+
+    # Bucle de sondeo. Si el sistema tiene inotify, en cuanto el directorio
+    # existe se vuelve a vigilar con él y se devuelve el descriptor nuevo;
+    # devuelve None al detener el vigilante.
+    def _bucle_sondeo(self, anterior, pendientes, aviso_en):
+        pendientes = set(pendientes)
+        while not self._detener.wait(self._espera_hasta(aviso_en)):
+            if self._libc is not None and os.path.isdir(self.directorio):
+                descriptor = self._abrir_inotify()
+                if descriptor is not None:
+                    # Lo que cambió desde la última comprobación no ha
+                    # generado eventos: se revisan todos los archivos
+                    pendientes |= set(self._estado())
+                    return descriptor, pendientes, time.monotonic() + self.espera
+            actual = self._estado()
+            cambiados = {nombre for nombre in anterior.keys() | actual.keys() if anterior.get(nombre) != actual.get(nombre)}
+            anterior = actual
+            if cambiados:
+                pendientes |= cambiados
+                aviso_en = time.monotonic() + self.espera
+            else:
+                pendientes, aviso_en = self._avisar_si_toca(pendientes, aviso_en)
+        return None, pendientes, aviso_en
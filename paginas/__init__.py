@@ -0,0 +1,2 @@
+# Partes de Streamlit compartidas por todas las variantes de la aplicación:
+# carga de datos con cachés comunes y secciones que son iguales en todas.
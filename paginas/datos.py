@@ -0,0 +1,116 @@
+import os
+
+import streamlit as st
+
+from nucleo.cache import invalidar, sembrar
+from nucleo.columnar import SnapshotColumnar, version_datos
+from nucleo.compartido import congelar_ligas
+from nucleo.fuentes import DIRECTORIO_LOCAL, OrigenDatos
+from nucleo.precalculo import cargar_precalculo
+
+
+# Segundos que se espera a que responda el servidor de animaciones
+TIEMPO_ESPERA_LOTTIE = 10
+
+
+# Función para cargar animaciones Lottie. Se cachea para no volver a
+# descargar la misma animación en cada ejecución del script; si el servidor no
+# responde se devuelve None y la página se muestra sin animación. requests se
+# importa aquí para no cargarlo al arrancar si la animación ya está en caché.
+@st.cache_data(show_spinner=False)
+def load_lottieurl(url):
+    import requests
+
+    try:
+        r = requests.get(url, timeout=TIEMPO_ESPERA_LOTTIE)
+    except requests.RequestException:
+        return None
+    if r.status_code != 200:
+        return None
+    return r.json()
+
+
+# Versión del snapshot construido para cada versión de los datos de origen
+_versiones_snapshot = {}
+
+
+# Función para descartar los cálculos derivados de la versión anterior de una
+# fuente cuando se publica otra. Las ligas y snapshots de Streamlit no hace
+# falta borrarlos: su clave incluye la versión y se conservan pocas.
+def _descartar_version(fuente, anterior):
+    version = _versiones_snapshot.pop((fuente, anterior.version), None)
+    if version is not None:
+        invalidar(version)
+
+
+# Origen de los datos de una fuente, uno por proceso: guarda la última copia
+# buena, la renueva en segundo plano cuando envejece y deja de llamar al
+# servidor si falla repetidamente (nucleo.fuentes). Con DATOS_LOCALES
+# definido, vigila además <DATOS_LOCALES>/<fuente>/ y publica una versión
+# nueva en cuanto cambia uno de sus CSV, sin reiniciar la aplicación.
+@st.cache_resource
+def origen_datos(fuente="valores"):
+    origen = OrigenDatos(fuente)
+    origen.suscribir(lambda anterior, nueva: _descartar_version(fuente, anterior))
+    if DIRECTORIO_LOCAL is not None:
+        origen.vigilar(os.path.join(DIRECTORIO_LOCAL, fuente))
+    return origen
+
+
+# Función para obtener la copia de los datos que se sirve ahora. Solo espera
+# al servidor si no hay ninguna copia; si además la descarga falla, la página
+# muestra el error en lugar de romperse.
+def copia_datos(fuente="valores"):
+    try:
+        return origen_datos(fuente).obtener()
+    except Exception as error:
+        st.error(f"No se pudieron cargar los datos ({error}). Inténtalo de nuevo en unos minutos.")
+        st.stop()
+
+
+# Ligas congeladas de una versión de los datos de origen. La versión forma
+# parte de la clave, así que cuando el refresco trae datos nuevos las
+# ejecuciones siguientes los reciben; se conservan pocas versiones.
+@st.cache_resource(max_entries=4)
+def _ligas_congeladas(fuente, version, variacion, _ligas):
+    return congelar_ligas(_ligas, variacion)
+
+
+# Ligas de una de las fuentes de nucleo.carga.FUENTES, con los valores de
+# mercado ya convertidos (y, si se pide, las columnas de variación). Se cachean
+# como recurso: todas las sesiones y variantes reciben los mismos DataFrames de
+# solo lectura, sin serializarlos ni copiarlos en cada ejecución, así que la
+# memoria no crece con el número de usuarios. `copia` es la de copia_datos:
+# cada ejecución la pide una sola vez y la pasa a todas las lecturas, para que
+# las ligas y el snapshot sean siempre de la misma versión aunque entretanto
+# se publique otra.
+def cargar_ligas(fuente, copia, variacion=False):
+    return _ligas_congeladas(fuente, copia.version, variacion, copia.ligas)
+
+
+# Función para obtener los DataFrames de LaLiga y Bundesliga de una copia
+def cargar_datos(fuente, copia, variacion=False):
+    ligas = cargar_ligas(fuente, copia, variacion)
+    return ligas["LaLiga"], ligas["Bundesliga"]
+
+
+# Instantánea columnar de una versión de los datos, compartida entre sesiones y
+# variantes; los cálculos derivados se cachean por su versión. Si el precálculo
+# (python -m nucleo.precalculo) corresponde a estos mismos datos, el snapshot
+# llega con sus índices y los cálculos derivados se cargan en la caché por
+# versión, así que ningún usuario los calcula en frío.
+@st.cache_resource(max_entries=2)
+def _snapshot(fuente, version, _ligas):
+    precalculo = cargar_precalculo(fuente)
+    if precalculo is not None and version_datos(precalculo.ligas) == version:
+        sembrar(precalculo.snapshot.version, precalculo.resultados)
+        snapshot = precalculo.snapshot
+    else:
+        snapshot = SnapshotColumnar.desde_ligas(_ligas_congeladas(fuente, version, False, _ligas))
+    _versiones_snapshot[(fuente, version)] = snapshot.version
+    return snapshot
+
+
+# Función para obtener la instantánea columnar de una copia de los datos
+def cargar_snapshot(fuente, copia):
+    return _snapshot(fuente, copia.version, copia.ligas)
@@ -0,0 +1,169 @@
+import streamlit as st
+
+from nucleo.carga import convertir_urls_a_imagenes
+from nucleo.fuentes import ABIERTO
+from paginas.datos import load_lottieurl, origen_datos
+
+
+# Función para mostrar una animación Lottie. El componente se importa solo
+# cuando hay animación que mostrar, así que las secciones sin animaciones no
+# lo cargan al arrancar.
+def mostrar_animacion(url, **tamano):
+    lottie_coding = load_lottieurl(url)
+    if lottie_coding:
+        from streamlit_lottie import st_lottie
+
+        st_lottie(lottie_coding, **tamano)
+
+
+# Función para expresar una antigüedad en segundos como texto
+def formatear_antiguedad(segundos):
+    if segundos < 60:
+        return "hace menos de un minuto"
+    if segundos < 3600:
+        return f"hace {segundos // 60:.0f} min"
+    if segundos < 86400:
+        return f"hace {segundos // 3600:.0f} h"
+    return f"hace {segundos // 86400:.0f} días"
+
+
+# Función para mostrar en el menú lateral la antigüedad de los datos servidos
+# y avisar si el origen no responde y se están mostrando los últimos válidos,
+# o si falló la última actualización
+def mostrar_estado_datos(fuente):
+    estado = origen_datos(fuente).estado()
+    if estado["edad"] is None:
+        return
+    antiguedad = formatear_antiguedad(estado["edad"])
+    if estado["interruptor"] == ABIERTO:
+        st.sidebar.warning(f"El origen de datos no responde; se muestran los últimos datos válidos ({antiguedad}).")
+    else:
+        actualizando = " · actualizando…" if estado["refrescando"] else ""
+        st.sidebar.caption(f"🕒 Datos actualizados {antiguedad}{actualizando}")
+    if estado["error"] is not None:
+        st.sidebar.caption(f"⚠️ Último error al actualizar los datos: {estado['error']}")
+
+
+# Función para mostrar el menú lateral; devuelve la sección y la liga elegidas.
+# Con `fuente`, muestra también la antigüedad de sus datos.
+def menu_lateral(fuente=None):
+    st.sidebar.title("Menú Principal")
+    menu_principal = st.sidebar.radio(
+        "Seleccione una sección:",
+        ["Introducción", "Objetivos", "Metodología", "Herramientas", "Resultados", "Conclusiones"]
+    )
+
+    # Selector de liga
+    liga_seleccionada = st.sidebar.selectbox(
+        "Seleccione la liga:",
+        ["LaLiga", "Bundesliga", "Comparativa"]
+    )
+    if fuente is not None:
+        mostrar_estado_datos(fuente)
+    return menu_principal, liga_seleccionada
+
+
+# Sección de introducción con las tablas de jugadores
+def mostrar_introduccion(liga_seleccionada, spain_data, bundesliga_data):
+    st.title("Introducción")
+    st.write("""
+    La industria del fútbol ha evolucionado significativamente, convirtiéndose en un mercado 
+    donde el valor de los jugadores es un indicador crucial de su desempeño y potencial.
+    """)
+
+    # Cargar animación Lottie
+    mostrar_animacion("https://lottie.host/embed/3d48d4b9-51ad-4b7d-9d28-5e248cace11/Rz3QtSCq3.json", height=200, width=300)
+
+    # Mostrar datos según la liga seleccionada
+    if liga_seleccionada == "LaLiga":
+        data_to_show = spain_data
+        title = "Datos de Jugadores de LaLiga"
+    elif liga_seleccionada == "Bundesliga":
+        data_to_show = bundesliga_data
+        title = "Datos de Jugadores de Bundesliga"
+    else:
+        st.subheader("Comparativa entre LaLiga y Bundesliga")
+        
+        # Mostrar tablas en Comparativa
+        def generar_tabla_html(data):
+            data_con_imagenes = convertir_urls_a_imagenes(data)
+            return data_con_imagenes.to_html(escape=False, index=False)
+
+        # Tabla de LaLiga
+        st.write("### LaLiga")
+        tabla_laliga_html = generar_tabla_html(spain_data)
+        st.markdown(tabla_laliga_html, unsafe_allow_html=True)
+
+        # Tabla de Bundesliga
+        st.write("### Bundesliga")
+        tabla_bundesliga_html = generar_tabla_html(bundesliga_data)
+        st.markdown(tabla_bundesliga_html, unsafe_allow_html=True)
+
+    # Mostrar tabla individual con imágenes (si no es Comparativa)
+    if liga_seleccionada != "Comparativa":
+        with st.container():
+            st.subheader(title)
+            data_con_imagenes = convertir_urls_a_imagenes(data_to_show)
+            st.markdown(data_con_imagenes.to_html(escape=False), unsafe_allow_html=True)
+
+
+# Sección de objetivos
+def mostrar_objetivos():
+    st.title("Objetivos del Proyecto")
+    st.write("""
+    ### Objetivos Principales:
+    - Analizar y visualizar el valor de mercado de los jugadores en LaLiga y Bundesliga
+    - Evaluar el incremento porcentual del valor de mercado a lo largo del tiempo
+    - Identificar patrones y tendencias en la valoración de jugadores
+    - Comparar las valoraciones entre las diferentes ligas
+    """)
+
+
+# Sección de herramientas
+def mostrar_herramientas():
+    st.title("Herramientas y Tecnologías")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.header("Tecnologías Principales")
+        st.write("""
+        - Python
+        - Pandas
+        - Streamlit
+        - Plotly
+        - Google Colab
+        - Jupiter Notebook
+        """)
+    
+    with col2:
+        st.header("Bibliotecas Adicionales")
+        st.write("""
+        - Matplotlib
+        - Seaborn
+        - Streamlit-Lottie
+        """)
+
+
+# Sección de conclusiones
+def mostrar_conclusiones(liga_seleccionada):
+    st.title("Conclusiones")
+    if liga_seleccionada == "Comparativa":
+        st.write("""
+        ### Principales Hallazgos:
+        - Comparativa entre LaLiga y Bundesliga muestra patrones interesantes en la valoración de jugadores
+        - Las diferencias entre mercados ofrecen oportunidades únicas de inversión
+        - La gestión basada en datos puede mejorar significativamente las estrategias de los equipos en ambas ligas
+        """)
+    else:
+        st.write(f"""
+        ### Principales Hallazgos en {liga_seleccionada}:
+        - El análisis de datos en el fútbol ofrece insights valiosos para la toma de decisiones
+        - Las tendencias del mercado muestran patrones significativos en la valoración de jugadores
+        - La gestión basada en datos puede mejorar significativamente las estrategias de los equipos
+        """)
+
+
+# Pie del menú lateral
+def pie_de_pagina():
+    st.sidebar.markdown("---")
+    st.sidebar.info("ANÁLISIS DE LAS ESTADÍSTICAS QUE TIENEN MAYOR CORRELACIÓN CON EL VALOR DE MERCADO DE LOS JUGADORES DE FUTBOL EN ESPAÑA Y ALEMANIA")
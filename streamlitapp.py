@@ -1,12 +1,9 @@
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
-from datetime import datetime
-import requests
-from streamlit_lottie import st_lottie
-from streamlit_particles import particles
-import json
-from utils import load_lottieurl, convertir_valor
+from nucleo import EnConjunto, Rango, SnapshotColumnar, cubo_mercado, exportar_csv, exportar_parquet, filtrar
+from paginas.datos import cargar_ligas, copia_datos
+from paginas.secciones import mostrar_estado_datos
+from utils import load_lottieurl
 from components import (
     crear_grafico_evolucion,
     mostrar_metricas_jugador,
@@ -64,20 +61,26 @@ particles_config = {
     }
 }
 
-# Aplicar partículas al fondo
-particles(particles_config, height="100vh")
+# Aplicar partículas al fondo (componente opcional: sin él se usa el fondo normal)
+try:
+    from streamlit_particles import particles
+except ImportError:
+    particles = None
+if particles is not None:
+    particles(particles_config, height="100vh")
 
-# Cargar datos
-@st.cache_data
-def load_data():
-    file_path = 'https://raw.githubusercontent.com/AndersonP444/PROYECTO-SIC-JAKDG/main/valores_mercado_actualizados%20(3).csv'
-    df = pd.read_csv(file_path)
-    df["Valor de Mercado en 01/01/2024"] = df["Valor de Mercado en 01/01/2024"].apply(convertir_valor)
-    df["Valor de Mercado Actual"] = df["Valor de Mercado Actual"].apply(convertir_valor)
-    return df
+# Instantánea columnar (con índices ordenados) para los filtros de la vista de
+# datos; se reconstruye cuando el refresco en segundo plano trae datos nuevos
+@st.cache_resource(max_entries=2)
+def cargar_snapshot(version, _data):
+    return SnapshotColumnar.desde_ligas({"LaLiga": _data})
 
-# Cargar datos
-data = load_data()
+# Cargar datos (LaLiga, compartida de solo lectura entre sesiones y variantes).
+# Los datos y la versión salen de la misma copia, para que un refresco en
+# segundo plano entre dos lecturas no guarde datos antiguos con la versión nueva.
+copia = copia_datos("valores")
+data = cargar_ligas("valores", copia)["LaLiga"]
+snapshot = cargar_snapshot(copia.version, data)
 
 # Sidebar con menú principal
 with st.sidebar:
@@ -87,6 +90,7 @@ with st.sidebar:
         ["📊 Dashboard", "📈 Análisis Individual", "🔄 Comparativa", "📋 Datos"],
         index=0
     )
+    mostrar_estado_datos("valores")
 
 # Contenido principal
 if menu_principal == "📊 Dashboard":
@@ -96,28 +100,56 @@ if menu_principal == "📊 Dashboard":
     lottie_url = "https://lottie.host/3d48d4b9-51ad-4b7d-9d28-5e248cace11/Rz3QtSCq3.json"
     lottie_coding = load_lottieurl(lottie_url)
     if lottie_coding:
+        from streamlit_lottie import st_lottie
+
         col1, col2, col3 = st.columns([1,2,1])
         with col2:
             st_lottie(lottie_coding, height=200)
     
-    # Estadísticas generales
+    # Estadísticas generales (leídas del cubo de agregados precalculado)
+    cubo = cubo_mercado(snapshot)
+    totales = cubo.total()
     st.subheader("📈 Estadísticas Generales")
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        valor_total_inicial = data["Valor de Mercado en 01/01/2024"].sum()
+        valor_total_inicial = totales["Valor inicial total"]
         st.metric("Valor Total Inicial", f"€{valor_total_inicial:,.0f}")
     
     with col2:
-        valor_total_actual = data["Valor de Mercado Actual"].sum()
-        cambio_total = valor_total_actual - valor_total_inicial
+        valor_total_actual = totales["Valor total"]
+        cambio_total = totales["Cambio total"]
         st.metric("Valor Total Actual", f"€{valor_total_actual:,.0f}", 
                  delta=f"€{cambio_total:,.0f}")
     
     with col3:
-        cambio_porcentual = ((valor_total_actual - valor_total_inicial) / valor_total_inicial) * 100
+        cambio_porcentual = totales["Cambio (%)"]
         st.metric("Cambio Porcentual", f"{cambio_porcentual:.1f}%")
 
+    # Desglose por dimensión
+    st.subheader("📊 Desglose")
+    dimension = st.selectbox("Desglose por:", ["Club", "Posición", "Tramo de edad", "Liga"])
+    desglose = cubo.agregar([dimension]).sort_values("Valor total", ascending=False)
+    fig = go.Figure(go.Bar(
+        x=desglose[dimension],
+        y=desglose["Valor total"],
+        marker_color='rgba(0, 0, 255, 0.7)'
+    ))
+    fig.update_layout(
+        title=f'Valor de Mercado Total por {dimension}',
+        xaxis_title=dimension,
+        yaxis_title='Valor de Mercado (€)'
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(
+        desglose,
+        column_config={
+            columna: st.column_config.NumberColumn(columna, format="€%.0f")
+            for columna in ["Valor total", "Valor medio", "Valor mediano (aprox.)", "Valor inicial total", "Cambio total"]
+        },
+        hide_index=True
+    )
+
 elif menu_principal == "📈 Análisis Individual":
     st.title("Análisis Individual de Jugadores")
     
@@ -129,17 +161,11 @@ elif menu_principal == "📈 Análisis Individual":
     )
     
     if nombre_jugador:
-        jugador_data = data[data['Nombre'] == nombre_jugador]
-        
         # Mostrar métricas del jugador
-        mostrar_metricas_jugador(jugador_data)
+        mostrar_metricas_jugador(snapshot, nombre_jugador)
         
         # Gráfico de evolución
-        fig = crear_grafico_evolucion(
-            nombre_jugador,
-            jugador_data['Valor de Mercado en 01/01/2024'].iloc[0],
-            jugador_data['Valor de Mercado Actual'].iloc[0]
-        )
+        fig = crear_grafico_evolucion(snapshot, nombre_jugador)
         st.plotly_chart(fig, use_container_width=True)
 
 elif menu_principal == "🔄 Comparativa":
@@ -154,34 +180,111 @@ elif menu_principal == "🔄 Comparativa":
                                index=0)
     
     if jugador1 and jugador2:
-        fig = crear_grafico_comparacion(data, [jugador1, jugador2])
+        fig = crear_grafico_comparacion(snapshot, [jugador1, jugador2])
         st.plotly_chart(fig, use_container_width=True)
 
 else:  # Datos
     st.title("Datos Completos")
     
     # Filtros
+    predicados = []
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        ligas = st.multiselect("Liga", snapshot.valores("Liga"))
+    with col2:
+        clubes = st.multiselect("Club", snapshot.valores("Club"))
+    with col3:
+        posiciones = st.multiselect("Posición", snapshot.valores("Posición"))
+    for columna, seleccion in [("Liga", ligas), ("Club", clubes), ("Posición", posiciones)]:
+        if seleccion:
+            predicados.append(EnConjunto(columna, seleccion))
+
+    col1, col2 = st.columns(2)
+    indice_edad = snapshot.indice("Edad") if "Edad" in snapshot.columnas_numericas() else None
+    if indice_edad is not None and indice_edad.maximo > indice_edad.minimo:
+        with col1:
+            edad_min, edad_max = st.slider(
+                "Edad",
+                min_value=int(indice_edad.minimo),
+                max_value=int(indice_edad.maximo),
+                value=(int(indice_edad.minimo), int(indice_edad.maximo))
+            )
+        if (edad_min, edad_max) != (int(indice_edad.minimo), int(indice_edad.maximo)):
+            predicados.append(Rango("Edad", edad_min, edad_max))
+    indice_variacion = snapshot.indice("Variación (%)")
+    if indice_variacion.maximo > indice_variacion.minimo:
+        with col2:
+            variacion_min, variacion_max = st.slider(
+                "Variación (%)",
+                min_value=float(indice_variacion.minimo),
+                max_value=float(indice_variacion.maximo),
+                value=(float(indice_variacion.minimo), float(indice_variacion.maximo))
+            )
+        if (variacion_min, variacion_max) != (indice_variacion.minimo, indice_variacion.maximo):
+            predicados.append(Rango("Variación (%)", variacion_min, variacion_max))
+
+    valor_maximo = int(snapshot.indice("Valor de Mercado Actual").maximo)
     col1, col2 = st.columns(2)
     with col1:
         min_valor = st.number_input(
             "Valor mínimo (€)",
             min_value=0,
-            max_value=int(data["Valor de Mercado Actual"].max()),
+            max_value=valor_maximo,
             value=0
         )
     with col2:
         max_valor = st.number_input(
             "Valor máximo (€)",
             min_value=0,
-            max_value=int(data["Valor de Mercado Actual"].max()),
-            value=int(data["Valor de Mercado Actual"].max())
+            max_value=valor_maximo,
+            value=valor_maximo
         )
-    
-    # Filtrar datos
-    filtered_data = data[
-        (data["Valor de Mercado Actual"] >= min_valor) &
-        (data["Valor de Mercado Actual"] <= max_valor)
+    predicados.append(Rango("Valor de Mercado Actual", min_valor, max_valor))
+
+    # Filtro opcional por cualquier otra columna numérica (estadísticas)
+    otras_columnas = [
+        columna for columna in snapshot.columnas_numericas()
+        if columna not in ("Edad", "Variación (%)", "Valor de Mercado Actual")
+        and snapshot.indice(columna).maximo > snapshot.indice(columna).minimo
     ]
+    if otras_columnas:
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            estadistica = st.selectbox("Filtrar por estadística", ["Ninguna"] + otras_columnas)
+        if estadistica != "Ninguna":
+            indice_estadistica = snapshot.indice(estadistica)
+            with col2:
+                estadistica_min, estadistica_max = st.slider(
+                    estadistica,
+                    min_value=float(indice_estadistica.minimo),
+                    max_value=float(indice_estadistica.maximo),
+                    value=(float(indice_estadistica.minimo), float(indice_estadistica.maximo))
+                )
+            predicados.append(Rango(estadistica, estadistica_min, estadistica_max))
+    
+    # Filtrar datos: solo se materializan las filas que cumplen todos los filtros
+    filas_filtradas = filtrar(snapshot, predicados)
+    filtered_data = snapshot.a_dataframe(filas_filtradas)
+    st.caption(f"{len(filtered_data):,} de {len(snapshot):,} jugadores")
+
+    # Exportación de la selección actual (se genera por bloques al pedirla)
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Preparar CSV"):
+            st.download_button(
+                "⬇️ Descargar CSV",
+                data=exportar_csv(snapshot, filas_filtradas),
+                file_name="jugadores_filtrados.csv",
+                mime="text/csv"
+            )
+    with col2:
+        if st.button("Preparar Parquet"):
+            st.download_button(
+                "⬇️ Descargar Parquet",
+                data=exportar_parquet(snapshot, filas_filtradas),
+                file_name="jugadores_filtrados.parquet",
+                mime="application/octet-stream"
+            )
     
     # Mostrar datos filtrados
     st.dataframe(
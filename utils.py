@@ -0,0 +1,4 @@
+# Utilidades comunes de las aplicaciones, reexportadas desde el núcleo y las
+# páginas compartidas para que todas usen la misma implementación y caché
+from nucleo.carga import convertir_valor
+from paginas.datos import load_lottieurl